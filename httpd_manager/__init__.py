@@ -1,35 +1,80 @@
 from .base import (
     BalancerManager,
+    BalancerManagerChanges,
     Cluster,
+    Event,
+    FastCluster,
+    FastRoute,
+    FastRouteStatus,
+    FastWorker,
+    HistoryStore,
     ImmutableStatus,
+    ParsedAutoServerStatus,
     ParsedBalancerManager,
     ParsedServerStatus,
+    RateTracker,
+    RingBuffer,
     Route,
+    RouteAddedEvent,
+    RouteElectedEvent,
+    RouteEvent,
+    RouteRates,
+    RouteRemovedEvent,
     RouteStatus,
-    RouteStatus,
+    RouteStatusEvent,
+    RouteStatusFlag,
     ServerStatus,
+    ServerStatusRates,
     Status,
     Worker,
     WorkerState,
     WorkerStateCount,
+    WorkerStateEvent,
+    WorkerTable,
 )
+from .engine import ParserEngine, parser_engine
 from .executor import executor
 from .models import Bytes
+from .pool import ParsePool, ParsePoolStats
 
 
 __all__ = [
     "BalancerManager",
+    "BalancerManagerChanges",
     "Bytes",
     "Cluster",
+    "Event",
+    "FastCluster",
+    "FastRoute",
+    "FastRouteStatus",
+    "FastWorker",
+    "HistoryStore",
     "ImmutableStatus",
+    "ParsedAutoServerStatus",
     "ParsedBalancerManager",
+    "ParsePool",
+    "ParsePoolStats",
     "ParsedServerStatus",
+    "ParserEngine",
+    "RateTracker",
+    "RingBuffer",
     "Route",
+    "RouteAddedEvent",
+    "RouteElectedEvent",
+    "RouteEvent",
+    "RouteRates",
+    "RouteRemovedEvent",
     "RouteStatus",
+    "RouteStatusEvent",
+    "RouteStatusFlag",
     "ServerStatus",
+    "ServerStatusRates",
     "Status",
     "Worker",
     "WorkerState",
     "WorkerStateCount",
+    "WorkerStateEvent",
+    "WorkerTable",
     "executor",
+    "parser_engine",
 ]
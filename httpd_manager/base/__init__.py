@@ -1,32 +1,90 @@
 from .balancer_manager import (
     BalancerManager,
+    BalancerManagerChanges,
     Cluster,
+    FastCluster,
+    FastRoute,
+    FastRouteStatus,
     ImmutableStatus,
     ParsedBalancerManager,
     Route,
     RouteStatus,
+    RouteStatusFlag,
     Status,
+    count_route_statuses,
+)
+from .events import (
+    Event,
+    RouteAddedEvent,
+    RouteElectedEvent,
+    RouteEvent,
+    RouteRemovedEvent,
+    RouteStatusEvent,
+    WorkerStateEvent,
+    get_balancer_manager_events,
+    get_worker_state_events,
+)
+from .history import Bucket, HistoryStore, RingBuffer
+from .rates import RateTracker, RouteRates, ServerStatusRates
+from .scoreboard import (
+    WorkerState,
+    WorkerStateCount,
+    count_worker_states,
+    count_worker_states_by_process,
+    get_active_processes,
 )
 from .server_status import (
+    FastWorker,
+    LxmlServerStatusParser,
+    ParsedAutoServerStatus,
     ParsedServerStatus,
     ServerStatus,
     Worker,
-    WorkerState,
-    WorkerStateCount,
+    WorkerTable,
+    iter_worker_rows,
 )
 
 
 __all__ = [
     "BalancerManager",
+    "BalancerManagerChanges",
+    "Bucket",
     "Cluster",
+    "Event",
+    "FastCluster",
+    "FastRoute",
+    "FastRouteStatus",
+    "FastWorker",
+    "HistoryStore",
     "ImmutableStatus",
+    "LxmlServerStatusParser",
+    "ParsedAutoServerStatus",
     "ParsedBalancerManager",
     "ParsedServerStatus",
+    "RateTracker",
+    "RingBuffer",
     "Route",
+    "RouteAddedEvent",
+    "RouteElectedEvent",
+    "RouteEvent",
+    "RouteRates",
+    "RouteRemovedEvent",
     "RouteStatus",
+    "RouteStatusEvent",
+    "RouteStatusFlag",
     "ServerStatus",
+    "ServerStatusRates",
     "Status",
     "Worker",
     "WorkerState",
     "WorkerStateCount",
+    "WorkerStateEvent",
+    "WorkerTable",
+    "count_route_statuses",
+    "count_worker_states",
+    "count_worker_states_by_process",
+    "get_active_processes",
+    "get_balancer_manager_events",
+    "get_worker_state_events",
+    "iter_worker_rows",
 ]
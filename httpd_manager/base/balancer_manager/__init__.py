@@ -1,14 +1,29 @@
+from .changes import BalancerManagerChanges
 from .cluster import Cluster
+from .fast import FastCluster, FastRoute, FastRouteStatus
 from .manager import BalancerManager
-from .route import ImmutableStatus, Route, Status, RouteStatus, Status
+from .route import (
+    ImmutableStatus,
+    Route,
+    RouteStatus,
+    RouteStatusFlag,
+    Status,
+    count_route_statuses,
+)
 from .parse import ParsedBalancerManager
 
 __all__ = [
     "BalancerManager",
+    "BalancerManagerChanges",
     "Cluster",
+    "FastCluster",
+    "FastRoute",
+    "FastRouteStatus",
     "ImmutableStatus",
     "ParsedBalancerManager",
     "Route",
     "RouteStatus",
+    "RouteStatusFlag",
     "Status",
+    "count_route_statuses",
 ]
@@ -0,0 +1,26 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+# field name => (previous value, new value)
+FieldChanges = dict[str, tuple[Any, Any]]
+
+
+class BalancerManagerChanges(BaseModel):
+    """
+    changes applied to a BalancerManager by an incremental update
+
+    routes are identified by a (cluster name, route name) tuple
+    """
+
+    fields: FieldChanges = {}
+    added_clusters: list[str] = []
+    removed_clusters: list[str] = []
+    modified_clusters: dict[str, FieldChanges] = {}
+    added_routes: list[tuple[str, str]] = []
+    removed_routes: list[tuple[str, str]] = []
+    modified_routes: dict[tuple[str, str], FieldChanges] = {}
+
+    def __bool__(self) -> bool:
+        return any(value for _, value in self)
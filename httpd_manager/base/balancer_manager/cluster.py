@@ -4,9 +4,9 @@ import logging
 from collections import OrderedDict
 from typing import Any, Generator
 
-from pydantic import validator
+from pydantic import PrivateAttr, validator
 
-from .route import Route
+from .route import NOT_ELECTABLE, Route
 from ...utils import RegexPatterns
 from ...models import ParsableModel
 
@@ -21,13 +21,7 @@ def get_electable_routes(routes: dict[str, Route]) -> list[Route]:
     """
 
     return [
-        route
-        for route in routes.values()
-        if (
-            route.status.error.value is False
-            and route.status.disabled.value is False
-            and route.status.draining_mode.value is not True
-        )
+        route for route in routes.values() if route.status.flags & NOT_ELECTABLE == 0
     ]
 
 
@@ -44,6 +38,7 @@ class Cluster(ParsableModel, validate_assignment=True):
     active: bool
     routes: dict[str, Route]
     number_of_electable_routes: int = 0
+    _lbsets: dict[int, list[Route]] | None = PrivateAttr(default=None)
 
     @validator("number_of_electable_routes", always=True)
     def validator_number_of_electable_routes(cls, _, values) -> int:
@@ -53,12 +48,21 @@ class Cluster(ParsableModel, validate_assignment=True):
         return self.routes[name]
 
     def lbsets(self) -> dict[int, list[Route]]:
-        lbset_dict: dict[int, list[Route]] = dict()
-        for route in self.routes.values():
-            if route.lbset not in lbset_dict:
-                lbset_dict[route.lbset] = list()
-            lbset_dict[route.lbset].append(route)
-        return OrderedDict(sorted(lbset_dict.items()))
+        """
+        routes grouped by lbset
+
+        The grouping is cached until the routes are changed by an update
+        of the BalancerManager.
+        """
+
+        if self._lbsets is None:
+            lbset_dict: dict[int, list[Route]] = dict()
+            for route in self.routes.values():
+                if route.lbset not in lbset_dict:
+                    lbset_dict[route.lbset] = list()
+                lbset_dict[route.lbset].append(route)
+            self._lbsets = OrderedDict(sorted(lbset_dict.items()))
+        return self._lbsets
 
     def lbset(self, number: int) -> list[Route]:
         _lbsets = self.lbsets()
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Generator, Iterable, Iterator
+from uuid import UUID
+
+from .cluster import Cluster
+from .route import (
+    NOT_ELECTABLE,
+    BaseRouteStatus,
+    Route,
+    RouteStatus,
+    RouteStatusFlag,
+    get_route_status_flags,
+)
+from ...models import bytes_to_int
+from ...utils import RegexPatterns
+
+
+__all__ = ["FastCluster", "FastRoute", "FastRouteStatus"]
+
+_ROUTE_FIELDS = (
+    "name",
+    "cluster",
+    "worker",
+    "priority",
+    "route_redir",
+    "factor",
+    "lbset",
+    "elected",
+    "busy",
+    "load",
+    "to_",
+    "from_",
+    "session_nonce_uuid",
+    "status",
+)
+_CLUSTER_FIELDS = (
+    "name",
+    "max_members",
+    "max_members_used",
+    "sticky_session",
+    "disable_failover",
+    "timeout",
+    "failover_attempts",
+    "method",
+    "path",
+    "active",
+    "routes",
+    "number_of_electable_routes",
+)
+
+
+class _FastModel:
+    __slots__: tuple[str, ...] = ()
+    _fields: tuple[str, ...] = ()
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> Any:
+        # instances are built from trusted parser output; never coerce
+        if not isinstance(value, cls):
+            raise TypeError(f"{cls.__name__} required")
+        return value
+
+    def __iter__(self) -> Iterator[tuple[str, Any]]:
+        for field in self._fields:
+            yield (field, getattr(self, field))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return all(getattr(self, x) == getattr(other, x) for x in self._fields)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in self)
+        return f"{type(self).__name__}({values})"
+
+
+class FastRouteStatus(BaseRouteStatus, _FastModel):
+    """
+    RouteStatus without pydantic validation
+    """
+
+    __slots__ = ("flags",)
+
+    def __init__(self, flags: int = 0):
+        self.flags = flags
+
+    @classmethod
+    def from_status_codes(cls, status_codes: str) -> "FastRouteStatus":
+        return cls(get_route_status_flags(status_codes))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FastRouteStatus):
+            return NotImplemented
+        return self.flags == other.flags
+
+    def __repr__(self) -> str:
+        return f"FastRouteStatus(flags={RouteStatusFlag(self.flags)!r})"
+
+    def to_pydantic(self) -> RouteStatus:
+        return RouteStatus(flags=self.flags)
+
+
+class FastRoute(_FastModel):
+    """
+    Route without pydantic validation
+
+    The values are converted by _get_parsed_pairs and trusted as-is.
+    """
+
+    __slots__ = _ROUTE_FIELDS
+    _fields = _ROUTE_FIELDS
+
+    name: str
+    cluster: str
+    worker: str
+    priority: int
+    route_redir: str
+    factor: float
+    lbset: int
+    elected: int
+    busy: int
+    load: int
+    to_: int
+    from_: int
+    session_nonce_uuid: UUID
+    status: FastRouteStatus
+
+    def __init__(
+        self,
+        name: str,
+        cluster: str,
+        worker: str,
+        priority: int,
+        route_redir: str,
+        factor: float,
+        lbset: int,
+        elected: int,
+        busy: int,
+        load: int,
+        to_: int,
+        from_: int,
+        session_nonce_uuid: UUID,
+        status: FastRouteStatus,
+    ):
+        self.name = name
+        self.cluster = cluster
+        self.worker = worker
+        self.priority = priority
+        self.route_redir = route_redir
+        self.factor = factor
+        self.lbset = lbset
+        self.elected = elected
+        self.busy = busy
+        self.load = load
+        self.to_ = to_
+        self.from_ = from_
+        self.session_nonce_uuid = session_nonce_uuid
+        self.status = status
+
+    @property
+    def electable(self) -> bool:
+        """
+        Return true/false if Route is eligible to be used for active traffic.
+        """
+
+        flags = self.status.flags
+        return flags & NOT_ELECTABLE == 0 and flags & RouteStatusFlag.OK != 0
+
+    @classmethod
+    def parse_obj(cls, obj: dict[str, Any] | Iterable[tuple[str, Any]]) -> "FastRoute":
+        return cls(**dict(obj))
+
+    @classmethod
+    def _get_parsed_pairs(
+        cls, data: dict[str, str], **kwargs
+    ) -> Generator[tuple[str, Any], None, None]:
+        yield ("name", data["name"])
+
+        m = RegexPatterns.CLUSTER_NAME.match(data["worker_url"])
+        yield ("cluster", m.group(1))
+
+        m = RegexPatterns.SESSION_NONCE_UUID.search(data["worker_url"])
+        yield ("session_nonce_uuid", UUID(m.group(1)))
+
+        m = RegexPatterns.BANDWIDTH_USAGE.search(data["to"])
+        yield ("to_", bytes_to_int(m.group(1), m.group(2)))
+
+        m = RegexPatterns.BANDWIDTH_USAGE.search(data["from"])
+        yield ("from_", bytes_to_int(m.group(1), m.group(2)))
+
+        yield ("worker", data["worker"])
+        yield ("priority", int(data["priority"]))
+        yield ("route_redir", data["route_redir"])
+        yield ("factor", float(data["factor"]))
+        yield ("lbset", int(data["lbset"]))
+        yield ("elected", int(data["elected"]))
+        yield ("busy", int(data["busy"]))
+        yield ("load", int(data["load"]))
+        yield (
+            "status",
+            FastRouteStatus.from_status_codes(data["active_status_codes"]),
+        )
+
+    def to_pydantic(self) -> Route:
+        values = dict(self)
+        values["status"] = self.status.to_pydantic()
+        return Route.parse_obj(values)
+
+
+class FastCluster(_FastModel):
+    """
+    Cluster without pydantic validation
+
+    Like the validator of Cluster, assigning number_of_electable_routes
+    counts the electable routes again.
+    """
+
+    __slots__ = (*_CLUSTER_FIELDS[:-1], "_number_of_electable_routes", "_lbsets")
+    _fields = _CLUSTER_FIELDS
+
+    name: str
+    max_members: int
+    max_members_used: int
+    sticky_session: str | None
+    disable_failover: bool
+    timeout: int
+    failover_attempts: int
+    method: str
+    path: str
+    active: bool
+    routes: dict[str, FastRoute]
+
+    def __init__(
+        self,
+        name: str,
+        max_members: int,
+        max_members_used: int,
+        sticky_session: str | None,
+        disable_failover: bool,
+        timeout: int,
+        failover_attempts: int,
+        method: str,
+        path: str,
+        active: bool,
+        routes: dict[str, FastRoute],
+        number_of_electable_routes: int = 0,
+    ):
+        self.name = name
+        self.max_members = max_members
+        self.max_members_used = max_members_used
+        self.sticky_session = sticky_session
+        self.disable_failover = disable_failover
+        self.timeout = timeout
+        self.failover_attempts = failover_attempts
+        self.method = method
+        self.path = path
+        self.active = active
+        self.routes = routes
+        self.number_of_electable_routes = number_of_electable_routes
+        self._lbsets: dict[int, list[FastRoute]] | None = None
+
+    @property
+    def number_of_electable_routes(self) -> int:
+        return self._number_of_electable_routes
+
+    @number_of_electable_routes.setter
+    def number_of_electable_routes(self, _: int) -> None:
+        self._number_of_electable_routes = sum(
+            1 for x in self.routes.values() if x.status.flags & NOT_ELECTABLE == 0
+        )
+
+    def route(self, name: str) -> FastRoute:
+        return self.routes[name]
+
+    def lbsets(self) -> dict[int, list[FastRoute]]:
+        if self._lbsets is None:
+            lbset_dict: dict[int, list[FastRoute]] = dict()
+            for route in self.routes.values():
+                lbset_dict.setdefault(route.lbset, list()).append(route)
+            self._lbsets = OrderedDict(sorted(lbset_dict.items()))
+        return self._lbsets
+
+    def lbset(self, number: int) -> list[FastRoute]:
+        _lbsets = self.lbsets()
+        if number not in _lbsets:
+            raise ValueError(f"lbset {number} does not exist")
+        return _lbsets[number]
+
+    @classmethod
+    def parse_obj(
+        cls, obj: dict[str, Any] | Iterable[tuple[str, Any]]
+    ) -> "FastCluster":
+        return cls(**dict(obj))
+
+    @classmethod
+    def _get_parsed_pairs(
+        cls, data: dict[str, str], **kwargs
+    ) -> Generator[tuple[str, Any], None, None]:
+        # the values of Cluster are already converted
+        yield from Cluster._get_parsed_pairs(data, **kwargs)
+
+    def to_pydantic(self) -> Cluster:
+        values = dict(self)
+        values["routes"] = {
+            name: route.to_pydantic() for name, route in self.routes.items()
+        }
+        return Cluster.parse_obj(values)
@@ -0,0 +1,118 @@
+from typing import Any, Collection
+
+from .changes import BalancerManagerChanges
+from .route import RouteStatusFlag
+
+
+__all__ = ["RouteIndex"]
+
+# (cluster name, route name)
+RouteKey = tuple[str, str]
+
+
+class RouteIndex:
+    """
+    lookup tables for the routes of every cluster of a BalancerManager
+
+    Routes are indexed by name, worker url, lbset and each status flag.
+    The tables are built once and then kept in sync with the changes of
+    incremental updates.
+    """
+
+    def __init__(self, clusters: dict[str, Any]):
+        self.clusters = clusters
+        # indexed values of each route; used to remove the route later
+        self._entries: dict[RouteKey, tuple[str, str, int, int]] = dict()
+        self._by_name: dict[str, dict[RouteKey, Any]] = dict()
+        self._by_worker: dict[str, dict[RouteKey, Any]] = dict()
+        self._by_lbset: dict[int, dict[RouteKey, Any]] = dict()
+        self._by_flag: dict[int, dict[RouteKey, Any]] = {
+            int(x): dict() for x in RouteStatusFlag
+        }
+
+        for cluster in clusters.values():
+            for route in cluster.routes.values():
+                self.add(route)
+
+    def add(self, route: Any) -> None:
+        key = (route.cluster, route.name)
+        self.remove(key)
+
+        flags = route.status.flags
+        self._entries[key] = (route.name, route.worker, route.lbset, flags)
+        self._by_name.setdefault(route.name, dict())[key] = route
+        self._by_worker.setdefault(route.worker, dict())[key] = route
+        self._by_lbset.setdefault(route.lbset, dict())[key] = route
+        for flag, routes in self._by_flag.items():
+            if flags & flag:
+                routes[key] = route
+
+    def remove(self, key: RouteKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        name, worker, lbset, flags = entry
+        _discard(self._by_name, name, key)
+        _discard(self._by_worker, worker, key)
+        _discard(self._by_lbset, lbset, key)
+        for flag, routes in self._by_flag.items():
+            if flags & flag:
+                routes.pop(key, None)
+
+    def apply_changes(self, changes: BalancerManagerChanges) -> None:
+        for key in changes.removed_routes:
+            self.remove(key)
+        for cluster, name in [*changes.added_routes, *changes.modified_routes]:
+            self.add(self.clusters[cluster].routes[name])
+
+    def find_routes(
+        self,
+        cluster: str | None = None,
+        name: str | None = None,
+        worker: str | None = None,
+        lbset: int | None = None,
+        status: int | None = None,
+    ) -> list[Any]:
+        """
+        return the routes which match every given value
+
+        status matches routes with all of the given RouteStatusFlag bits set
+        """
+
+        candidates: list[Collection[Any]] = list()
+        if cluster is not None:
+            if cluster not in self.clusters:
+                return []
+            candidates.append(self.clusters[cluster].routes.values())
+        if name is not None:
+            candidates.append(self._by_name.get(name, {}).values())
+        if worker is not None:
+            candidates.append(self._by_worker.get(worker, {}).values())
+        if lbset is not None:
+            candidates.append(self._by_lbset.get(lbset, {}).values())
+        if status:
+            for flag, routes in self._by_flag.items():
+                if status & flag:
+                    candidates.append(routes.values())
+        if not candidates:
+            return [x for y in self.clusters.values() for x in y.routes.values()]
+
+        # filter the smallest table by the remaining values
+        return [
+            route
+            for route in min(candidates, key=len)
+            if (cluster is None or route.cluster == cluster)
+            and (name is None or route.name == name)
+            and (worker is None or route.worker == worker)
+            and (lbset is None or route.lbset == lbset)
+            and (not status or route.status.flags & status == status)
+        ]
+
+
+def _discard(table: dict[Any, dict[RouteKey, Any]], value: Any, key: RouteKey) -> None:
+    routes = table.get(value)
+    if routes is not None:
+        routes.pop(key, None)
+        if not routes:
+            del table[value]
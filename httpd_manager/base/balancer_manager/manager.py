@@ -1,23 +1,26 @@
 import logging
 from datetime import datetime
-from typing import Any, Generator, Type, TypedDict
+from typing import Any, Generator, Iterable, Type, TypedDict
 
-import dateparser
-from pydantic import HttpUrl
+from pydantic import HttpUrl, PrivateAttr
 
+from .changes import BalancerManagerChanges, FieldChanges
 from .cluster import Cluster
+from .fast import FastCluster, FastRoute
+from .index import RouteIndex
 from .parse import ParsedBalancerManager
 from .route import Route
+from ...engine import ParserEngine
 from ...models import ParsableModel
-from ...utils import utcnow, RegexPatterns
+from ...utils import parse_date, utcnow, RegexPatterns
 
 
 logger = logging.getLogger(__name__)
 
 
 class ParseOptions(TypedDict):
-    cluster_class: Type[Cluster]
-    route_class: Type[Route]
+    cluster_class: Type[Cluster] | Type[FastCluster]
+    route_class: Type[Route] | Type[FastRoute]
 
 
 class BalancerManager(ParsableModel, validate_assignment=True):
@@ -26,28 +29,121 @@ class BalancerManager(ParsableModel, validate_assignment=True):
     httpd_version: str
     httpd_built_date: datetime
     openssl_version: str
-    clusters: dict[str, Cluster]
+    clusters: dict[str, FastCluster | Cluster]
     _parse_options: ParseOptions = {
         "cluster_class": Cluster,
         "route_class": Route,
     }
+    _fast_parse_options: ParseOptions = {
+        "cluster_class": FastCluster,
+        "route_class": FastRoute,
+    }
+    _parsed: ParsedBalancerManager | None = PrivateAttr(default=None)
+    _fast_models: bool = PrivateAttr(default=False)
+    _index: RouteIndex | None = PrivateAttr(default=None)
+    _clusters_filter: tuple[str, ...] | None = PrivateAttr(default=None)
+
+    def __init__(self, *args, **kwargs):
+        fast_models = kwargs.pop("fast_models", False)
+        super().__init__(*args, **kwargs)
+        self._fast_models = fast_models
 
     def cluster(self, name: str):
         return self.clusters[name]
 
+    def find_routes(
+        self,
+        cluster: str | None = None,
+        name: str | None = None,
+        worker: str | None = None,
+        lbset: int | None = None,
+        status: int | None = None,
+    ) -> list[Any]:
+        """
+        return the routes of every cluster which match all of the given values
+
+        status is a RouteStatusFlag; every flag it contains must be set.
+        The lookup tables are built on first use and kept up to date by
+        incremental updates.
+        """
+
+        return self._get_index().find_routes(
+            cluster=cluster, name=name, worker=worker, lbset=lbset, status=status
+        )
+
+    def _get_index(self) -> RouteIndex:
+        # a full update replaces the clusters dict; build the tables again
+        if self._index is None or self._index.clusters is not self.clusters:
+            self._index = RouteIndex(self.clusters)
+        return self._index
+
     @classmethod
-    def parse_payload(cls, payload: str, **kwargs) -> "BalancerManager":
-        parsed_model = ParsedBalancerManager.parse_payload(payload, **kwargs)
+    def parse_payload(
+        cls,
+        payload: str,
+        engine: ParserEngine | str | None = None,
+        clusters: Iterable[str] | None = None,
+        **kwargs,
+    ) -> "BalancerManager":
+        """
+        clusters limits the model to the clusters with these names
+        """
+
+        clusters = None if clusters is None else tuple(clusters)
+        parsed_model = ParsedBalancerManager.parse_payload(
+            payload, engine=engine, clusters=clusters, **kwargs
+        )
         model_props = dict(cls._get_parsed_pairs(parsed_model, **kwargs))
-        return cls.parse_obj(model_props)
+        model = cls.parse_obj(model_props)
+        model._parsed = parsed_model
+        model._clusters_filter = clusters
+        return model
+
+    @classmethod
+    def _get_model_options(cls, fast_models: bool = False) -> ParseOptions:
+        """
+        fast_models=True builds FastCluster and FastRoute objects which are
+        not validated by pydantic
+        """
+
+        return cls._fast_parse_options if fast_models else cls._parse_options
 
     @classmethod
     def _get_parsed_pairs(
         cls, data: ParsedBalancerManager, **kwargs
     ) -> Generator[tuple[str, Any], None, None]:
-        _cluster_class = cls._parse_options["cluster_class"]
-        _route_class = cls._parse_options["route_class"]
+        _options = cls._get_model_options(kwargs.get("fast_models", False))
+        _cluster_class = _options["cluster_class"]
+        _route_class = _options["route_class"]
+
+        yield from cls._get_parsed_properties(data)
+
+        # group the routes by cluster to avoid filtering every route per cluster
+        routes: dict[str, list[Route | FastRoute]] = dict()
+        for route in data.routes:
+            route_data = _route_class._get_parsed_pairs(route)
+            _route = _route_class.parse_obj(route_data)
+            routes.setdefault(_route.cluster, list()).append(_route)
 
+        clusters = dict()
+        for cluster in data.clusters:
+            cluster_data = _cluster_class._get_parsed_pairs(
+                cluster, routes=routes.get(_cluster_key(cluster), [])
+            )
+            _cluster = _cluster_class.parse_obj(cluster_data)
+            if _cluster.name in clusters:
+                raise ValueError(f"cluster name already exists: {_cluster.name}")
+            clusters[_cluster.name] = _cluster
+
+        yield ("clusters", clusters)
+
+        for key, val in kwargs.items():
+            yield (key, val)
+
+    @classmethod
+    def _get_parsed_properties(
+        cls, data: ParsedBalancerManager
+    ) -> Generator[tuple[str, Any], None, None]:
         yield ("date", utcnow())
 
         m = RegexPatterns.HTTPD_VERSION.match(data.httpd_version)
@@ -56,29 +152,157 @@ class BalancerManager(ParsableModel, validate_assignment=True):
         m = RegexPatterns.HTTPD_BUILT_DATE.match(data.httpd_built_date)
         yield (
             "httpd_built_date",
-            dateparser.parse(m.group(1), settings={"RETURN_AS_TIMEZONE_AWARE": True}),
+            parse_date(m.group(1)),
         )
 
         m = RegexPatterns.OPENSSL_VERSION.search(data.openssl_version)
         yield ("openssl_version", m.group(1))
 
-        routes: list[Route] = list()
-        for route in data.routes:
-            route_data = _route_class._get_parsed_pairs(route)
-            routes.append(_route_class.parse_obj(route_data))
+    def _update_from_parsed_model(
+        self, data: ParsedBalancerManager
+    ) -> BalancerManagerChanges:
+        """
+        apply a newly parsed payload to this model in place
 
-        clusters = dict()
-        for cluster in data.clusters:
-            cluster_data = _cluster_class._get_parsed_pairs(cluster, routes=routes)
-            _cluster = _cluster_class.parse_obj(cluster_data)
-            if _cluster.name in clusters:
-                raise ValueError(f"cluster name already exists: {_cluster.name}")
-            clusters[_cluster.name] = _cluster
+        Raw rows are compared with the rows of the previous parse and only
+        the Route and Cluster objects which differ are rebuilt; unchanged
+        objects are neither allocated nor validated again.
+        """
 
-        yield ("clusters", clusters)
+        _options = self._get_model_options(self._fast_models)
+        _cluster_class = _options["cluster_class"]
+        _route_class = _options["route_class"]
+        previous = self._parsed
+        changes = BalancerManagerChanges()
 
-        for key, val in kwargs.items():
-            yield (key, val)
+        # top-level properties
+        for field, value in self._get_parsed_properties(data):
+            if field == "date":
+                self.date = value
+            elif previous is None or getattr(previous, field) != getattr(data, field):
+                _set_changed_field(self, field, value, changes.fields)
+
+        previous_clusters = dict()
+        previous_routes = dict()
+        if previous is not None:
+            previous_clusters = {_cluster_key(x): x for x in previous.clusters}
+            previous_routes = {_route_key(x): x for x in previous.routes}
+
+        route_rows: dict[str, list[dict[str, Any]]] = dict()
+        for row in data.routes:
+            route_rows.setdefault(_route_key(row)[0], list()).append(row)
+
+        clusters: dict[str, FastCluster | Cluster] = dict()
+        for row in data.clusters:
+            name = _cluster_key(row)
+            if name in clusters:
+                raise ValueError(f"cluster name already exists: {name}")
+
+            if name not in self.clusters:
+                routes = [
+                    _route_class.parse_obj(_route_class._get_parsed_pairs(x))
+                    for x in route_rows.get(name, [])
+                ]
+                cluster_data = _cluster_class._get_parsed_pairs(row, routes=routes)
+                clusters[name] = _cluster_class.parse_obj(cluster_data)
+                changes.added_clusters.append(name)
+                changes.added_routes.extend((name, x.name) for x in routes)
+                continue
+
+            cluster = self.clusters[name]
+            cluster_changes: FieldChanges = dict()
+
+            if row != previous_clusters.get(name):
+                for field, value in _cluster_class._get_parsed_pairs(row):
+                    if field != "routes" and getattr(cluster, field) != value:
+                        _set_changed_field(cluster, field, value, cluster_changes)
+
+            routes_changed = False
+            routes_dict: dict[str, Any] = dict()
+            for route_row in route_rows.get(name, []):
+                key = (name, route_row["name"])
+                route = cluster.routes.get(route_row["name"])
+
+                if route is None:
+                    route = _route_class.parse_obj(
+                        _route_class._get_parsed_pairs(route_row)
+                    )
+                    changes.added_routes.append(key)
+                    routes_changed = True
+                elif route_row != previous_routes.get(key):
+                    new_route = _route_class.parse_obj(
+                        _route_class._get_parsed_pairs(route_row)
+                    )
+                    route_changes: FieldChanges = dict()
+                    for field, value in new_route:
+                        if getattr(route, field) != value:
+                            _set_changed_field(route, field, value, route_changes)
+                    if route_changes:
+                        changes.modified_routes[key] = route_changes
+                        routes_changed = True
+
+                routes_dict[route.name] = route
+
+            for route_name in cluster.routes:
+                if route_name not in routes_dict:
+                    changes.removed_routes.append((name, route_name))
+                    routes_changed = True
+
+            if routes_changed:
+                # mutate in place to avoid validating every route of the cluster
+                if list(cluster.routes) != list(routes_dict):
+                    cluster.routes.clear()
+                    cluster.routes.update(routes_dict)
+                cluster._lbsets = None
+                # reassignment reruns the validator which counts electable routes
+                _set_changed_field(
+                    cluster,
+                    "number_of_electable_routes",
+                    0,
+                    cluster_changes,
+                )
+
+            if cluster_changes:
+                changes.modified_clusters[name] = cluster_changes
+            clusters[name] = cluster
+
+        for name in self.clusters:
+            if name not in clusters:
+                changes.removed_clusters.append(name)
+                changes.removed_routes.extend(
+                    (name, x) for x in self.clusters[name].routes
+                )
+
+        if list(self.clusters) != list(clusters):
+            self.clusters.clear()
+            self.clusters.update(clusters)
+
+        if self._index is not None and self._index.clusters is self.clusters:
+            self._index.apply_changes(changes)
+
+        self._parsed = data
+        return changes
+
+
+def _cluster_key(data: dict[str, Any]) -> str:
+    return RegexPatterns.BALANCER_URI.match(data["name"]).group(1)
+
+
+def _route_key(data: dict[str, Any]) -> tuple[str, str]:
+    return (RegexPatterns.CLUSTER_NAME.match(data["worker_url"]).group(1), data["name"])
+
+
+def _set_changed_field(
+    model: Any, field: str, value: Any, changes: FieldChanges
+) -> None:
+    """
+    assign (and validate) a single field; record it if its value changed
+    """
+
+    previous = getattr(model, field)
+    setattr(model, field, value)
+    if getattr(model, field) != previous:
+        changes[field] = (previous, getattr(model, field))
 
 
 BalancerManager.update_forward_refs()
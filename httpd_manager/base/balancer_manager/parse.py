@@ -1,15 +1,16 @@
 import warnings
 from datetime import datetime
-from typing import Any, Generator
+from typing import Any, Collection, Generator, Iterable
 
 from bs4 import BeautifulSoup
 
+from ...engine import ParserEngine, get_parser_engine
 from ...models import ParsableModel
-from ...utils import utcnow
+from ...utils import RegexPatterns, utcnow
 
 
 try:
-    import lxml as _
+    from lxml import etree
 
     lxml_loaded = True
 except ModuleNotFoundError:
@@ -28,17 +29,49 @@ class ParsedBalancerManager(ParsableModel):
     routes: list[dict[str, str]]
 
     @classmethod
-    def parse_payload(cls, payload: str, **kwargs) -> "ParsedBalancerManager":
+    def parse_payload(
+        cls,
+        payload: str,
+        engine: ParserEngine | str | None = None,
+        clusters: Iterable[str] | None = None,
+        **kwargs,
+    ) -> "ParsedBalancerManager":
+        """
+        clusters limits the parse to the clusters with these names; the rows
+        of every other cluster are skipped
+        """
+
+        return cls.parse_obj(
+            cls._parse_payload_values(
+                payload, engine=engine, clusters=clusters, **kwargs
+            )
+        )
+
+    @classmethod
+    def _parse_payload_values(
+        cls,
+        payload: str,
+        engine: ParserEngine | str | None = None,
+        clusters: Iterable[str] | None = None,
+        **kwargs,
+    ) -> dict[str, Any]:
+        # plain values of the model; see ParsePool
+        if get_parser_engine(engine) is ParserEngine.LXML:
+            parser = LxmlBalancerManagerParser(clusters=clusters)
+            parser.feed(payload)
+            return dict(parser.close())
+
         # parse payload with beautiful soup
         bs4_features = "lxml" if lxml_loaded is True else "html.parser"
         data = BeautifulSoup(payload, features=bs4_features)
-        model_data = dict(cls._get_parsed_pairs(data, **kwargs))
-        return cls.parse_obj(model_data)
+        return dict(cls._get_parsed_pairs(data, clusters=clusters, **kwargs))
 
     @classmethod
     def _get_parsed_pairs(
         cls, data: BeautifulSoup, **kwargs
     ) -> Generator[tuple[str, Any], None, None]:
+        _clusters_filter = _get_clusters_filter(kwargs.get("clusters"))
+
         # record date of initial parse
         yield ("date", utcnow())
 
@@ -66,7 +99,9 @@ class ParsedBalancerManager(ParsableModel):
         yield ("openssl_version", _bs_dt[0].text)
 
         _clusters = list()
-        for table in _bs_table_clusters:
+        # indexes of the clusters which are filtered out
+        _excluded = set()
+        for index, table in enumerate(_bs_table_clusters):
             header_elements = table.findPreviousSiblings("h3", limit=1)
 
             if len(header_elements) != 1:
@@ -75,6 +110,10 @@ class ParsedBalancerManager(ParsableModel):
                 )
 
             header = header_elements[0]
+            name = header.a.text if header.a else header.text
+            if not _is_included(name, _clusters_filter):
+                _excluded.add(index)
+                continue
 
             for row in table.find_all("tr"):
                 cells = row.find_all("td")
@@ -88,7 +127,7 @@ class ParsedBalancerManager(ParsableModel):
                 # HTML = <td>JSESSIONID<td>Off</td></td>
                 _clusters.append(
                     {
-                        "name": header.a.text if header.a else header.text,
+                        "name": name,
                         "max_members": cells[0].text,
                         "sticky_session": cells[1]
                         .find(string=True, recursive=False)
@@ -105,7 +144,10 @@ class ParsedBalancerManager(ParsableModel):
         yield ("clusters", _clusters)
 
         _routes = list()
-        for table in _bs_table_routes:
+        for index, table in enumerate(_bs_table_routes):
+            if index in _excluded:
+                continue
+
             for i, row in enumerate(table.find_all("tr")):
                 cells = row.find_all("td")
 
@@ -117,7 +159,7 @@ class ParsedBalancerManager(ParsableModel):
                         "name": cells[1].text,
                         "worker_url": cells[0].find("a")["href"],
                         "worker": cells[0].find("a").text,
-                        "priority": i,
+                        "priority": str(i),
                         "route_redir": cells[2].text,
                         "factor": cells[3].text,
                         "lbset": cells[4].text,
@@ -131,3 +173,149 @@ class ParsedBalancerManager(ParsableModel):
                 )
 
         yield ("routes", _routes)
+
+
+def _get_clusters_filter(clusters: Iterable[str] | None) -> frozenset[str] | None:
+    return None if clusters is None else frozenset(clusters)
+
+
+def _is_included(header: str, clusters: Collection[str] | None) -> bool:
+    if clusters is None:
+        return True
+    m = RegexPatterns.BALANCER_URI.match(header)
+    return (m.group(1) if m else header) in clusters
+
+
+def _text(element) -> str:
+    return "".join(element.itertext())
+
+
+def _in_form(element) -> bool:
+    return next(element.iterancestors("form"), None) is not None
+
+
+class LxmlBalancerManagerParser:
+    """
+    single-pass alternative to the BeautifulSoup parser
+
+    The payload is fed to lxml's pull parser and each row is converted
+    to a dict as soon as its closing tag is seen, then cleared. The
+    resulting pairs are identical to ParsedBalancerManager._get_parsed_pairs.
+    """
+
+    def __init__(self, clusters: Iterable[str] | None = None) -> None:
+        if lxml_loaded is False:
+            raise ModuleNotFoundError("the lxml parser engine requires lxml")
+
+        self._parser = etree.HTMLPullParser(
+            events=("end",), tag=("h1", "dt", "h3", "tr", "table")
+        )
+        self._date = utcnow()
+        self._h1: list[str] = list()
+        self._dt: list[str] = list()
+        self._header: str | None = None
+        self._clusters_filter = _get_clusters_filter(clusters)
+        # rows are skipped until the next <h3> when the cluster is filtered out
+        self._skip = False
+        self._table_count = 0
+        self._row_count = 0
+        self._clusters: list[dict[str, Any]] = list()
+        self._routes: list[dict[str, Any]] = list()
+
+    def feed(self, data: str | bytes) -> None:
+        self._parser.feed(data)
+        self._read_events()
+
+    def close(self) -> Generator[tuple[str, Any], None, None]:
+        self._parser.close()
+        self._read_events()
+
+        yield ("date", self._date)
+
+        # initial payload validation
+        if len(self._h1) != 1 or "Load Balancer Manager" not in self._h1[0]:
+            raise ValueError(
+                "initial html validation failed; is this really an Httpd Balancer Manager page?"
+            )
+
+        if len(self._dt) < 2:
+            raise ValueError(
+                f"at least 2 <dt> tags are expected ({len(self._dt)} found)"
+            )
+
+        yield ("httpd_version", self._dt[0])
+        yield ("httpd_built_date", self._dt[1])
+        yield ("openssl_version", self._dt[0])
+        yield ("clusters", self._clusters)
+        yield ("routes", self._routes)
+
+    def _read_events(self) -> None:
+        for _, element in self._parser.read_events():
+            # tables inside of forms do not contain clusters or routes
+            if _in_form(element):
+                continue
+
+            tag = element.tag
+            if tag == "tr":
+                if not self._skip:
+                    self._read_row(element)
+                self._row_count += 1
+                element.clear()
+            elif tag == "table":
+                self._table_count += 1
+                self._row_count = 0
+                element.clear()
+            elif tag == "h3":
+                a = next(element.iter("a"), None)
+                self._header = _text(a if a is not None else element)
+                self._skip = not _is_included(self._header, self._clusters_filter)
+            elif tag == "dt":
+                self._dt.append(_text(element))
+            elif tag == "h1":
+                self._h1.append(_text(element))
+
+    def _read_row(self, row) -> None:
+        cells = list(row.iter("td"))
+
+        if len(cells) == 0:
+            return
+
+        # even tables describe a cluster; odd tables list its routes
+        if self._table_count % 2 == 0:
+            if self._header is None:
+                raise ValueError("single <h3> tag is expected (0 found)")
+
+            # see ParsedBalancerManager._get_parsed_pairs() for the httpd 2.4.20
+            # StickySession workaround; .text is the first direct string of the cell
+            self._clusters.append(
+                {
+                    "name": self._header,
+                    "max_members": _text(cells[0]),
+                    "sticky_session": (cells[1].text or "").strip(),
+                    "disable_failover": _text(cells[2]),
+                    "timeout": _text(cells[3]),
+                    "failover_attempts": _text(cells[4]),
+                    "method": _text(cells[5]),
+                    "path": _text(cells[6]),
+                    "active": _text(cells[7]),
+                }
+            )
+        else:
+            a = next(cells[0].iter("a"))
+            self._routes.append(
+                {
+                    "name": _text(cells[1]),
+                    "worker_url": a.get("href"),
+                    "worker": _text(a),
+                    "priority": str(self._row_count),
+                    "route_redir": _text(cells[2]),
+                    "factor": _text(cells[3]),
+                    "lbset": _text(cells[4]),
+                    "elected": _text(cells[6]),
+                    "busy": _text(cells[7]),
+                    "load": _text(cells[8]),
+                    "to": _text(cells[9]),
+                    "from": _text(cells[10]),
+                    "active_status_codes": _text(cells[5]),
+                }
+            )
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Generator
+from enum import IntFlag
+from collections import Counter
+from typing import Any, Generator, Iterable
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, root_validator
+from pydantic.utils import ValueItems
 
 from ...models import Bytes
 from ...utils import RegexPatterns
@@ -12,11 +15,84 @@ from ...models import ParsableModel
 
 
 logger = logging.getLogger(__name__)
-__all__ = ["ImmutableStatus", "Route", "Status"]
+__all__ = [
+    "ImmutableStatus",
+    "Route",
+    "RouteStatus",
+    "RouteStatusFlag",
+    "Status",
+    "count_route_statuses",
+]
 
 
-class BaseStatus(BaseModel, validate_assignment=True):
-    pass
+class RouteStatusFlag(IntFlag):
+    OK = 1
+    ERROR = 2
+    IGNORE_ERRORS = 4
+    DRAINING_MODE = 8
+    DISABLED = 16
+    HOT_STANDBY = 32
+    HOT_SPARE = 64
+    STOPPED = 128
+
+
+# RouteStatus field, flag, code shown in the balancer-manager status column
+# and the w_status_* form code (None for statuses which cannot be changed)
+ROUTE_STATUS_FIELDS: tuple[tuple[str, RouteStatusFlag, str, str | None], ...] = (
+    ("ok", RouteStatusFlag.OK, "Ok", None),
+    ("error", RouteStatusFlag.ERROR, "Err", None),
+    ("ignore_errors", RouteStatusFlag.IGNORE_ERRORS, "Ign", "I"),
+    ("draining_mode", RouteStatusFlag.DRAINING_MODE, "Drn", "N"),
+    ("disabled", RouteStatusFlag.DISABLED, "Dis", "D"),
+    ("hot_standby", RouteStatusFlag.HOT_STANDBY, "Stby", "H"),
+    ("hot_spare", RouteStatusFlag.HOT_SPARE, "Spar", "R"),
+    ("stopped", RouteStatusFlag.STOPPED, "Stop", "S"),
+)
+
+
+# statuses which make a route unable to accept new traffic
+NOT_ELECTABLE = (
+    RouteStatusFlag.ERROR | RouteStatusFlag.DISABLED | RouteStatusFlag.DRAINING_MODE
+)
+_STATUS_CODE_FLAGS = tuple(
+    (code, int(flag)) for _, flag, code, _ in ROUTE_STATUS_FIELDS
+)
+
+
+def get_route_status_flags(status_codes: str) -> int:
+    """
+    return the RouteStatusFlag bits of a balancer-manager status column
+    """
+
+    flags = 0
+    for code, flag in _STATUS_CODE_FLAGS:
+        if code in status_codes:
+            flags |= flag
+    return flags
+
+
+def count_route_statuses(routes: Iterable[Any]) -> dict[str, int]:
+    """
+    return the number of routes with each status set
+    """
+
+    # routes share a handful of distinct flag combinations
+    combinations = Counter(route.status.flags for route in routes)
+    return {
+        name: sum(n for flags, n in combinations.items() if flags & flag)
+        for name, flag, _, _ in ROUTE_STATUS_FIELDS
+    }
+
+
+# one instance per status and value is shared by every RouteStatus, so the
+# status objects are read-only
+class BaseStatus(BaseModel, allow_mutation=False):
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise TypeError(
+            "route status objects are shared and read-only; change a route on "
+            'the server with edit_route(status_changes={"disabled": True}) or '
+            "a model with RouteStatus.flags"
+        )
 
 
 class ImmutableStatus(BaseStatus):
@@ -37,34 +113,140 @@ class MutableStatusValues(BaseModel, validate_assignment=True, extra="forbid"):
     stopped: bool
 
 
-class RouteStatus(BaseModel, validate_assignment=True):
-    ok: ImmutableStatus
-    error: ImmutableStatus
-    ignore_errors: Status
-    draining_mode: Status
-    disabled: Status
-    hot_standby: Status
-    hot_spare: Status
-    stopped: Status
+# the status objects are read-only; share one per field and value
+_STATUS_VIEWS: dict[tuple[str, bool], ImmutableStatus | Status] = {
+    (name, value): (
+        ImmutableStatus(value=value)
+        if http_form_code is None
+        else Status(value=value, http_form_code=http_form_code)
+    )
+    for name, _, _, http_form_code in ROUTE_STATUS_FIELDS
+    for value in (False, True)
+}
+
+
+class BaseRouteStatus:
+    """
+    read API of a route status stored as RouteStatusFlag bits
+    """
+
+    __slots__ = ()
+    flags: int
+
+    def _get(self, name: str, flag: RouteStatusFlag) -> Any:
+        return _STATUS_VIEWS[(name, self.flags & flag != 0)]
+
+    @property
+    def ok(self) -> ImmutableStatus:
+        return self._get("ok", RouteStatusFlag.OK)
+
+    @property
+    def error(self) -> ImmutableStatus:
+        return self._get("error", RouteStatusFlag.ERROR)
+
+    @property
+    def ignore_errors(self) -> Status:
+        return self._get("ignore_errors", RouteStatusFlag.IGNORE_ERRORS)
+
+    @property
+    def draining_mode(self) -> Status:
+        return self._get("draining_mode", RouteStatusFlag.DRAINING_MODE)
+
+    @property
+    def disabled(self) -> Status:
+        return self._get("disabled", RouteStatusFlag.DISABLED)
+
+    @property
+    def hot_standby(self) -> Status:
+        return self._get("hot_standby", RouteStatusFlag.HOT_STANDBY)
+
+    @property
+    def hot_spare(self) -> Status:
+        return self._get("hot_spare", RouteStatusFlag.HOT_SPARE)
+
+    @property
+    def stopped(self) -> Status:
+        return self._get("stopped", RouteStatusFlag.STOPPED)
+
+    def __iter__(self) -> Generator[tuple[str, Any], None, None]:
+        # (name, status) of every status, like the fields of the former model
+        for name, flag, _, _ in ROUTE_STATUS_FIELDS:
+            yield (name, self._get(name, flag))
 
     def mutable(self) -> dict[str, Status]:
         return {
-            name: status
-            for name, status in self
-            if not isinstance(status, ImmutableStatus)
+            name: self._get(name, flag)
+            for name, flag, _, http_form_code in ROUTE_STATUS_FIELDS
+            if http_form_code is not None
         }
 
     def get_mutable_values(self) -> MutableStatusValues:
         return MutableStatusValues(
-            ignore_errors=self.ignore_errors.value,
-            draining_mode=self.draining_mode.value,
-            disabled=self.disabled.value,
-            hot_standby=self.hot_standby.value,
-            hot_spare=self.hot_spare.value,
-            stopped=self.stopped.value,
+            **{
+                name: self.flags & flag != 0
+                for name, flag, _, http_form_code in ROUTE_STATUS_FIELDS
+                if http_form_code is not None
+            }
         )
 
 
+class RouteStatus(BaseRouteStatus, BaseModel, validate_assignment=True):
+    """
+    status of a route stored as RouteStatusFlag bits
+
+    dict() and json() keep the ok/error/... status objects of the former
+    model. The status objects are shared and read-only; assigning their
+    value raises TypeError. Change flags instead.
+    """
+
+    flags: int = 0
+
+    def _iter(
+        self,
+        to_dict: bool = False,
+        by_alias: bool = False,
+        include: Any = None,
+        exclude: Any = None,
+        *args,
+        **kwargs,
+    ) -> Generator[tuple[str, Any], None, None]:
+        if not to_dict:
+            # copy() works on the flags
+            yield from super()._iter(
+                to_dict, by_alias, include, exclude, *args, **kwargs
+            )
+            return
+
+        value_include = None if include is None else ValueItems(self, include)
+        value_exclude = None if exclude is None else ValueItems(self, exclude)
+        for name, status in self:
+            if value_exclude is not None and value_exclude.is_excluded(name):
+                continue
+            if value_include is not None and not value_include.is_included(name):
+                continue
+            yield (
+                name,
+                status.dict(
+                    include=value_include and value_include.for_element(name),
+                    exclude=value_exclude and value_exclude.for_element(name),
+                ),
+            )
+
+    @root_validator(pre=True)
+    def validator_status_fields(cls, values: dict[str, Any]) -> dict[str, Any]:
+        # accept the ok=..., disabled=... keywords of the former model
+        if "flags" in values:
+            return values
+        flags = 0
+        for name, flag, _, _ in ROUTE_STATUS_FIELDS:
+            status = values.get(name)
+            if isinstance(status, dict):
+                status = status.get("value")
+            if getattr(status, "value", status) is True:
+                flags |= flag
+        return {"flags": flags}
+
+
 class Route(ParsableModel, validate_assignment=True):
     name: str
     cluster: str
@@ -87,14 +269,8 @@ class Route(ParsableModel, validate_assignment=True):
         Return true/false if Route is eligible to be used for active traffic.
         """
 
-        return all(
-            [
-                self.status.disabled.value is False,
-                self.status.draining_mode.value is False,
-                self.status.error.value is False,
-                self.status.ok.value is True,
-            ]
-        )
+        flags = self.status.flags
+        return flags & NOT_ELECTABLE == 0 and flags & RouteStatusFlag.OK != 0
 
     @classmethod
     def _get_parsed_pairs(
@@ -125,26 +301,5 @@ class Route(ParsableModel, validate_assignment=True):
 
         yield (
             "status",
-            RouteStatus(
-                ok=ImmutableStatus(value="Ok" in data["active_status_codes"]),
-                error=ImmutableStatus(value="Err" in data["active_status_codes"]),
-                ignore_errors=Status(
-                    http_form_code="I", value="Ign" in data["active_status_codes"]
-                ),
-                draining_mode=Status(
-                    http_form_code="N", value="Drn" in data["active_status_codes"]
-                ),
-                disabled=Status(
-                    http_form_code="D", value="Dis" in data["active_status_codes"]
-                ),
-                hot_standby=Status(
-                    http_form_code="H", value="Stby" in data["active_status_codes"]
-                ),
-                hot_spare=Status(
-                    http_form_code="R", value="Spar" in data["active_status_codes"]
-                ),
-                stopped=Status(
-                    http_form_code="S", value="Stop" in data["active_status_codes"]
-                ),
-            ),
+            RouteStatus(flags=get_route_status_flags(data["active_status_codes"])),
         )
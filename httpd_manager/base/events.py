@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from .balancer_manager import BalancerManagerChanges, RouteStatus
+from .balancer_manager.route import ROUTE_STATUS_FIELDS
+from .scoreboard import WorkerStateCount
+
+
+class Event(BaseModel):
+    date: datetime
+
+
+class RouteEvent(Event):
+    cluster: str
+    route: str
+
+
+class RouteAddedEvent(RouteEvent):
+    pass
+
+
+class RouteRemovedEvent(RouteEvent):
+    pass
+
+
+class RouteStatusEvent(RouteEvent):
+    status: str
+    previous: bool
+    value: bool
+
+
+class RouteElectedEvent(RouteEvent):
+    elected: int
+    delta: int
+
+
+class WorkerStateEvent(Event):
+    state: str
+    previous: int
+    value: int
+
+    @property
+    def delta(self) -> int:
+        return self.value - self.previous
+
+
+def get_balancer_manager_events(
+    date: datetime, changes: BalancerManagerChanges
+) -> list[RouteEvent]:
+    """
+    translate the changes of an incremental update into route events
+    """
+
+    events: list[RouteEvent] = list()
+
+    for cluster, route in changes.added_routes:
+        events.append(RouteAddedEvent(date=date, cluster=cluster, route=route))
+
+    for cluster, route in changes.removed_routes:
+        events.append(RouteRemovedEvent(date=date, cluster=cluster, route=route))
+
+    for (cluster, route), fields in changes.modified_routes.items():
+        if "status" in fields:
+            previous_status: RouteStatus
+            status: RouteStatus
+            previous_status, status = fields["status"]
+            changed_flags = previous_status.flags ^ status.flags
+            for name, flag, _, _ in ROUTE_STATUS_FIELDS:
+                if changed_flags & flag:
+                    events.append(
+                        RouteStatusEvent(
+                            date=date,
+                            cluster=cluster,
+                            route=route,
+                            status=name,
+                            previous=previous_status.flags & flag != 0,
+                            value=status.flags & flag != 0,
+                        )
+                    )
+
+        if "elected" in fields:
+            previous_elected, elected = fields["elected"]
+            events.append(
+                RouteElectedEvent(
+                    date=date,
+                    cluster=cluster,
+                    route=route,
+                    elected=elected,
+                    delta=elected - previous_elected,
+                )
+            )
+
+    return events
+
+
+def get_worker_state_events(
+    date: datetime, previous: WorkerStateCount, current: WorkerStateCount
+) -> list[WorkerStateEvent]:
+    return [
+        WorkerStateEvent(
+            date=date, state=state, previous=getattr(previous, state), value=value
+        )
+        for state, value in current
+        if getattr(previous, state) != value
+    ]
@@ -0,0 +1,279 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterator, NamedTuple, Sequence
+
+from .balancer_manager import BalancerManager
+from .scoreboard import WorkerStateCount
+from .server_status import ServerStatus
+
+
+__all__ = [
+    "Bucket",
+    "HistoryStore",
+    "RingBuffer",
+    "ROUTE_HISTORY_FIELDS",
+    "SERVER_HISTORY_FIELDS",
+]
+
+# (url,) of a server or (url, cluster name, route name) of a route
+HistoryKey = tuple[str, ...]
+
+ROUTE_HISTORY_FIELDS = ("elected", "busy", "load", "to_", "from_")
+# requests_per_sec and bytes_per_second are the averages over the uptime
+# reported by mod_status, not the per-interval rates of RateTracker
+SERVER_HISTORY_FIELDS = (
+    "total_accesses",
+    "total_traffic",
+    "requests_per_sec",
+    "bytes_per_second",
+    *WorkerStateCount.__fields__,
+)
+
+
+class Bucket(NamedTuple):
+    start: float
+    samples: int
+    minimum: dict[str, float]
+    maximum: dict[str, float]
+    average: dict[str, float]
+
+
+class RingBuffer:
+    """
+    fixed-size history of the samples of a set of numeric fields
+
+    The timestamps and each field are stored in arrays of doubles which are
+    allocated once; when the buffer is full, the oldest sample is
+    overwritten. Timestamps are POSIX seconds and samples must be appended
+    in time order, so windows are found with a binary search.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._columns = [array("d", bytes(8 * capacity)) for _ in self.fields]
+        # position of the oldest sample
+        self._start = 0
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.itemsize * self.capacity * (len(self._columns) + 1)
+
+    @property
+    def latest(self) -> float | None:
+        if self._length == 0:
+            return None
+        return self._timestamps[(self._start + self._length - 1) % self.capacity]
+
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        if len(values) != len(self._columns):
+            raise ValueError(
+                f"{len(self._columns)} values are expected ({len(values)} found)"
+            )
+        latest = self.latest
+        if latest is not None and timestamp < latest:
+            raise ValueError("samples must be appended in time order")
+
+        index = (self._start + self._length) % self.capacity
+        if self._length == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._length += 1
+
+        self._timestamps[index] = timestamp
+        for column, value in zip(self._columns, values):
+            column[index] = value
+
+    def window(
+        self, start: float | None = None, end: float | None = None
+    ) -> tuple[array, dict[str, array]]:
+        """
+        return the timestamps and the values of each field of the samples
+        with start <= timestamp < end
+        """
+
+        lo, hi = self._get_bounds(start, end)
+        return self._slice(self._timestamps, lo, hi), {
+            name: self._slice(column, lo, hi)
+            for name, column in zip(self.fields, self._columns)
+        }
+
+    def downsample(
+        self, interval: float, start: float | None = None, end: float | None = None
+    ) -> list[Bucket]:
+        """
+        aggregate the samples of a window into buckets of interval seconds
+
+        Buckets are aligned to multiples of interval and empty buckets are
+        omitted.
+        """
+
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+
+        timestamps, columns = self.window(start, end)
+        buckets: list[Bucket] = list()
+        for bucket_start, lo, hi in _get_buckets(timestamps, interval):
+            samples = hi - lo
+            minimum, maximum, average = dict(), dict(), dict()
+            for name, column in columns.items():
+                values = column[lo:hi]
+                minimum[name] = min(values)
+                maximum[name] = max(values)
+                average[name] = sum(values) / samples
+            buckets.append(Bucket(bucket_start, samples, minimum, maximum, average))
+        return buckets
+
+    def _get_bounds(self, start: float | None, end: float | None) -> tuple[int, int]:
+        lo = 0 if start is None else self._bisect(start)
+        hi = self._length if end is None else self._bisect(end)
+        return lo, max(lo, hi)
+
+    def _bisect(self, timestamp: float) -> int:
+        # first logical position with a timestamp >= timestamp
+        lo, hi = 0, self._length
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamps[(self._start + mid) % self.capacity] < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _slice(self, column: array, lo: int, hi: int) -> array:
+        # logical positions to physical positions; at most two slices
+        first = self._start + lo
+        last = self._start + hi
+        if last <= self.capacity:
+            return column[first:last]
+        if first >= self.capacity:
+            return column[first - self.capacity : last - self.capacity]
+        return column[first:] + column[: last - self.capacity]
+
+
+def _get_buckets(
+    timestamps: array, interval: float
+) -> Iterator[tuple[float, int, int]]:
+    lo = 0
+    while lo < len(timestamps):
+        bucket_start = timestamps[lo] // interval * interval
+        hi = bisect_left(timestamps, bucket_start + interval, lo + 1)
+        yield bucket_start, lo, hi
+        lo = hi
+
+
+class HistoryStore:
+    """
+    ring buffers of the numeric fields of every route and server
+
+    Each key gets a RingBuffer of capacity samples when it is first seen,
+    so the memory of a key is fixed no matter how long it is recorded.
+    Only the numbers are copied out of each model.
+    """
+
+    def __init__(self, capacity: int = 720):
+        self.capacity = capacity
+        self._buffers: dict[HistoryKey, RingBuffer] = dict()
+        # keys of the routes of each balancer-manager url
+        self._route_keys: dict[str, set[HistoryKey]] = dict()
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    def __iter__(self) -> Iterator[HistoryKey]:
+        return iter(self._buffers)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(x.nbytes for x in self._buffers.values())
+
+    def get(
+        self, url: str, cluster: str | None = None, route: str | None = None
+    ) -> RingBuffer | None:
+        """
+        return the history of a server, or of a route when cluster and
+        route are given
+        """
+
+        if cluster is None or route is None:
+            return self._buffers.get((url,))
+        return self._buffers.get((url, cluster, route))
+
+    def record_balancer_manager(self, model: BalancerManager) -> None:
+        """
+        append a sample for each route of model
+
+        The history of a route which is no longer in model is dropped.
+        """
+
+        url = str(model.url)
+        timestamp = model.date.timestamp()
+        keys: set[HistoryKey] = set()
+        for cluster in model.clusters.values():
+            for route in cluster.routes.values():
+                key: HistoryKey = (url, cluster.name, route.name)
+                keys.add(key)
+                self._append(
+                    key,
+                    ROUTE_HISTORY_FIELDS,
+                    timestamp,
+                    (
+                        route.elected,
+                        route.busy,
+                        route.load,
+                        route.to_,
+                        route.from_,
+                    ),
+                )
+
+        for key in self._route_keys.get(url, set()) - keys:
+            del self._buffers[key]
+        self._route_keys[url] = keys
+
+    def record_server_status(self, model: ServerStatus) -> None:
+        worker_states = model.worker_states
+        self._append(
+            (str(model.url),),
+            SERVER_HISTORY_FIELDS,
+            model.date.timestamp(),
+            (
+                model.total_accesses,
+                model.total_traffic,
+                model.requests_per_sec,
+                model.bytes_per_second,
+                *(getattr(worker_states, x) for x in WorkerStateCount.__fields__),
+            ),
+        )
+
+    def forget(self, url: str) -> None:
+        """
+        drop the history of a node and its routes
+        """
+
+        self._buffers.pop((url,), None)
+        for key in self._route_keys.pop(url, set()):
+            del self._buffers[key]
+
+    def _append(
+        self,
+        key: HistoryKey,
+        fields: Sequence[str],
+        timestamp: float,
+        values: Sequence[float],
+    ) -> None:
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = RingBuffer(fields, self.capacity)
+
+        # a model which was not refreshed is not recorded twice
+        latest = buffer.latest
+        if latest is None or timestamp > latest:
+            buffer.append(timestamp, values)
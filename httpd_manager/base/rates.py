@@ -0,0 +1,164 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+from .balancer_manager import BalancerManager
+from .server_status import ServerStatus
+
+
+__all__ = ["RateTracker", "RouteRates", "ServerStatusRates", "get_rates"]
+
+# date, restart time and counter values of the previous poll
+Sample = tuple[datetime, datetime | None, tuple[int, ...]]
+
+
+class RouteRates(BaseModel):
+    cluster: str
+    route: str
+    interval: float
+    elected_per_sec: float
+    to_per_sec: float
+    from_per_sec: float
+    restarted: bool = False
+
+
+class ServerStatusRates(BaseModel):
+    interval: float
+    requests_per_sec: float
+    bytes_per_sec: float
+    restarted: bool = False
+
+
+class RateTracker:
+    """
+    per-interval rates from the cumulative counters of successive polls
+
+    Only the counters of the previous poll of each route and server are
+    kept; models are not retained. Rates are available from the second
+    poll of a route or server.
+
+    A counter which went backwards, or a new restart_time, means that
+    httpd was restarted. The counters are then counted from zero since
+    restart_time. The balancer-manager page does not report restart_time,
+    so unless it is given to update_balancer_manager(), the rates of a
+    restarted route are a lower bound over the full interval.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[str, dict[tuple[str, str], Sample]] = dict()
+        self._servers: dict[str, Sample] = dict()
+        self.route_rates: dict[str, dict[tuple[str, str], RouteRates]] = dict()
+        self.server_rates: dict[str, ServerStatusRates] = dict()
+
+    def update_balancer_manager(
+        self, model: BalancerManager, restart_time: datetime | None = None
+    ) -> dict[tuple[str, str], RouteRates]:
+        """
+        return the rates of each route since the previous poll of model.url
+        """
+
+        url = str(model.url)
+        previous_samples = self._routes.get(url, {})
+        previous = next(iter(previous_samples.values()), None)
+        if previous is not None and model.date <= previous[0]:
+            # the model was not refreshed since the previous poll
+            return self.route_rates.get(url, {})
+
+        # routes which were removed are not carried over
+        samples: dict[tuple[str, str], Sample] = dict()
+        rates: dict[tuple[str, str], RouteRates] = dict()
+        for cluster in model.clusters.values():
+            for route in cluster.routes.values():
+                key = (cluster.name, route.name)
+                samples[key] = (
+                    model.date,
+                    restart_time,
+                    (route.elected, route.to_, route.from_),
+                )
+                previous = previous_samples.get(key)
+                if previous is None:
+                    continue
+
+                interval, values, restarted = get_rates(previous, samples[key])
+                rates[key] = RouteRates(
+                    cluster=cluster.name,
+                    route=route.name,
+                    interval=interval,
+                    elected_per_sec=values[0],
+                    to_per_sec=values[1],
+                    from_per_sec=values[2],
+                    restarted=restarted,
+                )
+
+        self._routes[url] = samples
+        self.route_rates[url] = rates
+        return rates
+
+    def update_server_status(self, model: ServerStatus) -> ServerStatusRates | None:
+        """
+        return the rates of the server since the previous poll of model.url
+        """
+
+        url = str(model.url)
+        previous = self._servers.get(url)
+        if previous is not None and model.date <= previous[0]:
+            return self.server_rates.get(url)
+
+        sample = (
+            model.date,
+            model.restart_time,
+            (model.total_accesses, model.total_traffic),
+        )
+        self._servers[url] = sample
+        if previous is None:
+            return None
+
+        interval, values, restarted = get_rates(previous, sample)
+        rates = ServerStatusRates(
+            interval=interval,
+            requests_per_sec=values[0],
+            bytes_per_sec=values[1],
+            restarted=restarted,
+        )
+        self.server_rates[url] = rates
+        return rates
+
+    def forget(self, url: str) -> None:
+        """
+        drop the samples and rates of a node
+        """
+
+        self._routes.pop(url, None)
+        self._servers.pop(url, None)
+        self.route_rates.pop(url, None)
+        self.server_rates.pop(url, None)
+
+
+def get_rates(
+    previous: Sample, sample: Sample
+) -> tuple[float, tuple[float, ...], bool]:
+    """
+    return the interval in seconds, the rate of each counter and whether
+    the counters were reset by a restart
+    """
+
+    previous_date, previous_restart_time, previous_counters = previous
+    date, restart_time, counters = sample
+
+    restarted = (
+        restart_time is not None
+        and previous_restart_time is not None
+        and restart_time != previous_restart_time
+    ) or any(x < y for x, y in zip(counters, previous_counters))
+
+    if restarted:
+        # the counters started from zero at the restart
+        start = previous_date
+        if restart_time is not None and previous_date < restart_time < date:
+            start = restart_time
+        deltas = counters
+    else:
+        start = previous_date
+        deltas = tuple(x - y for x, y in zip(counters, previous_counters))
+
+    interval = (date - start).total_seconds()
+    return interval, tuple(x / interval for x in deltas), restarted
@@ -0,0 +1,125 @@
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class WorkerState(str, Enum):
+    WAITING_FOR_CONNECTION = "_"
+    STARTING_UP = "S"
+    READING_REQUEST = "R"
+    SENDING_REPLY = "W"
+    KEEPALIVE = "K"
+    DNS_LOOKUP = "D"
+    CLOSING_CONNECTION = "C"
+    LOGGING = "L"
+    GRACEFULLY_FINISHING = "G"
+    IDLE = "I"
+    OPEN = "."
+
+
+class WorkerStateCount(BaseModel, validate_assignment=True):
+    closing_connection: int
+    dns_lookup: int
+    gracefully_finishing: int
+    idle: int
+    keepalive: int
+    logging: int
+    open: int
+    reading_request: int
+    sending_reply: int
+    starting_up: int
+    waiting_for_connection: int
+
+    @property
+    def total_slots(self) -> int:
+        return sum(value for _, value in self)
+
+    @property
+    def busy_workers(self) -> int:
+        """
+        slots which are handling a connection (same as BusyWorkers of mod_status)
+
+        Like mod_status, slots which are starting up are not counted.
+        """
+
+        return (
+            self.total_slots
+            - self.open
+            - self.idle
+            - self.starting_up
+            - self.waiting_for_connection
+        )
+
+    @property
+    def idle_workers(self) -> int:
+        """
+        slots which are waiting for a connection (same as IdleWorkers of mod_status)
+        """
+
+        return self.waiting_for_connection
+
+    @property
+    def busy_ratio(self) -> float:
+        """
+        busy workers relative to all running workers (busy + idle)
+        """
+
+        running = self.busy_workers + self.idle_workers
+        return self.busy_workers / running if running else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """
+        busy workers as a percentage of all scoreboard slots
+        """
+
+        total_slots = self.total_slots
+        return self.busy_workers / total_slots * 100 if total_slots else 0.0
+
+
+# (field name, scoreboard character) of each state; built once at import
+_WORKER_STATE_FIELDS = tuple((x.name.lower(), x.value) for x in WorkerState)
+
+
+def count_worker_states(scoreboard: str) -> WorkerStateCount:
+    # str.count() is a C-level scan; it is much faster than a single python
+    # level pass (i.e. collections.Counter) over the scoreboard.
+    # The counts are always ints so validation is skipped.
+    values: dict[str, Any] = {
+        name: scoreboard.count(char) for name, char in _WORKER_STATE_FIELDS
+    }
+    return WorkerStateCount.construct(**values)
+
+
+def count_worker_states_by_process(
+    scoreboard: str, threads_per_child: int
+) -> list[WorkerStateCount]:
+    """
+    count the worker states of each process slot
+
+    The scoreboard has ThreadsPerChild slots for each process, in order.
+    """
+
+    if threads_per_child < 1:
+        raise ValueError("threads_per_child must be at least 1")
+
+    return [
+        count_worker_states(scoreboard[i : i + threads_per_child])
+        for i in range(0, len(scoreboard), threads_per_child)
+    ]
+
+
+def get_active_processes(scoreboard: str, threads_per_child: int) -> int:
+    """
+    number of process slots with at least one slot which is not open
+    """
+
+    if threads_per_child < 1:
+        raise ValueError("threads_per_child must be at least 1")
+
+    return sum(
+        1
+        for i in range(0, len(scoreboard), threads_per_child)
+        if scoreboard[i : i + threads_per_child].strip(WorkerState.OPEN.value)
+    )
@@ -1,18 +1,20 @@
+import re
+import sys
 import warnings
+from array import array
 from datetime import datetime
-from enum import Enum
-from typing import Any, Generator
+from typing import Any, Generator, Iterator, Sequence, overload
 
-import dateparser
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, HttpUrl
 
+from .scoreboard import WorkerStateCount, count_worker_states
 from ..models import Bytes, ParsableModel
-from ..utils import RegexPatterns, utcnow
+from ..utils import RegexPatterns, parse_date, utcnow
 
 
 try:
-    import lxml
+    from lxml import etree
 
     lxml_loaded = True
 except ModuleNotFoundError:
@@ -22,35 +24,31 @@ except ModuleNotFoundError:
     )
 
 
-class WorkerState(str, Enum):
-    WAITING_FOR_CONNECTION = "_"
-    STARTING_UP = "S"
-    READING_REQUEST = "R"
-    SENDING_REPLY = "W"
-    KEEPALIVE = "K"
-    DNS_LOOKUP = "D"
-    CLOSING_CONNECTION = "C"
-    LOGGING = "L"
-    GRACEFULLY_FINISHING = "G"
-    IDLE = "I"
-    OPEN = "."
-
-
-class WorkerStateCount(BaseModel, validate_assignment=True):
-    closing_connection: int
-    dns_lookup: int
-    gracefully_finishing: int
-    idle: int
-    keepalive: int
-    logging: int
-    open: int
-    reading_request: int
-    sending_reply: int
-    starting_up: int
-    waiting_for_connection: int
+class Worker(BaseModel, validate_assignment=True):
+    srv: str
+    pid: int | None
+    acc: str
+    m: str
+    cpu: float
+    ss: int
+    req: int
+    dur: int
+    conn: float
+    child: float
+    slot: float
+    client: str
+    protocol: str
+    vhost: str
+    request: str
 
 
-class Worker(BaseModel, validate_assignment=True):
+class FastWorker:
+    """
+    Worker without pydantic validation; the row is converted as-is
+    """
+
+    __slots__ = tuple(Worker.__fields__)
+
     srv: str
     pid: int | None
     acc: str
@@ -67,6 +65,168 @@ class Worker(BaseModel, validate_assignment=True):
     vhost: str
     request: str
 
+    def __init__(self, row: list[str]):
+        (
+            self.srv,
+            pid,
+            self.acc,
+            self.m,
+            cpu,
+            ss,
+            req,
+            dur,
+            conn,
+            child,
+            slot,
+            self.client,
+            self.protocol,
+            self.vhost,
+            self.request,
+        ) = row
+        self.pid = None if pid == "-" else int(pid)
+        self.cpu = float(cpu)
+        self.ss = int(ss)
+        self.req = int(req)
+        self.dur = int(dur)
+        self.conn = float(conn)
+        self.child = float(child)
+        self.slot = float(slot)
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "FastWorker":
+        if not isinstance(value, cls):
+            raise TypeError("FastWorker required")
+        return value
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, FastWorker):
+            return NotImplemented
+        return all(getattr(self, x) == getattr(other, x) for x in self.__slots__)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{x}={getattr(self, x)!r}" for x in self.__slots__)
+        return f"FastWorker({values})"
+
+    def to_pydantic(self) -> Worker:
+        return Worker.parse_obj({x: getattr(self, x) for x in self.__slots__})
+
+
+class WorkerTable(Sequence[Worker]):
+    """
+    column-oriented alternative to list[Worker]
+
+    Numeric columns are stored in typed arrays (a pid of -1 means no process)
+    and repeated strings are interned. A Worker is only created when a row
+    is accessed.
+    """
+
+    columns = (
+        "srv",
+        "pid",
+        "acc",
+        "m",
+        "cpu",
+        "ss",
+        "req",
+        "dur",
+        "conn",
+        "child",
+        "slot",
+        "client",
+        "protocol",
+        "vhost",
+        "request",
+    )
+    typecodes = {
+        "pid": "q",
+        "cpu": "d",
+        "ss": "q",
+        "req": "q",
+        "dur": "q",
+        "conn": "d",
+        "child": "d",
+        "slot": "d",
+    }
+
+    def __init__(self) -> None:
+        self._columns: dict[str, array | list[str]] = {
+            name: array(self.typecodes[name]) if name in self.typecodes else list()
+            for name in self.columns
+        }
+        self._length = 0
+
+    @classmethod
+    def from_rows(cls, rows: list[list[str]]) -> "WorkerTable":
+        table = cls()
+        for row in rows:
+            table.append(row)
+        return table
+
+    @classmethod
+    def __get_validators__(cls):
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> "WorkerTable":
+        if not isinstance(value, cls):
+            raise TypeError("WorkerTable required")
+        return value
+
+    def append(self, row: list[str]) -> None:
+        for name, value in zip(self.columns, row):
+            column = self._columns[name]
+            if isinstance(column, list):
+                column.append(sys.intern(value))
+            elif name == "pid":
+                column.append(-1 if value == "-" else int(value))
+            elif column.typecode == "q":
+                column.append(int(value))
+            else:
+                column.append(float(value))
+        self._length += 1
+
+    def column(self, name: str) -> array | list[str]:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Worker:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Worker]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Worker | list[Worker]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        values: dict[str, Any] = {
+            name: column[index] for name, column in self._columns.items()
+        }
+        if values["pid"] == -1:
+            values["pid"] = None
+        # values are already typed; skip validation
+        return Worker.construct(**values)
+
+    def __iter__(self) -> Iterator[Worker]:
+        for i in range(self._length):
+            yield self[i]
+
+    def to_pydantic(self) -> list[Worker]:
+        """
+        rows of the table; ServerStatus.dict() and json() serialize the
+        table as this list
+        """
+
+        return list(self)
+
 
 class ParsedServerStatus(ParsableModel, validate_assignment=True):
     date: datetime
@@ -78,21 +238,44 @@ class ParsedServerStatus(ParsableModel, validate_assignment=True):
     bytes_per_second: str
     bytes_per_request: str
     ms_per_request: str
+    total_accesses: str
+    total_traffic: str
     worker_states: str
     workers: list[list[str]] | None
 
     @classmethod
     def parse_payload(cls, payload: str, **kwargs) -> "ParsedServerStatus":
+        """
+        only the part of the page up to the scoreboard is loaded into
+        BeautifulSoup; the worker table is streamed by iter_worker_rows()
+        or not parsed at all when include_workers is False
+        """
+
+        return cls.parse_obj(cls._parse_payload_values(payload, **kwargs))
+
+    @classmethod
+    def _parse_payload_values(cls, payload: str, **kwargs) -> dict[str, Any]:
+        # plain values of the model; see ParsePool
+        # the worker table is not copied out of the payload
+        worker_table = find_worker_table(payload)
+        summary = payload if worker_table is None else payload[:worker_table]
         bs4_features = "lxml" if lxml_loaded is True else "html.parser"
-        data = BeautifulSoup(payload, features=bs4_features)
-        model_data = dict(cls._get_parsed_pairs(data, **kwargs))
-        return cls.parse_obj(model_data)
+        data = BeautifulSoup(summary, features=bs4_features)
+        return dict(
+            cls._get_parsed_pairs(
+                data, payload=payload, worker_table=worker_table, **kwargs
+            )
+        )
 
     @classmethod
     def _get_parsed_pairs(
         cls, data: BeautifulSoup, **kwargs
     ) -> Generator[tuple[str, Any], None, None]:
         _include_workers = kwargs.get("include_workers", True)
+        # offset of the worker table in payload when data only contains the
+        # summary
+        _payload: str = kwargs.get("payload", "")
+        _worker_table: int | None = kwargs.get("worker_table")
 
         # record date of initial parse
         yield ("date", utcnow())
@@ -109,7 +292,7 @@ class ParsedServerStatus(ParsableModel, validate_assignment=True):
             raise ValueError(f"13 <dt> tags are expected ({len(_bs_dt)} found)")
 
         _bs_table = data.find_all("table")
-        if len(_bs_table) == 0:
+        if len(_bs_table) == 0 and _worker_table is None:
             raise ValueError(
                 f"at least 1 <table> tag is expected ({len(_bs_table)} found)"
             )
@@ -132,9 +315,15 @@ class ParsedServerStatus(ParsableModel, validate_assignment=True):
         yield ("bytes_per_request", _bs_dt[11].text)
         yield ("ms_per_request", _bs_dt[11].text)
 
+        # cumulative counters
+        yield ("total_accesses", _bs_dt[9].text)
+        yield ("total_traffic", _bs_dt[9].text)
+
         # worker statistics
         yield ("worker_states", _bs_pre[0].text.replace("\n", ""))
-        if _include_workers is True:
+        if _include_workers is True and _worker_table is not None:
+            yield ("workers", list(iter_worker_rows(_payload, start=_worker_table)))
+        elif _include_workers is True:
             rows = _bs_table[0].find_all(lambda tag: tag.name == "tr")
             # "rows[1:]" is used to skip the header row of the <table>
             workers = [
@@ -147,6 +336,247 @@ class ParsedServerStatus(ParsableModel, validate_assignment=True):
             yield ("workers", None)
 
 
+class ParsedAutoServerStatus(ParsableModel, validate_assignment=True):
+    """
+    raw values from the machine-readable "?auto" variant of mod_status
+    """
+
+    date: datetime
+    httpd_version: str
+    httpd_built_date: str
+    openssl_version: str
+    restart_time: str
+    requests_per_sec: str
+    bytes_per_second: str
+    bytes_per_request: str
+    ms_per_request: str | None
+    total_accesses: str | None
+    total_kbytes: str | None
+    worker_states: str
+
+    @classmethod
+    def parse_payload(cls, payload: str, **kwargs) -> "ParsedAutoServerStatus":
+        data = dict()
+        for line in payload.splitlines():
+            key, sep, value = line.partition(": ")
+            if sep:
+                data[key] = value.strip()
+
+        model_data = dict(cls._get_parsed_pairs(data, **kwargs))
+        return cls.parse_obj(model_data)
+
+    @classmethod
+    def _get_parsed_pairs(
+        cls, data: dict[str, str], **kwargs
+    ) -> Generator[tuple[str, Any], None, None]:
+        # record date of initial parse
+        yield ("date", utcnow())
+
+        # initial payload validation
+        for key in ("ServerVersion", "Server Built", "RestartTime", "Scoreboard"):
+            if key not in data:
+                raise ValueError(
+                    f'initial validation failed; "{key}" is missing from the ?auto payload'
+                )
+
+        # these are only reported when ExtendedStatus is enabled
+        for key in ("ReqPerSec", "BytesPerSec", "BytesPerReq"):
+            if key not in data:
+                raise ValueError(
+                    f'ExtendedStatus field "{key}" is missing from the ?auto payload'
+                )
+
+        yield ("httpd_version", data["ServerVersion"])
+        yield ("openssl_version", data["ServerVersion"])
+        yield ("httpd_built_date", data["Server Built"])
+        yield ("restart_time", data["RestartTime"])
+        yield ("requests_per_sec", data["ReqPerSec"])
+        yield ("bytes_per_second", data["BytesPerSec"])
+        yield ("bytes_per_request", data["BytesPerReq"])
+        # DurationPerReq is not available in older versions of httpd
+        yield ("ms_per_request", data.get("DurationPerReq"))
+        yield ("total_accesses", data.get("Total Accesses"))
+        yield ("total_kbytes", data.get("Total kBytes"))
+        yield ("worker_states", data["Scoreboard"])
+
+
+_SCOREBOARD_END = re.compile(r"</pre\s*>", re.IGNORECASE)
+
+
+def find_worker_table(payload: str) -> int | None:
+    """
+    return the offset of a server-status page after the closing tag of the
+    scoreboard, where the worker table follows
+
+    None is returned if the page has no scoreboard.
+    """
+
+    m = _SCOREBOARD_END.search(payload)
+    if m is None:
+        return None
+    return m.end()
+
+
+def iter_worker_rows(
+    payload: str, chunk_size: int = 65536, start: int = 0
+) -> Iterator[list[str]]:
+    """
+    yield the cells of each row of the first <table> of the payload after
+    offset start
+
+    With lxml, the payload is fed to a pull parser in chunks and each row
+    is discarded as soon as it is converted, so the table is never fully
+    built. Parsing stops at the end of the table.
+    """
+
+    if lxml_loaded is False:
+        tables = BeautifulSoup(payload[start:], features="html.parser").find_all(
+            "table"
+        )
+        if len(tables) == 0:
+            raise ValueError("at least 1 <table> tag is expected (0 found)")
+        # "[1:]" is used to skip the header row of the <table>
+        for row in tables[0].find_all("tr")[1:]:
+            if len(row) == 15:
+                yield [x.text.strip() for x in row.find_all("td")]
+        return
+
+    parser = etree.HTMLPullParser(events=("end",), tag=("tr", "table"))
+    row_count = 0
+    # the last step closes the parser; an unterminated table ends there
+    for i in range(start, len(payload) + chunk_size, chunk_size):
+        if i < len(payload):
+            parser.feed(payload[i : i + chunk_size])
+        else:
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                # nothing follows the scoreboard
+                break
+        for _, element in parser.read_events():
+            if element.tag == "table":
+                return
+
+            # skip the header row of the <table>
+            if row_count > 0 and len(element) == 15:
+                yield ["".join(x.itertext()).strip() for x in element.iter("td")]
+            row_count += 1
+
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    raise ValueError("at least 1 <table> tag is expected (0 found)")
+
+
+class LxmlServerStatusParser:
+    """
+    incremental alternative to ParsedServerStatus.parse_payload
+
+    Chunks of the page are fed to lxml's pull parser as they arrive and each
+    worker row is converted and cleared as soon as its closing tag is seen.
+    The rest of the page is ignored once the worker table (or the scoreboard
+    when include_workers is False) has been read. The resulting pairs are
+    identical to ParsedServerStatus._get_parsed_pairs.
+    """
+
+    def __init__(self, include_workers: bool = True, encoding: str | None = None):
+        if lxml_loaded is False:
+            raise ModuleNotFoundError("the lxml server-status parser requires lxml")
+
+        self._parser = etree.HTMLPullParser(
+            events=("end",),
+            tag=("h1", "dt", "pre", "tr", "table"),
+            encoding=encoding,
+        )
+        self._date = utcnow()
+        self._include_workers = include_workers
+        self._h1: list[str] = list()
+        self._dt: list[str] = list()
+        self._pre: list[str] = list()
+        self._table_count = 0
+        self._row_count = 0
+        self._workers: list[list[str]] = list()
+        self.done = False
+
+    def feed(self, data: str | bytes) -> None:
+        if self.done is False:
+            self._parser.feed(data)
+            self._read_events()
+
+    def close(self) -> Generator[tuple[str, Any], None, None]:
+        if self.done is False:
+            try:
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                # nothing was fed to the parser
+                pass
+            self._read_events()
+
+        yield ("date", self._date)
+
+        # initial payload validation
+        if len(self._h1) != 1 or "Apache Server Status" not in self._h1[0]:
+            raise ValueError(
+                "initial html validation failed; is this really an Httpd Server Status page?"
+            )
+
+        if len(self._dt) != 13:
+            raise ValueError(f"13 <dt> tags are expected ({len(self._dt)} found)")
+
+        if self._include_workers is True and self._table_count == 0:
+            raise ValueError(
+                f"at least 1 <table> tag is expected ({self._table_count} found)"
+            )
+
+        if len(self._pre) != 1:
+            raise ValueError(f"1 <pre> tag is expected ({len(self._pre)} found)")
+
+        yield ("httpd_version", self._dt[0])
+        yield ("openssl_version", self._dt[0])
+        yield ("httpd_built_date", self._dt[2])
+        yield ("restart_time", self._dt[4])
+        yield ("requests_per_sec", self._dt[11])
+        yield ("bytes_per_second", self._dt[11])
+        yield ("bytes_per_request", self._dt[11])
+        yield ("ms_per_request", self._dt[11])
+        yield ("total_accesses", self._dt[9])
+        yield ("total_traffic", self._dt[9])
+        yield ("worker_states", self._pre[0])
+        yield ("workers", self._workers if self._include_workers is True else None)
+
+    def _read_events(self) -> None:
+        for _, element in self._parser.read_events():
+            tag = element.tag
+            if tag == "tr":
+                # the first table lists the workers; skip its header row
+                if self._include_workers is True and self._table_count == 0:
+                    if self._row_count > 0 and len(element) == 15:
+                        self._workers.append(
+                            ["".join(x.itertext()).strip() for x in element.iter("td")]
+                        )
+                    self._row_count += 1
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            elif tag == "table":
+                self._table_count += 1
+                element.clear()
+                if self._include_workers is True:
+                    self.done = True
+            elif tag == "pre":
+                self._pre.append("".join(element.itertext()).replace("\n", ""))
+                if self._include_workers is False:
+                    self.done = True
+            elif tag == "dt":
+                self._dt.append("".join(element.itertext()))
+            elif tag == "h1":
+                self._h1.append("".join(element.itertext()))
+
+            if self.done is True:
+                return
+
+
 class ServerStatus(ParsableModel, validate_assignment=True):
     url: HttpUrl
     date: datetime
@@ -158,12 +588,21 @@ class ServerStatus(ParsableModel, validate_assignment=True):
     bytes_per_second: int
     bytes_per_request: int
     ms_per_request: float
+    total_accesses: int = 0
+    total_traffic: int = 0
     worker_states: WorkerStateCount
-    workers: list[Worker] | None
+    scoreboard: str | None = None
+    workers: WorkerTable | list[Worker] | list[FastWorker] | None
 
     @classmethod
     def parse_payload(cls, payload: str, **kwargs) -> "ServerStatus":
         parsed_model = ParsedServerStatus.parse_payload(payload, **kwargs)
+        return cls.parse_parsed_model(parsed_model, **kwargs)
+
+    @classmethod
+    def parse_parsed_model(
+        cls, parsed_model: ParsedServerStatus, **kwargs
+    ) -> "ServerStatus":
         model_props = dict(cls._get_parsed_pairs(parsed_model, **kwargs))
         return cls.parse_obj(model_props)
 
@@ -182,12 +621,12 @@ class ServerStatus(ParsableModel, validate_assignment=True):
         m = RegexPatterns.HTTPD_BUILT_DATE.match(data.httpd_built_date)
         yield (
             "httpd_built_date",
-            dateparser.parse(m.group(1), settings={"RETURN_AS_TIMEZONE_AWARE": True}),
+            parse_date(m.group(1)),
         )
         m = RegexPatterns.RESTART_TIME.match(data.restart_time)
         yield (
             "restart_time",
-            dateparser.parse(m.group(1), settings={"RETURN_AS_TIMEZONE_AWARE": True}),
+            parse_date(m.group(1)),
         )
 
         # performance
@@ -215,16 +654,32 @@ class ServerStatus(ParsableModel, validate_assignment=True):
         except ValueError:
             yield ("ms_per_request", 0)
 
+        # cumulative counters since the last restart
+        try:
+            m = RegexPatterns.TOTAL_ACCESSES.search(data.total_accesses)
+            yield ("total_accesses", int(m.group(1)))
+        except ValueError:
+            yield ("total_accesses", 0)
+
+        try:
+            # mod_status formats the traffic in multiples of 1024 bytes; the
+            # same as "Total kBytes" of the ?auto payload
+            m = RegexPatterns.TOTAL_TRAFFIC.search(data.total_traffic)
+            exponent = "BKMGT".index(m.group(2)[0].upper())
+            yield ("total_traffic", int(float(m.group(1)) * 1024**exponent))
+        except ValueError:
+            yield ("total_traffic", 0)
+
         # count the number of worker in each state
-        _worker_states = dict()
-        for state_enum in WorkerState:
-            _worker_states[state_enum.name.lower()] = data.worker_states.count(
-                state_enum.value
-            )
-        yield ("worker_states", WorkerStateCount.parse_obj(_worker_states))
+        yield ("worker_states", count_worker_states(data.worker_states))
+        yield ("scoreboard", data.worker_states)
 
         if data.workers is None:
             yield ("workers", None)
+        elif kwargs.get("columnar_workers", False) is True:
+            yield ("workers", WorkerTable.from_rows(data.workers))
+        elif kwargs.get("fast_models", False) is True:
+            yield ("workers", [FastWorker(x) for x in data.workers])
         else:
             _workers = list()
             for row in data.workers:
@@ -251,3 +706,49 @@ class ServerStatus(ParsableModel, validate_assignment=True):
 
         for key, val in kwargs.items():
             yield (key, val)
+
+    @classmethod
+    def parse_auto_payload(cls, payload: str, **kwargs) -> "ServerStatus":
+        parsed_model = ParsedAutoServerStatus.parse_payload(payload, **kwargs)
+        model_props = dict(cls._get_parsed_auto_pairs(parsed_model, **kwargs))
+        return cls.parse_obj(model_props)
+
+    @classmethod
+    def _get_parsed_auto_pairs(
+        cls, data: ParsedAutoServerStatus, **kwargs
+    ) -> Generator[tuple[str, Any], None, None]:
+        yield ("date", data.date)
+        # versions
+        m = RegexPatterns.HTTPD_VERSION_AUTO.match(data.httpd_version)
+        yield ("httpd_version", m.group(1))
+        m = RegexPatterns.OPENSSL_VERSION.search(data.openssl_version)
+        yield ("openssl_version", m.group(1))
+
+        # dates
+        yield (
+            "httpd_built_date",
+            parse_date(data.httpd_built_date),
+        )
+        yield (
+            "restart_time",
+            parse_date(data.restart_time),
+        )
+
+        # performance; the ?auto values are unformatted numbers
+        yield ("requests_per_sec", float(data.requests_per_sec))
+        yield ("bytes_per_second", int(float(data.bytes_per_second)))
+        yield ("bytes_per_request", int(float(data.bytes_per_request)))
+        yield ("ms_per_request", float(data.ms_per_request or 0))
+        yield ("total_accesses", int(data.total_accesses or 0))
+        # "Total kBytes" is counted in units of 1024 bytes
+        yield ("total_traffic", int(data.total_kbytes or 0) * 1024)
+
+        # count the number of worker in each state
+        yield ("worker_states", count_worker_states(data.worker_states))
+        yield ("scoreboard", data.worker_states)
+
+        # the worker table is only available from the html page
+        yield ("workers", None)
+
+        for key, val in kwargs.items():
+            yield (key, val)
@@ -0,0 +1,23 @@
+from contextvars import ContextVar
+from enum import Enum
+
+
+class ParserEngine(str, Enum):
+    BS4 = "bs4"
+    LXML = "lxml"
+
+
+parser_engine: ContextVar[ParserEngine] = ContextVar(
+    "parser_engine", default=ParserEngine.BS4
+)
+
+
+def get_parser_engine(engine: ParserEngine | str | None = None) -> ParserEngine:
+    """
+    resolve the engine for a single parse; an explicit value
+    takes precedence over the parser_engine ContextVar
+    """
+
+    if engine is None:
+        return parser_engine.get()
+    return ParserEngine(engine)
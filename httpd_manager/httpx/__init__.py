@@ -1,5 +1,20 @@
-from .balancer_manager import HttpxBalancerManager
+from .balancer_manager import HttpxBalancerManager, RouteEdit
+from .cache import PayloadCache
+from .exporter import MetricsExporter
+from .fleet import FleetNode, FleetPoller, NodeType
+from .rolling import RollingOperation, RollingOperationAborted
 from .server_status import HttpxServerStatus
 
 
-__all__ = ["HttpxBalancerManager", "HttpxServerStatus"]
+__all__ = [
+    "FleetNode",
+    "FleetPoller",
+    "HttpxBalancerManager",
+    "HttpxServerStatus",
+    "MetricsExporter",
+    "NodeType",
+    "PayloadCache",
+    "RollingOperation",
+    "RollingOperationAborted",
+    "RouteEdit",
+]
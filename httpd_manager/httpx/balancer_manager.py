@@ -1,43 +1,145 @@
 import asyncio
 import logging
 from functools import partial
-from typing import Callable
+from typing import Any, AsyncGenerator, Callable, Iterable
 
-from pydantic import HttpUrl
+from pydantic import BaseModel, HttpUrl, PrivateAttr
 
+from .cache import PayloadCache
 from .client import http_client
+from .watch import watch
+from ..engine import ParserEngine, parser_engine
 from ..executor import executor
+from ..pool import ParsePool
 from ..base import (
     BalancerManager,
+    BalancerManagerChanges,
     Cluster,
+    FastCluster,
+    FastRoute,
     Route,
+    RouteEvent,
     ParsedBalancerManager,
+    get_balancer_manager_events,
 )
+from ..utils import utcnow
 
 
 logger = logging.getLogger(__name__)
 
 
+class RouteEdit(BaseModel):
+    cluster: str
+    route: str
+    force: bool = False
+    factor: float | None = None
+    lbset: int | None = None
+    route_redir: str | None = None
+    status_changes: dict[str, bool] = {}
+
+
 class HttpxBalancerManager(BalancerManager):
-    async def update(self) -> None:
+    _payload_cache: PayloadCache = PrivateAttr(default_factory=PayloadCache)
+
+    @property
+    def payload_cache(self) -> PayloadCache:
+        return self._payload_cache
+
+    async def update(
+        self, incremental: bool = False, clusters: Iterable[str] | None = None
+    ) -> BalancerManagerChanges | None:
+        """
+        refresh the model from the server
+
+        With incremental=True, only the clusters and routes which changed
+        since the previous parse are updated and the changes are returned.
+
+        clusters replaces the cluster names given to parse_from_url; the
+        model only keeps the clusters with these names.
+
+        The page is not parsed again if it is unchanged since the previous
+        update (see payload_cache); only the date is refreshed.
+        """
+
+        if clusters is not None:
+            self._clusters_filter = tuple(clusters)
+            # the cached page was parsed with another filter
+            self._payload_cache.clear()
+
         client = http_client.get()
-        response = await client.get(self.url)
-        response.raise_for_status()
+        response = await client.get(self.url, headers=self._payload_cache.get_headers())
+        if self._payload_cache.is_unchanged(response):
+            self.date = utcnow()
+            return BalancerManagerChanges() if incremental else None
+
+        changes = await self._update_from_payload(
+            response.text, incremental=incremental
+        )
+        self._payload_cache.record(response)
+        return changes
+
+    async def watch(
+        self, interval: float = 1.0, maxsize: int = 1000
+    ) -> AsyncGenerator[RouteEvent, None]:
+        """
+        poll the server with incremental updates and yield route events
+
+        Polling pauses while maxsize events are waiting to be consumed.
+        """
+
+        async def _poll() -> list[RouteEvent]:
+            changes = await self.update(incremental=True)
+            if changes is None:
+                raise RuntimeError("incremental update did not return a change set")
+            return get_balancer_manager_events(self.date, changes)
 
-        await self._update_from_payload(response.text)
+        async for event in watch(_poll, interval=interval, maxsize=maxsize):
+            yield event
 
-    async def _update_from_payload(self, payload: str) -> None:
-        new_model = await self.async_parse_payload(self.url, payload=payload)
+    async def _update_from_payload(
+        self, payload: str, incremental: bool = False
+    ) -> BalancerManagerChanges | None:
+        if incremental is True:
+            parsed_model = await self.async_parse_raw_payload(
+                payload, clusters=self._clusters_filter
+            )
+            return self._update_from_parsed_model(parsed_model)
+
+        new_model = await self.async_parse_payload(
+            self.url,
+            payload=payload,
+            fast_models=self._fast_models,
+            clusters=self._clusters_filter,
+        )
         for field, value in new_model:
             setattr(self, field, value)
+        self._parsed = new_model._parsed
+        return None
 
     @classmethod
-    async def parse_from_url(cls, url: str | HttpUrl) -> "HttpxBalancerManager":
+    async def parse_from_url(
+        cls,
+        url: str | HttpUrl,
+        fast_models: bool = False,
+        clusters: Iterable[str] | None = None,
+    ) -> "HttpxBalancerManager":
+        """
+        fast_models=True stores the clusters and routes as FastCluster and
+        FastRoute objects
+
+        clusters limits the model to the clusters with these names; the
+        other clusters are skipped by the parser
+        """
+
         client = http_client.get()
         response = await client.get(url)
         response.raise_for_status()
 
-        return await cls.async_parse_payload(url, response.text)
+        model = await cls.async_parse_payload(
+            url, response.text, fast_models=fast_models, clusters=clusters
+        )
+        model._payload_cache.record(response)
+        return model
 
     @classmethod
     async def async_parse_payload(
@@ -45,97 +147,163 @@ class HttpxBalancerManager(BalancerManager):
     ) -> "HttpxBalancerManager":
         _executor = executor.get()
         _loop = asyncio.get_running_loop()
+        # context variables are not visible from within the executor
+        kwargs.setdefault("engine", parser_engine.get())
+        if isinstance(_executor, ParsePool):
+            clusters = kwargs.pop("clusters", None)
+            clusters = None if clusters is None else tuple(clusters)
+            parsed_model = await _executor.parse_balancer_manager(
+                payload, engine=kwargs.pop("engine"), clusters=clusters
+            )
+            return cls.parse_parsed_model(
+                url, parsed_model, clusters=clusters, **kwargs
+            )
+
         _func = partial(cls.parse_payload, url=url, payload=payload, **kwargs)
         return await _loop.run_in_executor(_executor, _func)
 
     @classmethod
-    def parse_payload(cls, url: str | HttpUrl, payload: str) -> "HttpxBalancerManager":  # type: ignore[override]
-        parsed_model = ParsedBalancerManager.parse_payload(payload)
-        model_props = dict(cls._get_parsed_pairs(parsed_model))
+    async def async_parse_raw_payload(
+        cls, payload: str, **kwargs
+    ) -> ParsedBalancerManager:
+        _executor = executor.get()
+        _loop = asyncio.get_running_loop()
+        kwargs.setdefault("engine", parser_engine.get())
+        if isinstance(_executor, ParsePool):
+            return await _executor.parse_balancer_manager(payload, **kwargs)
+
+        _func = partial(ParsedBalancerManager.parse_payload, payload=payload, **kwargs)
+        return await _loop.run_in_executor(_executor, _func)
+
+    @classmethod
+    def parse_payload(  # type: ignore[override]
+        cls,
+        url: str | HttpUrl,
+        payload: str,
+        engine: ParserEngine | str | None = None,
+        fast_models: bool = False,
+        clusters: Iterable[str] | None = None,
+    ) -> "HttpxBalancerManager":
+        clusters = None if clusters is None else tuple(clusters)
+        parsed_model = ParsedBalancerManager.parse_payload(
+            payload, engine=engine, clusters=clusters
+        )
+        return cls.parse_parsed_model(
+            url, parsed_model, fast_models=fast_models, clusters=clusters
+        )
+
+    @classmethod
+    def parse_parsed_model(
+        cls,
+        url: str | HttpUrl,
+        parsed_model: ParsedBalancerManager,
+        fast_models: bool = False,
+        clusters: tuple[str, ...] | None = None,
+    ) -> "HttpxBalancerManager":
+        """
+        clusters is the filter which parsed_model was parsed with
+        """
+
+        model_props = dict(cls._get_parsed_pairs(parsed_model, fast_models=fast_models))
         model_props["url"] = url
-        return cls.parse_obj(model_props)
+        model = cls.parse_obj(model_props)
+        model._parsed = parsed_model
+        model._clusters_filter = clusters
+        return model
 
     async def edit_route(
         self,
-        cluster: Cluster | str,
-        route: Route | str,
+        cluster: Cluster | FastCluster | str,
+        route: Route | FastRoute | str,
         force: bool = False,
         factor: float | None = None,
         lbset: int | None = None,
         route_redir: str | None = None,
         status_changes: dict[str, bool] = {},
     ) -> None:
-        # validate cluster
-        if isinstance(cluster, str):
-            cluster = self.cluster(cluster)
-        else:
-            cluster = self.cluster(cluster.name)
-
-        if not isinstance(cluster, Cluster):
-            raise TypeError(
-                "cluster type must be inherited from httpd_manager.base.balancer_manager.Cluster"
-            )
+        cluster, route = self._get_cluster_and_route(cluster, route)
+        await self.edit_routes(
+            [
+                RouteEdit(
+                    cluster=cluster.name,
+                    route=route.name,
+                    force=force,
+                    factor=factor,
+                    lbset=lbset,
+                    route_redir=route_redir,
+                    status_changes=status_changes,
+                )
+            ]
+        )
 
-        # validate route
-        if isinstance(route, str):
-            route = cluster.route(route)
-        else:
-            route = cluster.route(route.name)
+    async def edit_routes(
+        self,
+        edits: Iterable[RouteEdit],
+        concurrency: int = 5,
+        exception_handler: Callable | None = None,
+    ) -> BalancerManagerChanges | None:
+        """
+        apply a batch of route edits, possibly across clusters
 
-        if not isinstance(route, Route):
-            raise TypeError(
-                "route type must be inherited from httpd_manager.base.balancer_manager.Route"
-            )
+        Every edit is validated before anything is sent to the server; the
+        "final active route" check is evaluated against the whole batch.
+        The requests are sent with bounded concurrency and the resulting
+        page is parsed once at the end.
+        """
 
-        # get a dict of Status objects
-        updated_status_values = route.status.get_mutable_values()
-
-        # prepare new values to be sent to server
-        for _name, _value in status_changes.items():
-            setattr(updated_status_values, _name, _value)
-
-        # except routes with errors from throwing the "last-route" error
-        if (
-            force is True
-            or route.status.error.value is True
-            or route.status.disabled.value is True
-            or route.status.draining_mode.value is True
-        ):
-            pass
-        elif cluster.number_of_electable_routes <= 1 and (
-            updated_status_values.disabled is True
-            or updated_status_values.draining_mode is True
-        ):
-            raise ValueError("cannot disable final active route")
-
-        payload = {
-            "w_lf": factor if factor else route.factor,
-            "w_ls": lbset if lbset else route.lbset,
-            "w_wr": route.name,
-            "w_rr": route_redir if route_redir else route.route_redir,
-            "w": route.worker,
-            "b": cluster.name,
-            "nonce": str(route.session_nonce_uuid),
-        }
-
-        for _name, _status in route.status.mutable().items():
-            payload_field = f"w_status_{_status.http_form_code}"
-            payload[payload_field] = int(getattr(updated_status_values, _name))
-
-        logger.debug(
-            f"edit route cluster={cluster.name} route={route.name} payload={payload}"
-        )
+        try:
+            payloads = self._get_edit_payloads(list(edits))
+        except Exception as e:
+            if exception_handler is None:
+                raise
+            logger.error(f"route edits are not valid: {e}", exc_info=e)
+            exception_handler(e)
+            return None
 
+        semaphore = asyncio.Semaphore(concurrency)
         client = http_client.get()
-        response = await client.post(
-            self.url, headers={"Referer": self.url}, data=payload
+
+        async def _post(payload: dict[str, Any]) -> str:
+            async with semaphore:
+                logger.debug(
+                    f"edit route cluster={payload['b']} route={payload['w_wr']} payload={payload}"
+                )
+                response = await client.post(
+                    self.url, headers={"Referer": self.url}, data=payload
+                )
+                response.raise_for_status()
+                return response.text
+
+        results = await asyncio.gather(
+            *[_post(x) for x in payloads], return_exceptions=True
         )
-        response.raise_for_status()
-        await self._update_from_payload(response.text)
+        responses = [x for x in results if isinstance(x, str)]
+        exceptions = [x for x in results if not isinstance(x, str)]
+
+        changes = None
+        if len(responses) > 0:
+            # the model no longer matches the last page which was fetched
+            self._payload_cache.clear()
+            if concurrency == 1 or len(payloads) == 1:
+                # requests were sent in order; the last page includes every change
+                changes = await self._update_from_payload(
+                    responses[-1], incremental=True
+                )
+            else:
+                changes = await self.update(incremental=True)
+
+        for exception in exceptions:
+            logger.error(f"route edit failed: {exception}", exc_info=exception)
+            if exception_handler:
+                exception_handler(exception)
+        if exceptions and exception_handler is None:
+            raise exceptions[0]
+
+        return changes
 
     async def edit_lbset(
         self,
-        cluster: Cluster | str,
+        cluster: Cluster | FastCluster | str,
         lbset_number: int,
         force: bool = False,
         factor: float | None = None,
@@ -149,24 +317,117 @@ class HttpxBalancerManager(BalancerManager):
         else:
             cluster = self.cluster(cluster.name)
 
-        if not isinstance(cluster, Cluster):
+        if not isinstance(cluster, (Cluster, FastCluster)):
             raise TypeError(
-                "cluster type must be inherited from httpd_manager.base.balancer_manager.Cluster"
+                "cluster type must be inherited from httpd_manager.base.balancer_manager.Cluster or FastCluster"
             )
 
-        for route in cluster.lbset(lbset_number):
-            try:
-                await self.edit_route(
-                    cluster=cluster.name,
-                    route=route.name,
-                    force=force,
-                    factor=factor,
-                    route_redir=route_redir,
-                    status_changes=status_changes,
-                )
-            except Exception as e:
-                logger.exception(e)
-                if exception_handler:
-                    exception_handler(e)
-                else:
-                    raise
+        edits = [
+            RouteEdit(
+                cluster=cluster.name,
+                route=route.name,
+                force=force,
+                factor=factor,
+                route_redir=route_redir,
+                status_changes=status_changes,
+            )
+            for route in cluster.lbset(lbset_number)
+        ]
+
+        await self.edit_routes(edits, exception_handler=exception_handler)
+
+    def _get_cluster_and_route(
+        self, cluster: Cluster | FastCluster | str, route: Route | FastRoute | str
+    ) -> tuple[Cluster | FastCluster, Route | FastRoute]:
+        # validate cluster
+        if isinstance(cluster, str):
+            cluster = self.cluster(cluster)
+        else:
+            cluster = self.cluster(cluster.name)
+
+        if not isinstance(cluster, (Cluster, FastCluster)):
+            raise TypeError(
+                "cluster type must be inherited from httpd_manager.base.balancer_manager.Cluster or FastCluster"
+            )
+
+        # validate route
+        if isinstance(route, str):
+            route = cluster.route(route)
+        else:
+            route = cluster.route(route.name)
+
+        if not isinstance(route, (Route, FastRoute)):
+            raise TypeError(
+                "route type must be inherited from httpd_manager.base.balancer_manager.Route or FastRoute"
+            )
+
+        return cluster, route
+
+    def _get_edit_payloads(self, edits: list[RouteEdit]) -> list[dict[str, Any]]:
+        payloads: list[dict[str, Any]] = list()
+        # cluster name => number of electable routes after the batch is applied
+        electable_routes: dict[str, int] = dict()
+        # routes which would no longer be electable; (cluster name, force)
+        disabled_routes: list[tuple[str, bool]] = list()
+
+        # each payload sets every value of a route, so when a route is edited
+        # more than once, the last edit is the one which is applied
+        last_edits: dict[tuple[str, str], RouteEdit] = dict()
+        for edit in edits:
+            last_edits.pop((edit.cluster, edit.route), None)
+            last_edits[(edit.cluster, edit.route)] = edit
+
+        for edit in last_edits.values():
+            cluster, route = self._get_cluster_and_route(edit.cluster, edit.route)
+
+            # get a dict of Status objects
+            updated_status_values = route.status.get_mutable_values()
+
+            # prepare new values to be sent to server
+            for _name, _value in edit.status_changes.items():
+                setattr(updated_status_values, _name, _value)
+
+            # routes with errors are never electable
+            is_electable = not (
+                route.status.error.value is True
+                or route.status.disabled.value is True
+                or route.status.draining_mode.value is True
+            )
+            will_be_electable = not (
+                route.status.error.value is True
+                or updated_status_values.disabled is True
+                or updated_status_values.draining_mode is True
+            )
+
+            electable_routes.setdefault(
+                cluster.name, cluster.number_of_electable_routes
+            )
+            if will_be_electable and not is_electable:
+                electable_routes[cluster.name] += 1
+            elif is_electable and not will_be_electable:
+                disabled_routes.append((cluster.name, edit.force))
+
+            payload = {
+                "w_lf": edit.factor if edit.factor else route.factor,
+                "w_ls": edit.lbset if edit.lbset else route.lbset,
+                "w_wr": route.name,
+                "w_rr": edit.route_redir if edit.route_redir else route.route_redir,
+                "w": route.worker,
+                "b": cluster.name,
+                "nonce": str(route.session_nonce_uuid),
+            }
+
+            for _name, _status in route.status.mutable().items():
+                payload_field = f"w_status_{_status.http_form_code}"
+                payload[payload_field] = int(getattr(updated_status_values, _name))
+
+            payloads.append(payload)
+
+        # forced edits are counted last so that they cannot make a non-forced
+        # edit of the same batch fail
+        for cluster_name, force in sorted(disabled_routes, key=lambda x: x[1]):
+            if force is False and electable_routes[cluster_name] <= 1:
+                raise ValueError("cannot disable final active route")
+            electable_routes[cluster_name] -= 1
+
+        return payloads
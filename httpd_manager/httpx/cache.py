@@ -0,0 +1,109 @@
+import hashlib
+
+from httpx import Response
+from pydantic import BaseModel
+
+
+class PayloadCache(BaseModel):
+    """
+    validators of the last parsed response and counters of the parses
+    which were saved
+
+    A response is unchanged if the server answered a conditional request
+    with 304 Not Modified (only possible when a proxy in front of httpd
+    provides an ETag or Last-Modified header) or if its body hashes to the
+    same digest as the last parsed body.
+
+    The digest covers the whole body, including the counters of each route
+    (elected, busy, to and from) and of the server. They change with every
+    request which the server handles, so the short-circuit only fires for
+    nodes without traffic between two polls. Leaving them out of the digest
+    would leave them out of date in the model.
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+    digest: bytes | None = None
+    parses: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+
+    @property
+    def saved_parses(self) -> int:
+        return self.not_modified + self.unchanged
+
+    def get_headers(self) -> dict[str, str]:
+        headers = dict()
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def is_not_modified(self, response: Response) -> bool:
+        """
+        return True if the server answered with 304 Not Modified
+
+        Only the status is used, so the body of a streamed response does not
+        need to be read. Error statuses are raised as httpx.HTTPStatusError.
+        """
+
+        if response.status_code == 304:
+            self.not_modified += 1
+            return True
+
+        response.raise_for_status()
+        return False
+
+    def is_unchanged(self, response: Response, digest: bytes | None = None) -> bool:
+        """
+        return True if the response does not need to be parsed
+
+        digest is used in place of hashing response.content; see new_hash().
+        Error statuses are raised as httpx.HTTPStatusError.
+        """
+
+        if self.is_not_modified(response):
+            return True
+
+        if self.digest is not None:
+            if digest is None:
+                digest = _digest(response.content)
+            if digest == self.digest:
+                self.unchanged += 1
+                return True
+
+        return False
+
+    def record(self, response: Response, digest: bytes | None = None) -> None:
+        """
+        store the validators of a response which was parsed successfully
+        """
+
+        self.etag = response.headers.get("etag")
+        self.last_modified = response.headers.get("last-modified")
+        self.digest = _digest(response.content) if digest is None else digest
+        self.parses += 1
+
+    @staticmethod
+    def new_hash() -> "hashlib._Hash":
+        """
+        hash object for the digest of a body which is read in chunks
+        """
+
+        return hashlib.blake2b(digest_size=16)
+
+    def clear(self) -> None:
+        """
+        forget the last response; the next one is always parsed
+        """
+
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+
+
+def _digest(content: bytes) -> bytes:
+    hash = PayloadCache.new_hash()
+    hash.update(content)
+    return hash.digest()
@@ -0,0 +1,256 @@
+from typing import Any, Iterable
+
+from .balancer_manager import HttpxBalancerManager
+from .fleet import FleetNode, FleetPoller
+from .server_status import HttpxServerStatus
+from ..asgi import Receive, Scope, Send, lifespan
+from ..base.balancer_manager.route import ROUTE_STATUS_FIELDS
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (metric suffix, type, help, route attribute)
+_ROUTE_METRICS = (
+    ("route_busy", "gauge", "requests currently assigned to the route", "busy"),
+    ("route_load", "gauge", "load of the route", "load"),
+    ("route_factor", "gauge", "load factor of the route", "factor"),
+    ("route_lbset", "gauge", "load balancer set of the route", "lbset"),
+    ("route_elected_total", "counter", "times the route was elected", "elected"),
+    ("route_to_bytes_total", "counter", "bytes sent to the route", "to_"),
+    ("route_from_bytes_total", "counter", "bytes read from the route", "from_"),
+)
+
+# (metric suffix, type, help, server status attribute)
+_SERVER_METRICS = (
+    (
+        "server_requests_per_second",
+        "gauge",
+        "average requests per second since the last restart",
+        "requests_per_sec",
+    ),
+    (
+        "server_bytes_per_second",
+        "gauge",
+        "average bytes per second since the last restart",
+        "bytes_per_second",
+    ),
+    (
+        "server_accesses_total",
+        "counter",
+        "requests since the last restart",
+        "total_accesses",
+    ),
+    (
+        "server_traffic_bytes_total",
+        "counter",
+        "bytes served since the last restart",
+        "total_traffic",
+    ),
+)
+
+
+class MetricsExporter:
+    """
+    ASGI application which serves the latest models of a FleetPoller in the
+    Prometheus text exposition format
+
+    Scrapes never poll httpd; the fleet polls on its own schedule and the
+    text is only rendered again after a node was polled. The label strings
+    of each node, route and worker state are built once and reused for as
+    long as the route exists.
+    """
+
+    def __init__(
+        self, fleet: FleetPoller, prefix: str = "httpd", path: str = "/metrics"
+    ):
+        self.fleet = fleet
+        self.prefix = prefix
+        self.path = path
+        self.renders = 0
+        self._cache_key: tuple[Any, ...] | None = None
+        self._cache: bytes = b""
+        self._labels: dict[tuple[str, ...], str] = dict()
+
+    def render(self) -> bytes:
+        """
+        return the text of every metric; the previous text is returned if no
+        node was polled since it was rendered
+        """
+
+        nodes = list(self.fleet.nodes.values())
+        cache_key = tuple((x.date, x.failures) for x in nodes)
+        if cache_key != self._cache_key:
+            self._cache = self._render(nodes).encode()
+            self._cache_key = cache_key
+            self.renders += 1
+        return self._cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+
+        if scope["path"] != self.path:
+            status, content_type, body = 404, "text/plain", b"Not Found"
+        elif scope["method"] not in ("GET", "HEAD"):
+            status, content_type, body = 405, "text/plain", b"Method Not Allowed"
+        else:
+            status, content_type, body = 200, CONTENT_TYPE, self.render()
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": body if scope["method"] != "HEAD" else b"",
+            }
+        )
+
+    def _render(self, nodes: list[FleetNode]) -> str:
+        labels: dict[tuple[str, ...], str] = dict()
+
+        def _get_labels(*pairs: str, parent: str = "") -> str:
+            # pairs alternate between label names and values
+            key = (parent, *pairs)
+            label_string = self._labels.get(key)
+            if label_string is None:
+                label_string = ",".join(
+                    f'{pairs[i]}="{_escape(pairs[i + 1])}"'
+                    for i in range(0, len(pairs), 2)
+                )
+                if parent:
+                    label_string = f"{parent},{label_string}"
+            labels[key] = label_string
+            return label_string
+
+        lines: list[str] = list()
+        metric = self._add_metric_header
+
+        # node
+        node_labels = [
+            (x, _get_labels("node", x.url, "type", x.type.value)) for x in nodes
+        ]
+        metric(lines, "up", "gauge", "1 if the last poll of the node succeeded")
+        for node, label_string in node_labels:
+            up = node.model is not None and node.error is None
+            lines.append(f"{self.prefix}_up{{{label_string}}} {int(up)}")
+        metric(lines, "poll_failures", "gauge", "consecutive failed polls")
+        for node, label_string in node_labels:
+            lines.append(
+                f"{self.prefix}_poll_failures{{{label_string}}} {node.failures}"
+            )
+        metric(
+            lines,
+            "last_poll_timestamp_seconds",
+            "gauge",
+            "time of the last successful poll",
+        )
+        for node, label_string in node_labels:
+            if node.date is not None:
+                lines.append(
+                    f"{self.prefix}_last_poll_timestamp_seconds{{{label_string}}} "
+                    f"{node.date.timestamp()}"
+                )
+
+        # balancer manager routes
+        routes = [
+            (route, _get_labels("node", url, "cluster", cluster.name, "route", name))
+            for url, model in _get_models(nodes, HttpxBalancerManager)
+            for cluster in model.clusters.values()
+            for name, route in cluster.routes.items()
+        ]
+        metric(lines, "route_status", "gauge", "1 if the status is set on the route")
+        for route, label_string in routes:
+            flags = route.status.flags
+            for name, flag, _, _ in ROUTE_STATUS_FIELDS:
+                status_labels = _get_labels("status", name, parent=label_string)
+                is_set = 1 if flags & flag else 0
+                lines.append(f"{self.prefix}_route_status{{{status_labels}}} {is_set}")
+        metric(lines, "route_electable", "gauge", "1 if the route can accept traffic")
+        for route, label_string in routes:
+            lines.append(
+                f"{self.prefix}_route_electable{{{label_string}}} "
+                f"{int(route.electable)}"
+            )
+        for suffix, metric_type, help, attribute in _ROUTE_METRICS:
+            metric(lines, suffix, metric_type, help)
+            for route, label_string in routes:
+                value = _format_value(getattr(route, attribute))
+                lines.append(f"{self.prefix}_{suffix}{{{label_string}}} {value}")
+
+        # server status
+        servers = [
+            (model, _get_labels("node", url))
+            for url, model in _get_models(nodes, HttpxServerStatus)
+        ]
+        for suffix, metric_type, help, attribute in _SERVER_METRICS:
+            metric(lines, suffix, metric_type, help)
+            for server_status, label_string in servers:
+                value = _format_value(getattr(server_status, attribute))
+                lines.append(f"{self.prefix}_{suffix}{{{label_string}}} {value}")
+        metric(
+            lines,
+            "server_restart_time_seconds",
+            "gauge",
+            "time of the last restart",
+        )
+        for server_status, label_string in servers:
+            lines.append(
+                f"{self.prefix}_server_restart_time_seconds{{{label_string}}} "
+                f"{server_status.restart_time.timestamp()}"
+            )
+        metric(
+            lines,
+            "server_poll_requests_per_second",
+            "gauge",
+            "requests per second between the last two polls",
+        )
+        for server_status, label_string in servers:
+            rates = self.fleet.rates.server_rates.get(str(server_status.url))
+            if rates is not None:
+                lines.append(
+                    f"{self.prefix}_server_poll_requests_per_second{{{label_string}}} "
+                    f"{_format_value(rates.requests_per_sec)}"
+                )
+        metric(lines, "server_workers", "gauge", "scoreboard slots in each state")
+        for server_status, label_string in servers:
+            for state, count in server_status.worker_states:
+                state_labels = _get_labels("state", state, parent=label_string)
+                lines.append(f"{self.prefix}_server_workers{{{state_labels}}} {count}")
+
+        # label strings of removed nodes and routes are dropped
+        self._labels = labels
+        lines.append("")
+        return "\n".join(lines)
+
+    def _add_metric_header(
+        self, lines: list[str], suffix: str, metric_type: str, help: str
+    ) -> None:
+        lines.append(f"# HELP {self.prefix}_{suffix} {help}")
+        lines.append(f"# TYPE {self.prefix}_{suffix} {metric_type}")
+
+
+def _get_models(nodes: Iterable[FleetNode], model_type: type) -> Iterable[Any]:
+    for node in nodes:
+        if isinstance(node.model, model_type):
+            yield node.url, node.model
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
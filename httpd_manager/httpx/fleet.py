@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import random
+from datetime import datetime
+from enum import Enum
+from typing import Any, Iterable
+
+from httpx import AsyncClient, Limits, Timeout
+from pydantic import BaseModel
+
+from .balancer_manager import HttpxBalancerManager
+from .client import http_client
+from .server_status import HttpxServerStatus
+from ..base import HistoryStore, RateTracker, count_route_statuses
+from ..utils import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+
+class NodeType(str, Enum):
+    BALANCER_MANAGER = "balancer_manager"
+    SERVER_STATUS = "server_status"
+
+
+class FleetNode(BaseModel):
+    url: str
+    type: NodeType
+    model: HttpxBalancerManager | HttpxServerStatus | None = None
+    date: datetime | None = None
+    error: str | None = None
+    failures: int = 0
+    circuit_opened: float | None = None
+
+    @property
+    def circuit_open(self) -> bool:
+        return self.circuit_opened is not None
+
+
+class FleetPoller:
+    """
+    poll many balancer-manager and server-status pages with one shared client
+
+    Each node is polled on its own jittered schedule. A semaphore bounds the
+    number of concurrent requests and parses, and the connection pool of the
+    client is sized to match so connections are kept alive between polls.
+    After failure_threshold consecutive failures, a node is skipped until
+    reset_timeout seconds have passed.
+
+    The latest model of each node is replaced or updated in place only
+    after a successful poll, so readers never wait on the poller.
+    """
+
+    def __init__(
+        self,
+        balancer_manager_urls: Iterable[str] = (),
+        server_status_urls: Iterable[str] = (),
+        interval: float = 5.0,
+        jitter: float = 0.1,
+        concurrency: int = 20,
+        timeout: float = 10.0,
+        failure_threshold: int = 3,
+        reset_timeout: float = 60.0,
+        include_workers: bool = False,
+        history_capacity: int = 0,
+        client: AsyncClient | None = None,
+    ):
+        self.nodes: dict[str, FleetNode] = dict()
+        for url in balancer_manager_urls:
+            self.nodes[url] = FleetNode(url=url, type=NodeType.BALANCER_MANAGER)
+        for url in server_status_urls:
+            self.nodes[url] = FleetNode(url=url, type=NodeType.SERVER_STATUS)
+
+        self.interval = interval
+        self.jitter = jitter
+        self.timeout = timeout
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.include_workers = include_workers
+        # per-interval rates of the counters of every node
+        self.rates = RateTracker()
+        # the counters of the last history_capacity polls of every node
+        self.history = HistoryStore(history_capacity) if history_capacity else None
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # poll() and the background tasks must not poll the same node at once
+        self._locks = {url: asyncio.Lock() for url in self.nodes}
+        self._tasks: list[asyncio.Task] = list()
+        self._client_owned = client is None
+        self._client = client or AsyncClient(
+            limits=Limits(
+                max_connections=concurrency, max_keepalive_connections=concurrency
+            ),
+            timeout=Timeout(timeout),
+        )
+
+    async def __aenter__(self) -> "FleetPoller":
+        self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    def snapshot(self) -> dict[str, HttpxBalancerManager | HttpxServerStatus]:
+        """
+        return the latest model of each node which has been polled successfully
+        """
+
+        return {
+            url: node.model
+            for url, node in self.nodes.items()
+            if node.model is not None
+        }
+
+    def count_route_statuses(self, cluster: str | None = None) -> dict[str, int]:
+        """
+        return the number of routes with each status set across every
+        balancer manager of the fleet, optionally limited to one cluster
+        """
+
+        routes: list[Any] = list()
+        for model in self.snapshot().values():
+            if not isinstance(model, HttpxBalancerManager):
+                continue
+            for _cluster in model.clusters.values():
+                if cluster is None or _cluster.name == cluster:
+                    routes.extend(_cluster.routes.values())
+        return count_route_statuses(routes)
+
+    def start(self) -> None:
+        if self._tasks:
+            raise RuntimeError("poller is already running")
+        self._tasks = [
+            asyncio.create_task(self._run_node(node)) for node in self.nodes.values()
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = list()
+
+        if self._client_owned:
+            await self._client.aclose()
+
+    async def poll(self) -> None:
+        """
+        poll every node once, concurrently
+        """
+
+        await asyncio.gather(*[self._poll_node(node) for node in self.nodes.values()])
+
+    async def _run_node(self, node: FleetNode) -> None:
+        # spread the initial requests over the first interval
+        await asyncio.sleep(random.uniform(0, self.interval))
+        while True:
+            await self._poll_node(node)
+            await asyncio.sleep(
+                self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            )
+
+    async def _poll_node(self, node: FleetNode) -> None:
+        async with self._locks[node.url]:
+            await self._poll_node_unlocked(node)
+
+    async def _poll_node_unlocked(self, node: FleetNode) -> None:
+        loop = asyncio.get_running_loop()
+
+        if node.circuit_opened is not None:
+            if loop.time() - node.circuit_opened < self.reset_timeout:
+                return
+            # half-open; allow a single trial request
+            logger.info(f"retrying node after circuit breaker timeout: {node.url}")
+
+        async with self._semaphore:
+            token = http_client.set(self._client)
+            try:
+                await asyncio.wait_for(self._update_node(node), self.timeout)
+            except Exception as e:
+                node.failures += 1
+                node.error = repr(e)
+                logger.warning(f"failed to poll {node.url}: {node.error}")
+                if node.failures >= self.failure_threshold:
+                    node.circuit_opened = loop.time()
+            else:
+                node.date = utcnow()
+                node.error = None
+                node.failures = 0
+                node.circuit_opened = None
+            finally:
+                http_client.reset(token)
+
+    async def _update_node(self, node: FleetNode) -> None:
+        if node.model is None:
+            if node.type is NodeType.BALANCER_MANAGER:
+                node.model = await HttpxBalancerManager.parse_from_url(node.url)
+            else:
+                node.model = await HttpxServerStatus.parse_from_url(
+                    node.url, include_workers=self.include_workers
+                )
+        elif isinstance(node.model, HttpxBalancerManager):
+            await node.model.update(incremental=True)
+        else:
+            await node.model.update()
+
+        if isinstance(node.model, HttpxBalancerManager):
+            self.rates.update_balancer_manager(node.model)
+            if self.history is not None:
+                self.history.record_balancer_manager(node.model)
+        else:
+            self.rates.update_server_status(node.model)
+            if self.history is not None:
+                self.history.record_server_status(node.model)
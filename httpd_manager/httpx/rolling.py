@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Sequence
+
+from .balancer_manager import HttpxBalancerManager, RouteEdit
+
+
+logger = logging.getLogger(__name__)
+
+
+class RollingOperationAborted(Exception):
+    pass
+
+
+class RollingOperation:
+    """
+    apply status_changes to the routes of a cluster on every balancer manager
+    of a fleet, one wave of routes at a time
+
+    For each wave, the changes are validated on every node before any node
+    is modified; if the "cannot disable final active route" check fails on
+    any node, no node is changed. The check is evaluated per node, against
+    the routes of that node. The routes are then polled until Route.busy reaches zero
+    on every node; the poll interval doubles (up to max_interval) while no
+    progress is made and resets to min_interval when it is. After the
+    optional action has completed, the original status values are restored.
+
+    If an error occurs, or abort() is called, the current wave is rolled back
+    to its original status values on every node. The requests which are
+    still in flight on the other nodes are cancelled first.
+    """
+
+    def __init__(
+        self,
+        balancer_managers: Sequence[HttpxBalancerManager],
+        cluster: str,
+        routes: Sequence[str],
+        status_changes: dict[str, bool] = {"draining_mode": True},
+        wave_size: int = 1,
+        wait_for_drain: bool = True,
+        drain_timeout: float = 300.0,
+        min_interval: float = 0.5,
+        max_interval: float = 10.0,
+    ):
+        if wave_size < 1:
+            raise ValueError("wave_size must be at least 1")
+
+        self.balancer_managers = list(balancer_managers)
+        self.cluster = cluster
+        self.routes = list(routes)
+        self.status_changes = status_changes
+        self.wave_size = wave_size
+        self.wait_for_drain = wait_for_drain
+        self.drain_timeout = drain_timeout
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._aborted = asyncio.Event()
+
+    def waves(self) -> list[list[str]]:
+        return [
+            self.routes[i : i + self.wave_size]
+            for i in range(0, len(self.routes), self.wave_size)
+        ]
+
+    def abort(self) -> None:
+        self._aborted.set()
+
+    async def run(
+        self, action: Callable[[list[str]], Awaitable[None]] | None = None
+    ) -> None:
+        for wave in self.waves():
+            self._raise_if_aborted()
+            edits = self._get_edits(wave)
+
+            # validate the wave on every node before changing any of them
+            for balancer_manager in self.balancer_managers:
+                balancer_manager._get_edit_payloads(edits)
+
+            original = self._get_original_values(wave)
+            try:
+                logger.info(
+                    f"applying {self.status_changes}: cluster={self.cluster} {wave}"
+                )
+                await _gather(*[x.edit_routes(edits) for x in self.balancer_managers])
+                if self.wait_for_drain is True:
+                    await self._wait_until_drained(wave)
+                self._raise_if_aborted()
+                if action:
+                    await action(wave)
+                self._raise_if_aborted()
+            except BaseException:
+                logger.warning(f"rolling back routes: cluster={self.cluster} {wave}")
+                await self._restore(original)
+                raise
+            await self._restore(original)
+
+    def _raise_if_aborted(self) -> None:
+        if self._aborted.is_set():
+            raise RollingOperationAborted("rolling operation was aborted")
+
+    def _get_edits(self, wave: list[str]) -> list[RouteEdit]:
+        return [
+            RouteEdit(
+                cluster=self.cluster, route=route, status_changes=self.status_changes
+            )
+            for route in wave
+        ]
+
+    def _get_original_values(
+        self, wave: list[str]
+    ) -> list[tuple[HttpxBalancerManager, list[RouteEdit]]]:
+        original = list()
+        for balancer_manager in self.balancer_managers:
+            edits = list()
+            for route in wave:
+                values = (
+                    balancer_manager.cluster(self.cluster)
+                    .route(route)
+                    .status.get_mutable_values()
+                )
+                edits.append(
+                    RouteEdit(
+                        cluster=self.cluster,
+                        route=route,
+                        force=True,
+                        status_changes={
+                            name: getattr(values, name) for name in self.status_changes
+                        },
+                    )
+                )
+            original.append((balancer_manager, edits))
+        return original
+
+    async def _restore(
+        self, original: list[tuple[HttpxBalancerManager, list[RouteEdit]]]
+    ) -> None:
+        # every node is restored, even if another one fails
+        results = await asyncio.gather(
+            *[
+                balancer_manager.edit_routes(edits)
+                for balancer_manager, edits in original
+            ],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _get_busy(self, wave: list[str]) -> int:
+        return sum(
+            balancer_manager.cluster(self.cluster).route(route).busy
+            for balancer_manager in self.balancer_managers
+            for route in wave
+        )
+
+    async def _wait_until_drained(self, wave: list[str]) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.drain_timeout
+        interval = self.min_interval
+        busy = self._get_busy(wave)
+
+        while busy > 0:
+            if loop.time() >= deadline:
+                raise TimeoutError(
+                    f"routes were not drained after {self.drain_timeout} seconds: {wave}"
+                )
+
+            # abort() interrupts the wait
+            try:
+                await asyncio.wait_for(self._aborted.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            self._raise_if_aborted()
+
+            await _gather(*[x.update(incremental=True) for x in self.balancer_managers])
+            previous_busy, busy = busy, self._get_busy(wave)
+            if busy < previous_busy:
+                interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+
+
+async def _gather(*aws: Awaitable[Any]) -> list[Any]:
+    """
+    like asyncio.gather(), but when one awaitable fails, the others are
+    cancelled and awaited before the exception is raised
+    """
+
+    tasks = [asyncio.ensure_future(x) for x in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -1,55 +1,343 @@
 import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
 from functools import partial
+from typing import AsyncGenerator
 
 from pydantic import HttpUrl, PrivateAttr
 
+from .cache import PayloadCache
 from .client import http_client
+from .watch import watch
 from ..executor import executor
-from ..base import ServerStatus
+from ..pool import ParsePool
+from ..base import (
+    LxmlServerStatusParser,
+    ParsedServerStatus,
+    ServerStatus,
+    WorkerStateEvent,
+    get_worker_state_events,
+)
+from ..utils import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+# number of updates which use the html page after the ?auto payload of a
+# node was not usable (e.g. ExtendedStatus is off), before ?auto is tried again
+AUTO_RETRY_INTERVAL = 60
 
 
 class HttpxServerStatus(ServerStatus):
     _include_workers: bool = PrivateAttr()
+    _auto: bool = PrivateAttr()
+    _columnar_workers: bool = PrivateAttr()
+    _fast_models: bool = PrivateAttr()
+    _stream: bool = PrivateAttr()
+    _payload_cache: PayloadCache = PrivateAttr(default_factory=PayloadCache)
+    _auto_payload_cache: PayloadCache = PrivateAttr(default_factory=PayloadCache)
+    _html_updates: int = PrivateAttr(default=0)
 
     def __init__(self, *args, **kwargs):
         self._include_workers = kwargs.pop("include_workers", False)
+        self._auto = kwargs.pop("auto", False)
+        self._columnar_workers = kwargs.pop("columnar_workers", False)
+        self._fast_models = kwargs.pop("fast_models", False)
+        self._stream = kwargs.pop("stream", False)
         super().__init__(*args, **kwargs)
 
+    @property
+    def payload_cache(self) -> PayloadCache:
+        """
+        validators and counters of the page which the next update requests;
+        the ?auto payload and the html page are cached separately
+        """
+
+        if self._uses_auto():
+            return self._auto_payload_cache
+        return self._payload_cache
+
     async def update(self) -> None:
-        client = http_client.get()
-        response = await client.get(self.url)
-        response.raise_for_status()
-        new_model = await self.async_parse_payload(
-            url=self.url,
-            payload=response.text,
+        """
+        refresh the model from the server
+
+        The page is not parsed again if it is unchanged since the previous
+        update (see payload_cache); only the date is refreshed.
+        """
+
+        use_auto = self._uses_auto()
+        if self._html_updates > 0:
+            self._html_updates -= 1
+
+        new_model, fell_back = await self._get_from_url(
+            self.url,
             include_workers=self._include_workers,
+            auto=use_auto,
+            payload_cache=self._payload_cache,
+            auto_payload_cache=self._auto_payload_cache,
+            columnar_workers=self._columnar_workers,
+            fast_models=self._fast_models,
+            stream=self._stream,
         )
+        if fell_back:
+            self._html_updates = AUTO_RETRY_INTERVAL
+        if new_model is None:
+            self.date = utcnow()
+            return
+
         for field, value in new_model:
             setattr(self, field, value)
 
+    def _uses_auto(self) -> bool:
+        # the worker table is not part of the ?auto payload
+        return self._auto and not self._include_workers and self._html_updates == 0
+
+    async def watch(
+        self, interval: float = 1.0, maxsize: int = 1000
+    ) -> AsyncGenerator[WorkerStateEvent, None]:
+        """
+        poll the server and yield an event for each worker state count
+        which changed since the previous poll
+
+        Polling pauses while maxsize events are waiting to be consumed.
+        """
+
+        async def _poll() -> list[WorkerStateEvent]:
+            previous = self.worker_states
+            await self.update()
+            return get_worker_state_events(self.date, previous, self.worker_states)
+
+        async for event in watch(_poll, interval=interval, maxsize=maxsize):
+            yield event
+
     @classmethod
     async def parse_from_url(
-        cls, url: str | HttpUrl, include_workers: bool = True
+        cls,
+        url: str | HttpUrl,
+        include_workers: bool = True,
+        auto: bool = False,
+        columnar_workers: bool = False,
+        fast_models: bool = False,
+        stream: bool = False,
     ) -> "HttpxServerStatus":
+        """
+        columnar_workers=True stores the worker table as a WorkerTable
+        fast_models=True stores the worker table as a list of FastWorker
+        stream=True parses the html page while it is downloaded (requires lxml)
+        """
+
+        payload_cache = PayloadCache()
+        auto_payload_cache = PayloadCache()
+        model, fell_back = await cls._get_from_url(
+            url,
+            include_workers=include_workers,
+            auto=auto and not include_workers,
+            payload_cache=payload_cache,
+            auto_payload_cache=auto_payload_cache,
+            columnar_workers=columnar_workers,
+            fast_models=fast_models,
+            stream=stream,
+        )
+        if model is None:
+            # only possible with validators from a previous response
+            raise RuntimeError(f"no page was parsed from {url}")
+        # a model parsed from the html fallback keeps the auto setting
+        model._auto = auto
+        model._payload_cache = payload_cache
+        model._auto_payload_cache = auto_payload_cache
+        if fell_back:
+            model._html_updates = AUTO_RETRY_INTERVAL
+        return model
+
+    @classmethod
+    async def _get_from_url(
+        cls,
+        url: str | HttpUrl,
+        include_workers: bool,
+        auto: bool,
+        payload_cache: PayloadCache,
+        auto_payload_cache: PayloadCache,
+        **kwargs,
+    ) -> tuple["HttpxServerStatus | None", bool]:
+        """
+        return the model, or None if the page is unchanged since it was
+        recorded in its cache, and whether the ?auto payload was not usable
+
+        payload_cache holds the validators of the html page and
+        auto_payload_cache those of the ?auto payload.
+        """
+
+        fell_back = False
+        if auto is True:
+            try:
+                model = await cls._get_auto_from_url(url, auto_payload_cache, **kwargs)
+                return model, False
+            except ValueError as e:
+                logger.warning(
+                    f"?auto payload is not usable; falling back to html: {e}"
+                )
+                fell_back = True
+
+        model = await cls._get_html_from_url(
+            url, include_workers, payload_cache, **kwargs
+        )
+        return model, fell_back
+
+    @classmethod
+    async def _get_auto_from_url(
+        cls, url: str | HttpUrl, payload_cache: PayloadCache, **kwargs
+    ) -> "HttpxServerStatus | None":
+        client = http_client.get()
+        response = await client.get(
+            url, params={"auto": ""}, headers=payload_cache.get_headers()
+        )
+        if payload_cache.is_unchanged(response):
+            return None
+        model = await cls.async_parse_auto_payload(url, response.text, **kwargs)
+        payload_cache.record(response)
+        return model
+
+    @classmethod
+    async def _get_html_from_url(
+        cls,
+        url: str | HttpUrl,
+        include_workers: bool,
+        payload_cache: PayloadCache,
+        **kwargs,
+    ) -> "HttpxServerStatus | None":
+        client = http_client.get()
+        headers = payload_cache.get_headers()
+        if kwargs.get("stream", False) is True:
+            return await cls._stream_from_url(
+                url, headers, include_workers, payload_cache, **kwargs
+            )
+
+        response = await client.get(url, headers=headers)
+        if payload_cache.is_unchanged(response):
+            return None
+
+        _executor = executor.get()
+        if isinstance(_executor, ParsePool) and _executor.shared_memory:
+            # the body is decoded by the worker
+            payload: str | bytes = response.content
+        else:
+            payload = response.text
+        model = await cls.async_parse_payload(
+            url,
+            payload,
+            include_workers=include_workers,
+            encoding=response.encoding,
+            **kwargs,
+        )
+        payload_cache.record(response)
+        return model
+
+    @classmethod
+    async def _stream_from_url(
+        cls,
+        url: str | HttpUrl,
+        headers: dict[str, str],
+        include_workers: bool,
+        payload_cache: PayloadCache,
+        **kwargs,
+    ) -> "HttpxServerStatus | None":
+        """
+        feed the body to LxmlServerStatusParser as each chunk is received
+
+        Neither the complete body nor its decoded text is held in memory.
+        The chunks are parsed in the executor, so the event loop is not
+        blocked while a page is parsed.
+        """
+
         client = http_client.get()
-        response = await client.get(url)
-        response.raise_for_status()
+        _loop = asyncio.get_running_loop()
+        _executor = _get_thread_executor()
+        async with client.stream("GET", url, headers=headers) as response:
+            if payload_cache.is_not_modified(response):
+                return None
+
+            parser = LxmlServerStatusParser(
+                include_workers=include_workers, encoding=response.encoding
+            )
+            hash = PayloadCache.new_hash()
+            async for chunk in response.aiter_bytes():
+                await _loop.run_in_executor(_executor, parser.feed, chunk)
+                hash.update(chunk)
+
+        digest = hash.digest()
+        if payload_cache.is_unchanged(response, digest=digest):
+            return None
+
+        parsed_model = await _loop.run_in_executor(_executor, _close_parser, parser)
+        model = await cls.async_parse_parsed_model(
+            url, parsed_model, include_workers=include_workers, **kwargs
+        )
+        payload_cache.record(response, digest=digest)
+        return model
 
-        return await cls.async_parse_payload(
-            url, response.text, include_workers=include_workers
+    @classmethod
+    async def async_parse_parsed_model(
+        cls, url: str | HttpUrl, parsed_model: ParsedServerStatus, **kwargs
+    ):
+        _executor = executor.get()
+        _loop = asyncio.get_running_loop()
+        _func = partial(
+            cls.parse_parsed_model, parsed_model=parsed_model, url=url, **kwargs
         )
+        return await _loop.run_in_executor(_executor, _func)
 
     @classmethod
     async def async_parse_payload(
-        cls, url: str | HttpUrl, payload: str, include_workers: bool = True, **kwargs
+        cls,
+        url: str | HttpUrl,
+        payload: str | bytes,
+        include_workers: bool = True,
+        encoding: str | None = None,
+        **kwargs,
     ):
+        """
+        encoding is used to decode a payload given as bytes (default: utf-8)
+        """
+
         _executor = executor.get()
         _loop = asyncio.get_running_loop()
+        if isinstance(_executor, ParsePool):
+            parsed_model = await _executor.parse_server_status(
+                payload, encoding=encoding, include_workers=include_workers
+            )
+            return cls.parse_parsed_model(
+                parsed_model, url=url, include_workers=include_workers, **kwargs
+            )
+
+        if isinstance(payload, bytes):
+            payload = payload.decode(encoding or "utf-8", errors="replace")
         _func = partial(
             cls.parse_payload,
             url=url,
             payload=payload,
             include_workers=include_workers,
-            **kwargs
+            **kwargs,
+        )
+        return await _loop.run_in_executor(_executor, _func)
+
+    @classmethod
+    async def async_parse_auto_payload(cls, url: str | HttpUrl, payload: str, **kwargs):
+        _executor = executor.get()
+        _loop = asyncio.get_running_loop()
+        _func = partial(
+            cls.parse_auto_payload, url=url, payload=payload, auto=True, **kwargs
         )
         return await _loop.run_in_executor(_executor, _func)
+
+
+def _get_thread_executor() -> Executor | None:
+    # the state of a streaming parser cannot be sent to another process, so
+    # process pools are replaced by the default executor of the loop
+    _executor = executor.get()
+    if isinstance(_executor, (ParsePool, ProcessPoolExecutor)):
+        return None
+    return _executor
+
+
+def _close_parser(parser: LxmlServerStatusParser) -> ParsedServerStatus:
+    return ParsedServerStatus.parse_obj(dict(parser.close()))
@@ -0,0 +1,48 @@
+import asyncio
+from contextlib import suppress
+from typing import AsyncGenerator, Awaitable, Callable, Sequence, TypeVar
+
+from ..base import Event
+
+
+EventType = TypeVar("EventType", bound=Event)
+
+
+async def watch(
+    poll: Callable[[], Awaitable[Sequence[EventType]]],
+    interval: float,
+    maxsize: int,
+) -> AsyncGenerator[EventType, None]:
+    """
+    call poll() every interval seconds and yield the returned events
+
+    Events are passed through a bounded queue. When the consumer falls
+    behind, the queue fills up and polling pauses until there is room
+    again, so memory use does not grow with a slow consumer. Exceptions
+    raised by poll() are re-raised to the consumer.
+    """
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[EventType | Exception] = asyncio.Queue(maxsize=maxsize)
+
+    async def _producer() -> None:
+        try:
+            while True:
+                started = loop.time()
+                for event in await poll():
+                    await queue.put(event)
+                await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
+        except Exception as e:
+            await queue.put(e)
+
+    task = asyncio.create_task(_producer())
+    try:
+        while True:
+            item = await queue.get()
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
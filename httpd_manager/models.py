@@ -8,6 +8,14 @@ from pydantic import BaseModel, Field, validator
 class ParsableModel(BaseModel):
     _parse_options: Any
 
+    @classmethod
+    def _get_value(cls, v: Any, to_dict: bool, *args, **kwargs) -> Any:
+        # fast models are serialized as the pydantic models they stand in for,
+        # so dict() and json() do not depend on fast_models
+        if to_dict and hasattr(v, "to_pydantic"):
+            v = v.to_pydantic()
+        return super()._get_value(v, to_dict, *args, **kwargs)
+
     @classmethod
     def parse_payload(cls, payload: str, **kwargs) -> Any:
         pass
@@ -28,6 +36,28 @@ class DataUnit(str, Enum):
     TERABYTE = "T"
 
 
+_DATA_UNIT_MULTIPLIERS = {
+    "B": 1,
+    "K": 1000,
+    "M": 1000000,
+    "G": 1000000000,
+    "T": 1000000000000,
+}
+
+
+def bytes_to_int(value: str, unit: str | None) -> int:
+    """
+    int(Bytes(value=value, unit=unit)) without creating the model
+    """
+
+    if not unit:
+        return 0
+    multiplier = _DATA_UNIT_MULTIPLIERS.get(unit[0].upper())
+    if multiplier is None:
+        raise ValueError(f"unit value not supported: {unit}")
+    return int(float(value) * multiplier)
+
+
 class Bytes(BaseModel):
     unit: DataUnit | None
     value: float
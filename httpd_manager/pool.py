@@ -0,0 +1,238 @@
+import asyncio
+import importlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, NamedTuple
+
+from pydantic import BaseModel
+
+from .base import ParsedBalancerManager, ParsedServerStatus
+from .engine import ParserEngine
+
+
+class ParsePoolStats(BaseModel):
+    """
+    counters of the tasks of a ParsePool
+
+    latency is the time from submit() until the result is available in the
+    parent; parse_time is the part of it spent parsing in a worker.
+    """
+
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    pending: int = 0
+    max_pending: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    total_parse_time: float = 0.0
+    shared_payloads: int = 0
+
+    @property
+    def average_latency(self) -> float:
+        done = self.completed + self.failed
+        return self.total_latency / done if done else 0.0
+
+
+class ParsePool(Executor):
+    """
+    process pool for parsing pages with warm workers
+
+    Each worker imports the parsers when it starts, and
+    start() spawns every worker before the first page arrives. The
+    parse_* coroutines return the raw Parsed* model of a page: the workers
+    send back plain values instead of pickled pydantic models. The values
+    already have the types of the Parsed* fields, so they are wrapped with
+    construct() without validation.
+
+    The final models are built (and validated) in the parent, but not
+    lazily: the httpx classes build a ServerStatus or BalancerManager as
+    soon as the result arrives, because update() replaces the fields of the
+    model in place. Only incremental balancer-manager updates defer the
+    work, by rebuilding the routes whose raw rows changed.
+
+    Payloads may be given as the undecoded bytes of a response, which are
+    decoded in the worker. With shared_memory=True, the bytes are copied
+    into a SharedMemory block and only its name is sent to the worker,
+    which decodes the page straight from the block; the payload is not
+    pickled or sent through the pipe of the pool.
+
+    Set it as the executor ContextVar to use it from the httpx classes;
+    other functions submitted to the pool run as in a ProcessPoolExecutor.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        history: int = 1000,
+        shared_memory: bool = False,
+    ):
+        if shared_memory:
+            # forked workers must share the resource tracker of the parent;
+            # otherwise their trackers unlink the blocks a second time when
+            # the workers exit
+            resource_tracker.ensure_running()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, initializer=_initialize_worker
+        )
+        self.shared_memory = shared_memory
+        self.stats = ParsePoolStats()
+        # latencies of the most recent tasks
+        self.latencies: deque[float] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ParsePool":
+        self.start()
+        return self
+
+    def start(self) -> None:
+        """
+        spawn and initialize every worker
+        """
+
+        futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        submitted = time.perf_counter()
+        with self._lock:
+            self.stats.submitted += 1
+            self.stats.pending += 1
+            self.stats.max_pending = max(self.stats.max_pending, self.stats.pending)
+
+        future = self._executor.submit(fn, *args, **kwargs)
+        future.add_done_callback(partial(self._task_done, submitted))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    async def parse_server_status(
+        self, payload: str | bytes, encoding: str | None = None, **kwargs
+    ) -> ParsedServerStatus:
+        """
+        encoding is used to decode a payload given as bytes (default: utf-8)
+        """
+
+        values = await self._run(_parse_server_status, payload, encoding, **kwargs)
+        return ParsedServerStatus.construct(**values)
+
+    async def parse_balancer_manager(
+        self, payload: str | bytes, encoding: str | None = None, **kwargs
+    ) -> ParsedBalancerManager:
+        """
+        encoding is used to decode a payload given as bytes (default: utf-8)
+        """
+
+        values = await self._run(_parse_balancer_manager, payload, encoding, **kwargs)
+        return ParsedBalancerManager.construct(**values)
+
+    async def _run(
+        self,
+        func: Callable[..., Any],
+        payload: str | bytes,
+        encoding: str | None,
+        **kwargs,
+    ) -> Any:
+        loop = asyncio.get_running_loop()
+        shm: SharedMemory | None = None
+        handle: str | bytes | _SharedPayload = payload
+        if self.shared_memory and isinstance(payload, bytes) and payload:
+            shm = SharedMemory(create=True, size=len(payload))
+            shm.buf[: len(payload)] = payload
+            handle = _SharedPayload(shm.name, len(payload))
+            with self._lock:
+                self.stats.shared_payloads += 1
+
+        try:
+            parse_time, values = await loop.run_in_executor(
+                self, partial(func, handle, encoding, **kwargs)
+            )
+        finally:
+            # a worker which already attached the block keeps its mapping
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+        with self._lock:
+            self.stats.total_parse_time += parse_time
+        return values
+
+    def _task_done(self, submitted: float, future: Future) -> None:
+        latency = time.perf_counter() - submitted
+        with self._lock:
+            self.stats.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.stats.failed += 1
+            else:
+                self.stats.completed += 1
+            self.stats.total_latency += latency
+            self.stats.max_latency = max(self.stats.max_latency, latency)
+            self.latencies.append(latency)
+
+
+class _SharedPayload(NamedTuple):
+    name: str
+    size: int
+
+
+def _initialize_worker() -> None:
+    # import the parsers now instead of during the first parse; the dates
+    # are parsed in the parent, so dateparser is not needed here
+    for name in ("bs4", "lxml.etree"):
+        try:
+            importlib.import_module(name)
+        except ModuleNotFoundError:
+            pass
+
+
+def _ping() -> None:
+    pass
+
+
+def _get_payload(
+    payload: str | bytes | _SharedPayload, encoding: str | None = None
+) -> str:
+    # undecoded characters are replaced, as in httpx.Response.text
+    if isinstance(payload, str):
+        return payload
+    if isinstance(payload, bytes):
+        return payload.decode(encoding or "utf-8", errors="replace")
+
+    shm = SharedMemory(name=payload.name)
+    try:
+        with shm.buf[: payload.size] as buffer:
+            return str(buffer, encoding or "utf-8", "replace")
+    finally:
+        shm.close()
+
+
+def _parse_server_status(
+    payload: str | bytes | _SharedPayload, encoding: str | None = None, **kwargs
+) -> tuple[float, dict[str, Any]]:
+    start = time.perf_counter()
+    values = ParsedServerStatus._parse_payload_values(
+        _get_payload(payload, encoding), **kwargs
+    )
+    return time.perf_counter() - start, values
+
+
+def _parse_balancer_manager(
+    payload: str | bytes | _SharedPayload,
+    encoding: str | None = None,
+    engine: ParserEngine | str | None = None,
+    **kwargs,
+) -> tuple[float, dict[str, Any]]:
+    start = time.perf_counter()
+    values = ParsedBalancerManager._parse_payload_values(
+        _get_payload(payload, encoding), engine=engine, **kwargs
+    )
+    return time.perf_counter() - start, values
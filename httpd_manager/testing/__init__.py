@@ -0,0 +1,20 @@
+from .pages import (
+    DEFAULT_WORKER_STATE_WEIGHTS,
+    MockBalancerManager,
+    MockCluster,
+    MockRoute,
+    MockServerStatus,
+)
+from .server import MockHttpdError, MockHttpdFleet, MockHttpdServer
+
+
+__all__ = [
+    "DEFAULT_WORKER_STATE_WEIGHTS",
+    "MockBalancerManager",
+    "MockCluster",
+    "MockHttpdError",
+    "MockHttpdFleet",
+    "MockHttpdServer",
+    "MockRoute",
+    "MockServerStatus",
+]
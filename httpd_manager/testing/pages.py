@@ -0,0 +1,481 @@
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from html import escape
+from typing import Any
+
+from packaging.version import Version
+from pydantic import BaseModel, Field
+
+from ..base import WorkerState
+
+
+# status flags in the order httpd prints them
+_ROUTE_STATUS_CODES = (
+    ("ignore_errors", "Ign"),
+    ("draining_mode", "Drn"),
+    ("disabled", "Dis"),
+    ("stopped", "Stop"),
+    ("error", "Err"),
+    ("hot_standby", "Stby"),
+    ("hot_spare", "Spar"),
+)
+# routes with any of these flags are not usable
+_NOT_USABLE = ("disabled", "stopped", "error")
+# relative frequency of each non-open scoreboard state
+DEFAULT_WORKER_STATE_WEIGHTS: dict[WorkerState, float] = {
+    WorkerState.WAITING_FOR_CONNECTION: 75,
+    WorkerState.KEEPALIVE: 15,
+    WorkerState.SENDING_REPLY: 5,
+    WorkerState.READING_REQUEST: 3,
+    WorkerState.CLOSING_CONNECTION: 2,
+}
+
+
+def _utc() -> datetime:
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _format_built_date(value: datetime) -> str:
+    # day of the month is padded with a space; i.e. "Jun  7 2016 17:55:26"
+    return f"{value:%b} {value.day:>2} {value:%Y %H:%M:%S}"
+
+
+def _format_date(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%A, %d-%b-%Y %H:%M:%S UTC")
+
+
+def _format_size(value: int) -> str:
+    """
+    format a byte count like apr_strfsize(); always 4 characters
+    """
+
+    if value < 973:
+        return f"{value:>3} "
+    for unit in "KMGTPE":
+        remain = value & 1023
+        value >>= 10
+        if value >= 973:
+            continue
+        if value < 9 or (value == 9 and remain < 973):
+            remain = ((remain * 5) + 256) // 512
+            if remain >= 10:
+                value, remain = value + 1, 0
+            return f"{value}.{remain}{unit}"
+        if remain >= 512:
+            value += 1
+        return f"{value:>3}{unit}"
+    raise ValueError("value is too large")
+
+
+def _format_bytes(value: float) -> str:
+    # same thresholds as format_byte_out() of mod_status
+    if value < 5 * 1024:
+        return f"{int(value)} B"
+    elif value < 5 * 1024**2:
+        return f"{value / 1024:.1f} kB"
+    elif value < 5 * 1024**3:
+        return f"{value / 1024**2:.1f} MB"
+    return f"{value / 1024**3:.1f} GB"
+
+
+class MockRoute(BaseModel, validate_assignment=True):
+    name: str
+    worker: str
+    route_redir: str = ""
+    factor: float = 1.0
+    lbset: int = 0
+    ignore_errors: bool = False
+    draining_mode: bool = False
+    disabled: bool = False
+    stopped: bool = False
+    error: bool = False
+    hot_standby: bool = False
+    hot_spare: bool = False
+    elected: int = 0
+    busy: int = 0
+    load: int = 0
+    to_: int = 0
+    from_: int = 0
+
+    def status_codes(self) -> str:
+        codes = "Init "
+        for name, code in _ROUTE_STATUS_CODES:
+            if getattr(self, name) is True:
+                codes += f"{code} "
+        if not any(getattr(self, name) for name in _NOT_USABLE):
+            codes += "Ok "
+        return codes
+
+
+class MockCluster(BaseModel, validate_assignment=True):
+    name: str
+    nonce: uuid.UUID = Field(default_factory=uuid.uuid4)
+    sticky_session: str | None = None
+    disable_failover: bool = False
+    timeout: int = 0
+    method: str = "byrequests"
+    path: str = "/"
+    active: bool = True
+    routes: list[MockRoute] = []
+
+    def route(self, name: str) -> MockRoute:
+        for route in self.routes:
+            if route.name == name:
+                return route
+        raise KeyError(name)
+
+
+class MockBalancerManager(BaseModel, validate_assignment=True):
+    """
+    state of a balancer-manager page which can be rendered as html
+
+    The html follows the layout of httpd's mod_proxy_balancer for the given
+    httpd_version. Versions before 2.4.21 print the route factor as an
+    integer.
+    """
+
+    host: str = "localhost"
+    path: str = "/balancer-manager"
+    httpd_version: str = "2.4.41"
+    openssl_version: str = "1.1.1d"
+    httpd_built_date: datetime = datetime(2020, 2, 26, 6, 37, 17)
+    proxy_id: str = "p8953235"
+    clusters: list[MockCluster] = []
+
+    def cluster(self, name: str) -> MockCluster:
+        for cluster in self.clusters:
+            if cluster.name == name:
+                return cluster
+        raise KeyError(name)
+
+    @classmethod
+    def generate(
+        cls,
+        clusters: int = 4,
+        routes_per_cluster: int = 10,
+        lbsets: int = 1,
+        status: dict[str, bool] = {},
+        seed: int | None = None,
+        **kwargs,
+    ) -> "MockBalancerManager":
+        """
+        generate a page with the given number of clusters and routes
+
+        The routes of each cluster are split into contiguous lbsets. The
+        status flags are applied to every route; individual routes can be
+        changed afterwards. seed makes the traffic counters and nonces
+        reproducible.
+        """
+
+        _random = random.Random(seed)
+        _clusters = list()
+        for c in range(clusters):
+            routes = list()
+            for r in range(routes_per_cluster):
+                elected = _random.randint(0, 100000)
+                routes.append(
+                    MockRoute(
+                        name=f"route{c}-{r}",
+                        worker=f"http://route{c}-{r}/",
+                        lbset=r * lbsets // routes_per_cluster,
+                        elected=elected,
+                        busy=_random.randint(0, 10),
+                        load=_random.randint(0, 100),
+                        to_=elected * _random.randint(100, 1000),
+                        from_=elected * _random.randint(1000, 100000),
+                        **status,
+                    )
+                )
+            _clusters.append(
+                MockCluster(
+                    name=f"cluster{c}",
+                    nonce=uuid.UUID(int=_random.getrandbits(128), version=4),
+                    routes=routes,
+                )
+            )
+        return cls(clusters=_clusters, **kwargs)
+
+    def to_html(self) -> str:
+        integer_factor = Version(self.httpd_version) < Version("2.4.21")
+
+        html = [
+            '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 3.2 Final//EN">\n'
+            "<html><head><title>Balancer Manager</title>\n"
+            "</head>\n"
+            f"<body><h1>Load Balancer Manager for {escape(self.host)}</h1>\n\n"
+            f"<dl><dt>Server Version: Apache/{self.httpd_version} (Unix) "
+            f"OpenSSL/{self.openssl_version}</dt>\n"
+            f"<dt>Server Built: {_format_built_date(self.httpd_built_date)}</dt>\n"
+            "<dt>Balancer changes will NOT be persisted on restart.</dt>"
+            "<dt>Balancers are inherited from main server.</dt>"
+            "<dt>ProxyPass settings are inherited from main server.</dt></dl>\n"
+            "<hr />\n"
+        ]
+
+        for cluster in self.clusters:
+            cluster_url = f"{self.path}?b={cluster.name}&amp;nonce={cluster.nonce}"
+            max_members = len(cluster.routes)
+            html.append(
+                f'<h3>LoadBalancer Status for <a href="{cluster_url}">'
+                f"balancer://{cluster.name}</a> [{self.proxy_id}_{cluster.name}]</h3>\n\n\n"
+                "<table><tr><th>MaxMembers</th><th>StickySession</th>"
+                "<th>DisableFailover</th><th>Timeout</th><th>FailoverAttempts</th>"
+                "<th>Method</th><th>Path</th><th>Active</th></tr>\n"
+                f"<tr><td>{max_members} [{max_members} Used]</td>\n"
+                f"<td> {escape(cluster.sticky_session or '(None)')} </td>"
+                f"<td>{'On' if cluster.disable_failover else 'Off'}</td>\n"
+                f"<td>{cluster.timeout}</td><td>{max(max_members - 1, 0)}</td>\n"
+                f"<td>{escape(cluster.method)}</td>\n"
+                f"<td>{escape(cluster.path)}</td>\n"
+                f"<td>{'Yes' if cluster.active else 'No'}</td>\n"
+                "</table>\n"
+                "<br />\n\n"
+                "<table><tr><th>Worker URL</th><th>Route</th><th>RouteRedir</th>"
+                "<th>Factor</th><th>Set</th><th>Status</th><th>Elected</th>"
+                "<th>Busy</th><th>Load</th><th>To</th><th>From</th></tr>\n"
+            )
+
+            for route in cluster.routes:
+                route_url = (
+                    f"{self.path}?b={cluster.name}&amp;w={route.worker}"
+                    f"&amp;nonce={cluster.nonce}"
+                )
+                factor = (
+                    f"{int(route.factor)}" if integer_factor else f"{route.factor:.2f}"
+                )
+                html.append(
+                    "<tr>\n"
+                    f'<td><a href="{route_url}">{escape(route.worker)}</a></td>'
+                    f"<td>{escape(route.name)}</td>"
+                    f"<td>{escape(route.route_redir)}</td>"
+                    f"<td>{factor}</td>"
+                    f"<td>{route.lbset}</td>"
+                    f"<td>{route.status_codes()}</td>"
+                    f"<td>{route.elected}</td>"
+                    f"<td>{route.busy}</td>"
+                    f"<td>{route.load}</td>"
+                    f"<td>{_format_size(route.to_)}</td>"
+                    f"<td>{_format_size(route.from_)}</td></tr>\n"
+                )
+
+            html.append("</table>\n<hr />\n")
+
+        html.append("</body></html>\n")
+        return "".join(html)
+
+
+class MockServerStatus(BaseModel, validate_assignment=True):
+    """
+    state of a server-status page which can be rendered as html or as the
+    machine-readable ?auto format
+
+    The scoreboard has threads_per_child slots for each process. A worker
+    table row is rendered for each slot which is not open.
+    """
+
+    host: str = "localhost"
+    httpd_version: str = "2.4.41"
+    openssl_version: str = "1.1.1d"
+    mpm: str = "event"
+    httpd_built_date: datetime = datetime(2020, 2, 26, 6, 37, 17)
+    current_time: datetime = Field(default_factory=_utc)
+    restart_time: datetime = Field(default_factory=lambda: _utc() - timedelta(days=1))
+    total_accesses: int = 0
+    total_kbytes: int = 0
+    requests_per_sec: float = 0.0
+    bytes_per_second: int = 0
+    bytes_per_request: int = 0
+    ms_per_request: float = 0.0
+    threads_per_child: int = 25
+    scoreboard: str = ""
+    seed: int | None = None
+
+    @classmethod
+    def generate(
+        cls,
+        slots: int = 400,
+        threads_per_child: int = 25,
+        open_processes: float = 0.5,
+        weights: dict[WorkerState, float] = DEFAULT_WORKER_STATE_WEIGHTS,
+        requests_per_sec: float = 76.9,
+        bytes_per_request: int = 9700,
+        seed: int | None = None,
+        **kwargs,
+    ) -> "MockServerStatus":
+        """
+        generate a page with a random scoreboard of the given size
+
+        The fraction open_processes of the process slots have not started
+        a process; the states of the other slots are picked using weights.
+        """
+
+        _random = random.Random(seed)
+        processes = -(-slots // threads_per_child)
+        active = round(processes * (1 - open_processes))
+        states = [x.value for x in weights]
+        scoreboard = "".join(
+            _random.choices(states, weights=list(weights.values()), k=1)[0]
+            if i < active * threads_per_child
+            else WorkerState.OPEN.value
+            for i in range(slots)
+        )
+
+        uptime = 86400
+        kwargs.setdefault("restart_time", _utc() - timedelta(seconds=uptime))
+        return cls(
+            threads_per_child=threads_per_child,
+            scoreboard=scoreboard,
+            total_accesses=int(requests_per_sec * uptime),
+            total_kbytes=int(requests_per_sec * uptime * bytes_per_request / 1024),
+            requests_per_sec=requests_per_sec,
+            bytes_per_second=int(requests_per_sec * bytes_per_request),
+            bytes_per_request=bytes_per_request,
+            ms_per_request=round(_random.uniform(1, 100), 4),
+            seed=seed,
+            **kwargs,
+        )
+
+    @property
+    def busy_workers(self) -> int:
+        return len(self.scoreboard) - sum(
+            self.scoreboard.count(x.value)
+            for x in (
+                WorkerState.OPEN,
+                WorkerState.IDLE,
+                WorkerState.STARTING_UP,
+                WorkerState.WAITING_FOR_CONNECTION,
+            )
+        )
+
+    @property
+    def idle_workers(self) -> int:
+        return self.scoreboard.count(WorkerState.WAITING_FOR_CONNECTION.value)
+
+    def _get_uptime(self) -> int:
+        return max(int((self.current_time - self.restart_time).total_seconds()), 0)
+
+    def _get_worker_rows(self) -> list[list[Any]]:
+        _random = random.Random(self.seed)
+        rows: list[list[Any]] = list()
+        for i, state in enumerate(self.scoreboard):
+            if state == WorkerState.OPEN.value:
+                continue
+            process, thread = divmod(i, self.threads_per_child)
+            busy = state not in (
+                WorkerState.WAITING_FOR_CONNECTION.value,
+                WorkerState.IDLE.value,
+            )
+            rows.append(
+                [
+                    f"{process}-0",
+                    1000 + process,
+                    f"{_random.randint(0, 5)}/{_random.randint(0, 500)}"
+                    f"/{_random.randint(500, 5000)}",
+                    state,
+                    f"{_random.uniform(0, 10):.2f}",
+                    _random.randint(0, 100),
+                    _random.randint(0, 100),
+                    _random.randint(0, 100000),
+                    f"{_random.uniform(0, 10):.1f}",
+                    f"{_random.uniform(0, 100):.2f}",
+                    f"{_random.uniform(0, 1000):.2f}",
+                    f"10.0.{thread // 256}.{thread % 256}",
+                    "http/1.1",
+                    f"{self.host}:80",
+                    "GET / HTTP/1.1" if busy else "",
+                ]
+            )
+        return rows
+
+    def to_html(self) -> str:
+        uptime = self._get_uptime()
+        scoreboard = "\n".join(
+            self.scoreboard[i : i + 64] for i in range(0, len(self.scoreboard), 64)
+        )
+
+        html = [
+            '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 3.2 Final//EN">\n'
+            "<html><head>\n<title>Apache Status</title>\n</head><body>\n"
+            f"<h1>Apache Server Status for {escape(self.host)} (via 127.0.0.1)</h1>\n\n"
+            f"<dl><dt>Server Version: Apache/{self.httpd_version} (Unix) "
+            f"OpenSSL/{self.openssl_version}</dt>\n"
+            f"<dt>Server MPM: {self.mpm}</dt>\n"
+            f"<dt>Server Built: {_format_built_date(self.httpd_built_date)}\n"
+            "</dt></dl><hr /><dl>\n"
+            f"<dt>Current Time: {_format_date(self.current_time)}</dt>\n"
+            f"<dt>Restart Time: {_format_date(self.restart_time)}</dt>\n"
+            "<dt>Parent Server Config. Generation: 1</dt>\n"
+            "<dt>Parent Server MPM Generation: 0</dt>\n"
+            f"<dt>Server uptime:  {uptime} seconds</dt>\n"
+            "<dt>Server load: 0.00 0.01 0.05</dt>\n"
+            f"<dt>Total accesses: {self.total_accesses} - "
+            f"Total Traffic: {_format_bytes(self.total_kbytes * 1024)} - "
+            "Total Duration: "
+            f"{int(self.total_accesses * self.ms_per_request)}</dt>\n"
+            "<dt>CPU Usage: u1.09 s2.85 cu0 cs0 - .01% CPU load</dt>\n"
+            f"<dt>{self.requests_per_sec:.1f} requests/sec - "
+            f"{_format_bytes(self.bytes_per_second)}/second - "
+            f"{_format_bytes(self.bytes_per_request)}/request - "
+            f"{self.ms_per_request:g} ms/request</dt>\n"
+            f"<dt>{self.busy_workers} requests currently being processed, "
+            f"{self.idle_workers} idle workers</dt>\n"
+            f"</dl><pre>{scoreboard}</pre>\n"
+            "<p>Scoreboard Key:<br />\n"
+            '"<b><code>_</code></b>" Waiting for Connection, \n'
+            '"<b><code>.</code></b>" Open slot with no current process<br />\n'
+            "</p>\n\n\n"
+            '<table border="0"><tr><th>Srv</th><th>PID</th><th>Acc</th><th>M</th>'
+            "<th>CPU\n</th><th>SS</th><th>Req</th><th>Dur</th><th>Conn</th>"
+            "<th>Child</th><th>Slot</th><th>Client</th><th>Protocol</th>"
+            "<th>VHost</th><th>Request</th></tr>\n\n"
+        ]
+
+        for row in self._get_worker_rows():
+            cells = [escape(str(x)) for x in row]
+            html.append(
+                f"<tr><td><b>{cells[0]}</b></td><td>{cells[1]}</td>"
+                f"<td>{cells[2]}</td><td>{cells[3]}\n</td>"
+                + "".join(f"<td>{x}</td>" for x in cells[4:10])
+                + f"<td>{cells[10]}\n</td><td>{cells[11]}</td><td>{cells[12]}</td>"
+                f"<td nowrap>{cells[13]}</td><td nowrap>{cells[14]}</td></tr>\n\n"
+            )
+
+        html.append(
+            "</table>\n"
+            " <hr /> <table>\n"
+            " <tr><th>Srv</th><td>Child Server number - generation</td></tr>\n"
+            " </table>\n"
+            "</body></html>\n"
+        )
+        return "".join(html)
+
+    def to_auto(self) -> str:
+        uptime = self._get_uptime()
+        lines = [
+            self.host,
+            f"ServerVersion: Apache/{self.httpd_version} (Unix) "
+            f"OpenSSL/{self.openssl_version}",
+            f"ServerMPM: {self.mpm}",
+            f"Server Built: {_format_built_date(self.httpd_built_date)}",
+            f"CurrentTime: {_format_date(self.current_time)}",
+            f"RestartTime: {_format_date(self.restart_time)}",
+            "ParentServerConfigGeneration: 1",
+            "ParentServerMPMGeneration: 0",
+            f"ServerUptimeSeconds: {uptime}",
+            "Load1: 0.00",
+            "Load5: 0.01",
+            "Load15: 0.05",
+            f"Total Accesses: {self.total_accesses}",
+            f"Total kBytes: {self.total_kbytes}",
+            f"Total Duration: {int(self.total_accesses * self.ms_per_request)}",
+            f"Uptime: {uptime}",
+            f"ReqPerSec: {self.requests_per_sec:g}",
+            f"BytesPerSec: {self.bytes_per_second}",
+            f"BytesPerReq: {self.bytes_per_request}",
+            f"DurationPerReq: {self.ms_per_request:g}",
+            f"BusyWorkers: {self.busy_workers}",
+            f"IdleWorkers: {self.idle_workers}",
+            f"Scoreboard: {self.scoreboard}",
+        ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,269 @@
+import asyncio
+import logging
+import random
+from typing import Any
+from urllib.parse import parse_qs
+
+from .pages import MockBalancerManager, MockRoute, MockServerStatus
+from ..asgi import Receive, Scope, Send, lifespan
+from ..utils import utcnow
+
+
+logger = logging.getLogger(__name__)
+
+# w_status_* form field => MockRoute field
+_ROUTE_STATUS_FIELDS = {
+    "I": "ignore_errors",
+    "N": "draining_mode",
+    "D": "disabled",
+    "H": "hot_standby",
+    "R": "hot_spare",
+    "S": "stopped",
+}
+
+
+class MockHttpdError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MockHttpdServer:
+    """
+    ASGI application serving a balancer-manager and a server-status page
+
+    Route edits are POSTed like httpd's balancer-manager form; the nonce of
+    the cluster and the w_status_*, w_lf and w_ls fields are validated
+    before the state is changed. While a route is draining or disabled,
+    its busy count is reduced by drain_step on each request for the page.
+
+    latency (plus a random jitter) is added to every request, and
+    failure_rate is the probability that a request fails with
+    failure_status. Use client() to send requests to the server without
+    opening a socket.
+    """
+
+    def __init__(
+        self,
+        balancer_manager: MockBalancerManager | None = None,
+        server_status: MockServerStatus | None = None,
+        balancer_manager_path: str = "/balancer-manager",
+        server_status_path: str = "/server-status",
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 500,
+        drain_step: int = 1,
+        seed: int | None = None,
+    ):
+        self.balancer_manager = balancer_manager or MockBalancerManager.generate(
+            seed=seed
+        )
+        self.balancer_manager.path = balancer_manager_path
+        self.server_status = server_status or MockServerStatus.generate(seed=seed)
+        self.balancer_manager_path = balancer_manager_path
+        self.server_status_path = server_status_path
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.drain_step = drain_step
+        self.requests = 0
+        self.failures = 0
+        self.edits = 0
+        self._random = random.Random(seed)
+
+    def client(self, base_url: str = "http://testserver.local", **kwargs):
+        """
+        httpx.AsyncClient which sends its requests to this application
+        """
+
+        import httpx
+
+        return httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self), base_url=base_url, **kwargs
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        headers = {
+            key.decode("latin-1").lower(): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        try:
+            content_type, text = await self.handle(
+                scope["method"],
+                scope["path"],
+                scope["query_string"].decode("latin-1"),
+                headers,
+                body,
+            )
+            status = 200
+        except MockHttpdError as e:
+            status, content_type, text = e.status, "text/plain", str(e)
+
+        data = text.encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", f"{content_type}; charset=utf-8".encode()),
+                    (b"content-length", str(len(data)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": data})
+
+    async def handle(
+        self,
+        method: str,
+        path: str,
+        query_string: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> tuple[str, str]:
+        """
+        return the content type and body of the response
+        """
+
+        self.requests += 1
+
+        delay = self.latency + self._random.uniform(0, self.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.failure_rate > 0 and self._random.random() < self.failure_rate:
+            self.failures += 1
+            raise MockHttpdError(self.failure_status, "injected failure")
+
+        if path == self.balancer_manager_path:
+            if method == "POST":
+                if "referer" not in headers:
+                    raise MockHttpdError(400, "Referer header is required")
+                self.edit_route(parse_qs(body.decode(), keep_blank_values=True))
+            elif method != "GET":
+                raise MockHttpdError(405, "Method Not Allowed")
+            self._drain_routes()
+            return "text/html", self.balancer_manager.to_html()
+
+        elif path == self.server_status_path:
+            if method != "GET":
+                raise MockHttpdError(405, "Method Not Allowed")
+            self.server_status.current_time = utcnow()
+            if "auto" in parse_qs(query_string, keep_blank_values=True):
+                return "text/plain", self.server_status.to_auto()
+            return "text/html", self.server_status.to_html()
+
+        raise MockHttpdError(404, "Not Found")
+
+    def edit_route(self, form: dict[str, list[str]]) -> None:
+        """
+        apply a POSTed edit_route form to the balancer manager
+        """
+
+        def _field(name: str) -> str | None:
+            return form[name][0] if name in form else None
+
+        try:
+            cluster = self.balancer_manager.cluster(_field("b") or "")
+        except KeyError:
+            raise MockHttpdError(400, f"unknown balancer: {_field('b')}")
+
+        if _field("nonce") != str(cluster.nonce):
+            raise MockHttpdError(400, "nonce does not match the balancer")
+
+        route: MockRoute | None = None
+        for _route in cluster.routes:
+            if _route.worker == _field("w"):
+                route = _route
+        if route is None:
+            raise MockHttpdError(400, f"unknown worker: {_field('w')}")
+
+        # validate every field before changing the route
+        changes: dict[str, Any] = dict()
+        for name, values in form.items():
+            value = values[0]
+            if name.startswith("w_status_"):
+                code = name[len("w_status_") :]
+                if code not in _ROUTE_STATUS_FIELDS:
+                    raise MockHttpdError(400, f"unknown status field: {name}")
+                if value not in ("0", "1"):
+                    raise MockHttpdError(400, f"invalid value for {name}: {value}")
+                changes[_ROUTE_STATUS_FIELDS[code]] = value == "1"
+            elif name == "w_lf":
+                try:
+                    factor = float(value)
+                except ValueError:
+                    raise MockHttpdError(400, f"invalid value for w_lf: {value}")
+                if not 1 <= factor <= 100:
+                    raise MockHttpdError(400, "w_lf must be between 1 and 100")
+                changes["factor"] = factor
+            elif name == "w_ls":
+                if not value.isdigit() or int(value) > 99:
+                    raise MockHttpdError(400, "w_ls must be between 0 and 99")
+                changes["lbset"] = int(value)
+            elif name == "w_rr":
+                changes["route_redir"] = value
+            elif name == "w_wr":
+                changes["name"] = value
+
+        for name, value in changes.items():
+            setattr(route, name, value)
+        self.edits += 1
+        logger.debug(f"edit route cluster={cluster.name} route={route.name} {changes}")
+
+    def _drain_routes(self) -> None:
+        for cluster in self.balancer_manager.clusters:
+            for route in cluster.routes:
+                if route.busy > 0 and (route.draining_mode or route.disabled):
+                    route.busy = max(route.busy - self.drain_step, 0)
+
+
+class MockHttpdFleet:
+    """
+    ASGI application which dispatches each request to a MockHttpdServer
+    by the host of the request
+    """
+
+    def __init__(self, servers: dict[str, MockHttpdServer]):
+        self.servers = servers
+
+    def client(self, **kwargs):
+        import httpx
+
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=self), **kwargs)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await lifespan(receive, send)
+            return
+
+        host = ""
+        for key, value in scope["headers"]:
+            if key.lower() == b"host":
+                host = value.decode("latin-1").split(":")[0]
+
+        server = self.servers.get(host)
+        if server is None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 404,
+                    "headers": [(b"content-length", b"0")],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await server(scope, receive, send)
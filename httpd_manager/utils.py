@@ -1,15 +1,95 @@
 import re
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import lru_cache
+
+
+# fixed offsets of the timezone abbreviations httpd commonly reports
+TIMEZONE_OFFSETS: dict[str, timedelta] = {
+    name: timedelta(hours=hours)
+    for name, hours in {
+        "UTC": 0,
+        "GMT": 0,
+        "Z": 0,
+        "WET": 0,
+        "WEST": 1,
+        "BST": 1,
+        "CET": 1,
+        "CEST": 2,
+        "EET": 2,
+        "EEST": 3,
+        "MSK": 3,
+        "AWST": 8,
+        "JST": 9,
+        "KST": 9,
+        "ACST": 9.5,
+        "ACDT": 10.5,
+        "AEST": 10,
+        "AEDT": 11,
+        "NZST": 12,
+        "NZDT": 13,
+        "HST": -10,
+        "AKST": -9,
+        "AKDT": -8,
+        "PST": -8,
+        "PDT": -7,
+        "MST": -7,
+        "MDT": -6,
+        "CST": -6,
+        "CDT": -5,
+        "EST": -5,
+        "EDT": -4,
+    }.items()
+}
 
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+@lru_cache(maxsize=128)
+def parse_date(value: str) -> datetime:
+    """
+    parse the timezone-aware dates reported by httpd
+
+    Dates without a timezone are assumed to be local. The known httpd formats
+    are handled with strptime; anything else falls back to dateparser, which
+    is imported only when it is needed.
+    """
+
+    value = value.strip()
+
+    # Server Built: Feb 26 2020 06:37:17
+    try:
+        return datetime.strptime(value, "%b %d %Y %H:%M:%S").astimezone()
+    except ValueError:
+        pass
+
+    # Restart Time: Wednesday, 07-Apr-2021 02:23:53 EDT
+    _value, _, tz_name = value.rpartition(" ")
+    if tz_name in TIMEZONE_OFFSETS:
+        try:
+            return datetime.strptime(_value, "%A, %d-%b-%Y %H:%M:%S").replace(
+                tzinfo=timezone(TIMEZONE_OFFSETS[tz_name], tz_name)
+            )
+        except ValueError:
+            pass
+
+    try:
+        import dateparser
+    except ModuleNotFoundError:
+        raise ValueError(f'unknown date format "{value}"; dateparser is not installed')
+
+    date = dateparser.parse(value, settings={"RETURN_AS_TIMEZONE_AWARE": True})
+    if date is None:
+        raise ValueError(f'unable to parse date "{value}"')
+    return date
+
+
 class RegexPatterns(Enum):
     # common
     HTTPD_VERSION: re.Pattern = re.compile(r"^Server\ Version:\ Apache/([\.0-9]*)")
+    HTTPD_VERSION_AUTO: re.Pattern = re.compile(r"^Apache/([\.0-9]*)")
     HTTPD_BUILT_DATE: re.Pattern = re.compile(r"Server Built:\ (.*)")
     OPENSSL_VERSION: re.Pattern = re.compile(r"OpenSSL\/([0-9\.a-z]*)")
 
@@ -19,6 +99,8 @@ class RegexPatterns(Enum):
     BYTES_PER_SECOND: re.Pattern = re.compile(r"([\d\.]+)\ (\w?B)/second")
     BYTES_PER_REQUEST: re.Pattern = re.compile(r"([\d\.]+)\ (\w?B)/request")
     MILLISECONDS_PER_REQUEST: re.Pattern = re.compile(r"([\d\.]+) ms/request")
+    TOTAL_ACCESSES: re.Pattern = re.compile(r"Total accesses: (\d+)")
+    TOTAL_TRAFFIC: re.Pattern = re.compile(r"Total Traffic: ([\d\.]+)\ (\w?B)")
 
     # balancer manager
     SESSION_NONCE_UUID: re.Pattern = re.compile(r".*&nonce=([-a-f0-9]{36}).*")
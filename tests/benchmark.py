@@ -0,0 +1,304 @@
+"""
+benchmarks for the parse, model construction and update paths
+
+    python -m tests.benchmark [--save FILE] [--baseline FILE]
+        [--max-time-regression 0.25] [--max-memory-regression 0.25]
+
+Each benchmark reports the best time of several iterations and the peak
+memory allocated by a single run (measured with tracemalloc). When a
+baseline is given, the exit code is non-zero if any benchmark regressed
+by more than the allowed fraction.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Sequence
+
+import httpx
+from pydantic import BaseModel
+
+from httpd_manager import BalancerManager, ParserEngine, ServerStatus
+from httpd_manager.base import ParsedBalancerManager, ParsedServerStatus
+from httpd_manager.httpx import HttpxBalancerManager
+from httpd_manager.httpx.client import http_client
+from httpd_manager.testing import MockBalancerManager, MockServerStatus
+
+
+DEFAULT_ROUTE_COUNTS = (10, 100, 1000, 5000)
+DEFAULT_SCOREBOARD_SIZES = (400, 2500, 10000)
+TEST_FILES_DIR = Path(__file__).parent.joinpath("data")
+
+
+class BenchmarkResult(BaseModel):
+    seconds: float
+    peak_memory: int
+
+
+def measure(func: Callable[[], Any], iterations: int) -> BenchmarkResult:
+    seconds = float("inf")
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        seconds = min(seconds, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(seconds=seconds, peak_memory=peak_memory)
+
+
+def _get_parsed_pairs(
+    parsed_model: ParsedBalancerManager, fast_models: bool = False
+) -> dict[str, Any]:
+    return dict(
+        BalancerManager._get_parsed_pairs(parsed_model, fast_models=fast_models)
+    )
+
+
+def _run_until_complete(
+    loop: asyncio.AbstractEventLoop, func: Callable[..., Awaitable[Any]], **kwargs
+) -> Any:
+    return loop.run_until_complete(func(**kwargs))
+
+
+async def _update(balancer_manager: HttpxBalancerManager, **kwargs) -> None:
+    # the payload never changes; parse it again on every update
+    balancer_manager.payload_cache.clear()
+    await balancer_manager.update(**kwargs)
+
+
+@contextmanager
+def _update_benchmarks(
+    payloads: dict[str, str], loop: asyncio.AbstractEventLoop
+) -> Iterator[dict[str, Callable[[], Any]]]:
+    # each payload is served from its own path by a mocked transport
+    def _handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, text=payloads[request.url.path.rsplit("/", 1)[1]])
+
+    # the benchmarks run the loop one call at a time, so the client is set
+    # here rather than from a task, which would not share the ContextVar
+    client = httpx.AsyncClient(transport=httpx.MockTransport(_handler))
+    token = http_client.set(client)
+    try:
+        yield _get_update_benchmarks(payloads, loop)
+    finally:
+        http_client.reset(token)
+        loop.run_until_complete(client.aclose())
+
+
+def _get_update_benchmarks(
+    payloads: dict[str, str], loop: asyncio.AbstractEventLoop
+) -> dict[str, Callable[[], Any]]:
+    benchmarks: dict[str, Callable[[], Any]] = dict()
+    for name in payloads:
+        balancer_manager = loop.run_until_complete(
+            HttpxBalancerManager.parse_from_url(
+                f"http://testserver.local/balancer-manager/{name}"
+            )
+        )
+        benchmarks[f"HttpxBalancerManager.update[{name}]"] = partial(
+            _run_until_complete, loop, _update, balancer_manager=balancer_manager
+        )
+        benchmarks[f"HttpxBalancerManager.update[{name},incremental]"] = partial(
+            _run_until_complete,
+            loop,
+            _update,
+            balancer_manager=balancer_manager,
+            incremental=True,
+        )
+        benchmarks[f"HttpxBalancerManager.update[{name},unchanged]"] = partial(
+            _run_until_complete, loop, balancer_manager.update
+        )
+    return benchmarks
+
+
+@contextmanager
+def get_benchmarks(
+    loop: asyncio.AbstractEventLoop,
+    test_files_dir: Path = TEST_FILES_DIR,
+    route_counts: Sequence[int] = DEFAULT_ROUTE_COUNTS,
+    scoreboard_sizes: Sequence[int] = DEFAULT_SCOREBOARD_SIZES,
+) -> Iterator[dict[str, Callable[[], Any]]]:
+    """
+    the update benchmarks use a mocked http client which is closed on exit
+    """
+
+    benchmarks: dict[str, Callable[[], Any]] = dict()
+
+    balancer_manager_payloads = {
+        path.name: path.read_text()
+        for path in sorted(test_files_dir.glob("balancer-manager-*.html"))
+    }
+    for routes in route_counts:
+        balancer_manager_payloads[f"{routes}-routes"] = MockBalancerManager.generate(
+            clusters=1, routes_per_cluster=routes, seed=0
+        ).to_html()
+
+    server_status_payloads = {
+        path.name: path.read_text()
+        for path in sorted(test_files_dir.glob("server-status-*.html"))
+    }
+    for slots in scoreboard_sizes:
+        server_status_payloads[f"{slots}-slots"] = MockServerStatus.generate(
+            slots=slots, seed=0
+        ).to_html()
+
+    for name, payload in balancer_manager_payloads.items():
+        for engine in ParserEngine:
+            benchmarks[
+                f"ParsedBalancerManager.parse_payload[{name},{engine.value}]"
+            ] = partial(ParsedBalancerManager.parse_payload, payload, engine=engine)
+
+        parsed_model = ParsedBalancerManager.parse_payload(
+            payload, engine=ParserEngine.LXML
+        )
+        benchmarks[f"BalancerManager._get_parsed_pairs[{name}]"] = partial(
+            _get_parsed_pairs, parsed_model
+        )
+        benchmarks[f"BalancerManager._get_parsed_pairs[{name},fast]"] = partial(
+            _get_parsed_pairs, parsed_model, fast_models=True
+        )
+
+    for name, payload in server_status_payloads.items():
+        benchmarks[f"ParsedServerStatus.parse_payload[{name}]"] = partial(
+            ParsedServerStatus.parse_payload, payload, include_workers=True
+        )
+        benchmarks[f"ParsedServerStatus.parse_payload[{name},no-workers]"] = partial(
+            ParsedServerStatus.parse_payload, payload, include_workers=False
+        )
+        benchmarks[f"ServerStatus.parse_payload[{name}]"] = partial(
+            ServerStatus.parse_payload,
+            payload,
+            url="http://testserver.local/server-status",
+            include_workers=True,
+        )
+        benchmarks[f"ServerStatus.parse_payload[{name},fast]"] = partial(
+            ServerStatus.parse_payload,
+            payload,
+            url="http://testserver.local/server-status",
+            include_workers=True,
+            fast_models=True,
+        )
+
+    with _update_benchmarks(balancer_manager_payloads, loop) as update_benchmarks:
+        benchmarks.update(update_benchmarks)
+        yield benchmarks
+
+
+def run_benchmarks(
+    benchmarks: dict[str, Callable[[], Any]], iterations: int = 5
+) -> dict[str, BenchmarkResult]:
+    return {name: measure(func, iterations) for name, func in benchmarks.items()}
+
+
+def compare(
+    results: dict[str, BenchmarkResult],
+    baseline: dict[str, BenchmarkResult],
+    max_time_regression: float = 0.25,
+    max_memory_regression: float = 0.25,
+) -> list[str]:
+    """
+    return a message for each benchmark which regressed beyond the allowed
+    fraction of its baseline; benchmarks missing from the baseline are ignored
+    """
+
+    regressions = list()
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        if result.seconds > expected.seconds * (1 + max_time_regression):
+            regressions.append(
+                f"{name}: {result.seconds * 1000:.3f}ms "
+                f"(baseline {expected.seconds * 1000:.3f}ms)"
+            )
+        if result.peak_memory > expected.peak_memory * (1 + max_memory_regression):
+            regressions.append(
+                f"{name}: {result.peak_memory / 1024:.1f}KiB peak memory "
+                f"(baseline {expected.peak_memory / 1024:.1f}KiB)"
+            )
+    return regressions
+
+
+def load_results(path: Path) -> dict[str, BenchmarkResult]:
+    return {
+        name: BenchmarkResult.parse_obj(value)
+        for name, value in json.loads(path.read_text()).items()
+    }
+
+
+def save_results(path: Path, results: dict[str, BenchmarkResult]) -> None:
+    path.write_text(
+        json.dumps({name: result.dict() for name, result in results.items()}, indent=2)
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument(
+        "--routes", type=int, nargs="+", default=list(DEFAULT_ROUTE_COUNTS)
+    )
+    parser.add_argument(
+        "--scoreboard", type=int, nargs="+", default=list(DEFAULT_SCOREBOARD_SIZES)
+    )
+    parser.add_argument("-k", dest="keyword", help="only run matching benchmarks")
+    parser.add_argument("--save", type=Path, help="save the results as json")
+    parser.add_argument("--baseline", type=Path, help="compare against saved results")
+    parser.add_argument("--max-time-regression", type=float, default=0.25)
+    parser.add_argument("--max-memory-regression", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    loop = asyncio.new_event_loop()
+    try:
+        with get_benchmarks(
+            loop, route_counts=args.routes, scoreboard_sizes=args.scoreboard
+        ) as benchmarks:
+            if args.keyword:
+                benchmarks = {
+                    name: func
+                    for name, func in benchmarks.items()
+                    if args.keyword in name
+                }
+            results = run_benchmarks(benchmarks, iterations=args.iterations)
+    finally:
+        loop.close()
+
+    width = max((len(name) for name in results), default=0)
+    for name, result in results.items():
+        print(
+            f"{name:<{width}}  {result.seconds * 1000:>10.3f}ms"
+            f"  {result.peak_memory / 1024:>10.1f}KiB"
+        )
+
+    if args.save:
+        save_results(args.save, results)
+
+    if args.baseline:
+        regressions = compare(
+            results,
+            load_results(args.baseline),
+            max_time_regression=args.max_time_regression,
+            max_memory_regression=args.max_memory_regression,
+        )
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
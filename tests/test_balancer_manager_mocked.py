@@ -1,3 +1,4 @@
+import asyncio
 import re
 from pathlib import Path
 
@@ -5,7 +6,10 @@ import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
-from httpd_manager import Cluster
+from httpd_manager import Cluster, Event, RouteRemovedEvent
+from httpd_manager.httpx import RouteEdit
+from httpd_manager.httpx.watch import watch
+from httpd_manager.utils import utcnow
 from .test_balancer_manager import HttpxBalancerManager, validate_properties
 
 
@@ -117,3 +121,281 @@ async def test_bad_payload(httpx_mock: HTTPXMock, test_files_dir: Path):
         await HttpxBalancerManager.parse_from_url(
             "http://testserver.local/balancer-manager"
         )
+
+
+async def test_incremental_update(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+    route30 = balancer_manager.cluster("cluster3").route("route30")
+
+    # nothing has changed
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None and not changes
+
+    # drain route30 and remove cluster4, route35, route37, and route39
+    with open(dir_.joinpath("data", "balancer-manager-mock-2.html"), "r") as fh:
+        payload = fh.read()
+    payload = re.sub(
+        r"(<td>route30</td><td></td><td>[\d\.]+</td><td>\d+</td><td>[^<]*)Ok ",
+        r"\1Drn Ok ",
+        payload,
+    )
+    httpx_mock.add_response(
+        url="http://testserver.local/balancer-manager", text=payload
+    )
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None
+    assert changes.removed_clusters == ["cluster4"]
+    assert ("cluster3", "route35") in changes.removed_routes
+    assert ("cluster4", "route40") in changes.removed_routes
+    assert changes.added_routes == []
+
+    # route30 was updated in place
+    assert balancer_manager.cluster("cluster3").route("route30") is route30
+    assert route30.status.draining_mode.value is True
+    status_change = changes.modified_routes[("cluster3", "route30")]["status"]
+    assert status_change[0].draining_mode.value is False
+    assert status_change[1].draining_mode.value is True
+
+    # the result matches a full parse of the same payload
+    expected = HttpxBalancerManager.parse_payload(
+        url="http://testserver.local/balancer-manager", payload=payload
+    )
+    assert expected.dict(exclude={"date"}) == balancer_manager.dict(exclude={"date"})
+    assert list(expected.clusters) == list(balancer_manager.clusters)
+    for name, cluster in expected.clusters.items():
+        assert list(cluster.routes) == list(balancer_manager.cluster(name).routes)
+
+    # re-adding cluster4
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None
+    assert changes.added_clusters == ["cluster4"]
+    assert len(balancer_manager.cluster("cluster4").routes) == 10
+
+
+async def test_watch(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+
+    # route35, route37, and route39 are removed from cluster3
+    add_mocked_response(httpx_mock, "balancer-manager-mock-2.html")
+
+    events = list()
+    async for event in balancer_manager.watch(interval=0):
+        events.append(event)
+        if isinstance(event, RouteRemovedEvent) and event.route == "route39":
+            break
+
+    removed = {(x.cluster, x.route) for x in events if isinstance(x, RouteRemovedEvent)}
+    assert {("cluster3", "route35"), ("cluster3", "route37")} < removed
+    assert all(x.date == balancer_manager.date for x in events)
+
+
+async def test_watch_without_changes(
+    httpx_mock: HTTPXMock, monkeypatch: pytest.MonkeyPatch
+):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+
+    async def _update(self, incremental: bool = False, clusters=None):
+        return None
+
+    # the check holds with python -O
+    monkeypatch.setattr(HttpxBalancerManager, "update", _update)
+    with pytest.raises(RuntimeError, match="change set"):
+        async for _ in balancer_manager.watch(interval=0):
+            pass
+
+
+async def test_watch_backpressure():
+    polls = 0
+
+    async def _poll() -> list[Event]:
+        nonlocal polls
+        polls += 1
+        return [Event(date=utcnow()) for _ in range(5)]
+
+    async for _ in watch(_poll, interval=0, maxsize=1):
+        await asyncio.sleep(0.05)
+        break
+
+    # the producer is blocked by the full queue after the first poll
+    assert polls == 1
+
+
+def disable_routes_in_payload(payload: str, *routes: str) -> str:
+    for route in routes:
+        payload = re.sub(
+            rf"(<td>{route}</td><td></td><td>[\d\.]+</td><td>\d+</td><td>Init )Ok ",
+            r"\1Dis ",
+            payload,
+        )
+    return payload
+
+
+async def test_edit_routes(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+
+    # disabling every route of cluster0 is rejected before anything is sent
+    with pytest.raises(ValueError, match=r".*cannot disable final active route.*"):
+        await balancer_manager.edit_routes(
+            [
+                RouteEdit(cluster=x, route=y, status_changes={"disabled": True})
+                for x, y in [("cluster0", "route00"), ("cluster0", "route01")]
+            ]
+        )
+    assert len(httpx_mock.get_requests()) == 1
+
+    # unless it is forced
+    with open(dir_.joinpath("data", "balancer-manager-mock-1.html"), "r") as fh:
+        payload = fh.read()
+    httpx_mock.add_response(
+        method="POST",
+        url="http://testserver.local/balancer-manager",
+        text=disable_routes_in_payload(payload, "route00", "route01", "route10"),
+    )
+
+    changes = await balancer_manager.edit_routes(
+        [
+            RouteEdit(
+                cluster=x, route=y, force=force, status_changes={"disabled": True}
+            )
+            for x, y, force in [
+                ("cluster0", "route00", False),
+                ("cluster0", "route01", True),
+                ("cluster1", "route10", False),
+            ]
+        ],
+        concurrency=1,
+    )
+
+    requests = httpx_mock.get_requests(method="POST")
+    assert len(requests) == 3
+    for request in requests:
+        assert b"w_status_D=1" in request.read()
+
+    # only the final response is parsed
+    assert changes is not None
+    assert set(changes.modified_routes) == {
+        ("cluster0", "route00"),
+        ("cluster0", "route01"),
+        ("cluster1", "route10"),
+    }
+    assert balancer_manager.cluster("cluster0").number_of_electable_routes == 0
+    assert balancer_manager.cluster("cluster1").number_of_electable_routes == 1
+
+
+async def test_edit_routes_exception_handler(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+
+    httpx_mock.add_exception(
+        httpx.ReadTimeout("timed out"),
+        method="POST",
+        url="http://testserver.local/balancer-manager",
+    )
+
+    exceptions: list[Exception] = list()
+    await balancer_manager.edit_lbset(
+        "cluster4",
+        1,
+        status_changes={"disabled": True},
+        exception_handler=exceptions.append,
+    )
+
+    # every request was attempted and nothing was parsed
+    assert len(exceptions) == 5
+    assert all(isinstance(x, httpx.ReadTimeout) for x in exceptions)
+
+
+async def test_edit_routes_forced_order(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+    with open(dir_.joinpath("data", "balancer-manager-mock-1.html"), "r") as fh:
+        payload = fh.read()
+    httpx_mock.add_response(
+        method="POST",
+        url="http://testserver.local/balancer-manager",
+        text=disable_routes_in_payload(payload, "route00", "route01"),
+    )
+
+    # a forced edit listed first does not make the non-forced edit fail
+    await balancer_manager.edit_routes(
+        [
+            RouteEdit(
+                cluster="cluster0",
+                route=route,
+                force=force,
+                status_changes={"disabled": True},
+            )
+            for route, force in [("route00", True), ("route01", False)]
+        ],
+        concurrency=1,
+    )
+    assert len(httpx_mock.get_requests(method="POST")) == 2
+    assert balancer_manager.cluster("cluster0").number_of_electable_routes == 0
+
+
+async def test_edit_routes_duplicates(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+    with open(dir_.joinpath("data", "balancer-manager-mock-1.html"), "r") as fh:
+        payload = fh.read()
+    httpx_mock.add_response(
+        method="POST",
+        url="http://testserver.local/balancer-manager",
+        text=disable_routes_in_payload(payload, "route00"),
+    )
+
+    # the same route is only counted and sent once; the last edit wins
+    await balancer_manager.edit_routes(
+        [
+            RouteEdit(
+                cluster="cluster0", route="route00", status_changes={"disabled": True}
+            ),
+            RouteEdit(cluster="cluster0", route="route00", factor=2.0),
+            RouteEdit(
+                cluster="cluster0", route="route00", status_changes={"disabled": True}
+            ),
+        ]
+    )
+    requests = httpx_mock.get_requests(method="POST")
+    assert len(requests) == 1
+    assert b"w_status_D=1" in requests[0].read()
+    assert b"w_lf=2.0" not in requests[0].read()
+
+
+async def test_edit_lbset_validation_error(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        "http://testserver.local/balancer-manager"
+    )
+
+    # each failure reaches the handler once
+    exceptions: list[Exception] = list()
+    await balancer_manager.edit_lbset(
+        "cluster0",
+        0,
+        status_changes={"disabled": True},
+        exception_handler=exceptions.append,
+    )
+    assert len(exceptions) == 1
+    assert isinstance(exceptions[0], ValueError)
+    assert len(httpx_mock.get_requests(method="POST")) == 0
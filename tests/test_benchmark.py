@@ -0,0 +1,68 @@
+import asyncio
+from pathlib import Path
+
+from httpd_manager.httpx.client import http_client
+
+from .benchmark import BenchmarkResult, compare, get_benchmarks, main, run_benchmarks
+
+
+def test_benchmarks(test_files_dir: Path):
+    previous = http_client.get(None)
+    loop = asyncio.new_event_loop()
+    try:
+        with get_benchmarks(
+            loop, test_files_dir, route_counts=(10,), scoreboard_sizes=(100,)
+        ) as benchmarks:
+            assert "ParsedBalancerManager.parse_payload[10-routes,lxml]" in benchmarks
+            assert "HttpxBalancerManager.update[10-routes,incremental]" in benchmarks
+            assert "ServerStatus.parse_payload[100-slots]" in benchmarks
+
+            results = run_benchmarks(
+                {
+                    name: func
+                    for name, func in benchmarks.items()
+                    if "10-routes" in name
+                },
+                iterations=1,
+            )
+            client = http_client.get()
+    finally:
+        loop.close()
+
+    # the mocked client is closed and the previous client is restored
+    assert client is not previous and client.is_closed
+    assert http_client.get(None) is previous
+
+    assert len(results) == 7
+    for result in results.values():
+        assert result.seconds > 0
+        assert result.peak_memory > 0
+
+
+def test_compare():
+    baseline = {
+        "a": BenchmarkResult(seconds=1.0, peak_memory=1000),
+        "b": BenchmarkResult(seconds=1.0, peak_memory=1000),
+    }
+    results = {
+        "a": BenchmarkResult(seconds=1.2, peak_memory=1200),
+        "b": BenchmarkResult(seconds=1.5, peak_memory=2000),
+        "c": BenchmarkResult(seconds=10.0, peak_memory=10000),
+    }
+    assert compare(results, baseline) == [
+        "b: 1500.000ms (baseline 1000.000ms)",
+        "b: 2.0KiB peak memory (baseline 1.0KiB)",
+    ]
+    assert len(compare(results, baseline, max_time_regression=0.1)) == 3
+    assert compare(results, baseline, 1.0, 1.0) == []
+
+
+def test_main(tmp_path: Path):
+    results_file = tmp_path.joinpath("results.json")
+    argv = ["--iterations=1", "--routes=10", "--scoreboard=100", "-k", "mock-2"]
+    assert main([*argv, "--save", str(results_file)]) == 0
+    assert results_file.exists()
+    # timings of a single iteration are too noisy to compare
+    assert (
+        main([*argv, "--baseline", str(results_file), "--max-time-regression=100"]) == 0
+    )
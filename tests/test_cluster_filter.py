@@ -0,0 +1,32 @@
+import pytest
+
+from httpd_manager import BalancerManager, ParsedBalancerManager, ParserEngine
+from httpd_manager.testing import MockBalancerManager
+
+
+URL = "http://testserver.local/balancer-manager"
+
+
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_parse_clusters(engine: ParserEngine):
+    mock = MockBalancerManager.generate(clusters=4, routes_per_cluster=3, seed=1)
+    payload = mock.to_html()
+    parsed_model = ParsedBalancerManager.parse_payload(payload, engine=engine)
+
+    filtered = ParsedBalancerManager.parse_payload(
+        payload, engine=engine, clusters=["cluster1", "cluster3"]
+    )
+    assert filtered.clusters == [parsed_model.clusters[1], parsed_model.clusters[3]]
+    assert filtered.routes == parsed_model.routes[3:6] + parsed_model.routes[9:12]
+
+    balancer_manager = BalancerManager.parse_payload(
+        payload, url=URL, engine=engine, clusters=(x for x in ["cluster2"])
+    )
+    assert list(balancer_manager.clusters) == ["cluster2"]
+    assert len(balancer_manager.cluster("cluster2").routes) == 3
+    assert balancer_manager._clusters_filter == ("cluster2",)
+
+    assert (
+        ParsedBalancerManager.parse_payload(payload, engine=engine, clusters=[]).routes
+        == []
+    )
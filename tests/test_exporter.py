@@ -0,0 +1,69 @@
+import httpx
+import pytest
+
+from httpd_manager.httpx import FleetPoller, MetricsExporter
+from httpd_manager.httpx.exporter import CONTENT_TYPE, _escape
+from httpd_manager.testing import MockHttpdFleet, MockHttpdServer
+
+
+NODE = "http://node0.testserver.local"
+
+
+@pytest.mark.asyncio
+async def test_metrics_exporter():
+    servers = {
+        f"node{i}.testserver.local": MockHttpdServer(failure_rate=1.0 if i else 0.0)
+        for i in range(2)
+    }
+    servers["node0.testserver.local"].balancer_manager.cluster("cluster0").route(
+        "route0-1"
+    ).disabled = True
+
+    async with MockHttpdFleet(servers).client() as client:
+        fleet = FleetPoller(
+            balancer_manager_urls=[f"http://{x}/balancer-manager" for x in servers],
+            server_status_urls=[f"http://{x}/server-status" for x in servers],
+            client=client,
+        )
+        exporter = MetricsExporter(fleet)
+        transport = httpx.ASGITransport(app=exporter)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://exporter.local"
+        ) as scraper:
+            await fleet.poll()
+            response = await scraper.get("/metrics")
+            assert response.status_code == 200
+            assert response.headers["content-type"] == CONTENT_TYPE
+
+            # scrapes are served from the cache until the next poll
+            assert (await scraper.get("/metrics")).text == response.text
+            assert exporter.renders == 1
+            await fleet.poll()
+            await scraper.get("/metrics")
+            assert exporter.renders == 2
+
+            assert (await scraper.get("/other")).status_code == 404
+            assert (await scraper.post("/metrics")).status_code == 405
+
+    lines = response.text.splitlines()
+    route_labels = f'node="{NODE}/balancer-manager",cluster="cluster0",route="route0-1"'
+    assert "# TYPE httpd_route_elected_total counter" in lines
+    assert f'httpd_route_status{{{route_labels},status="disabled"}} 1' in lines
+    assert f'httpd_route_status{{{route_labels},status="ok"}} 0' in lines
+    assert f"httpd_route_electable{{{route_labels}}} 0" in lines
+    assert f'httpd_up{{node="{NODE}/server-status",type="server_status"}} 1' in lines
+    assert (
+        'httpd_up{node="http://node1.testserver.local/server-status",'
+        'type="server_status"} 0'
+    ) in lines
+    assert any(
+        x.startswith(
+            f'httpd_server_workers{{node="{NODE}/server-status",state="open"}} '
+        )
+        for x in lines
+    )
+    assert response.text.endswith("\n")
+
+
+def test_escape():
+    assert _escape('a"b\\c\nd') == 'a\\"b\\\\c\\nd'
@@ -0,0 +1,135 @@
+import pytest
+
+from httpd_manager import (
+    BalancerManager,
+    FastCluster,
+    FastRoute,
+    FastWorker,
+    ParserEngine,
+    RouteStatusFlag,
+    ServerStatus,
+)
+from httpd_manager.models import Bytes, bytes_to_int
+from httpd_manager.testing import MockBalancerManager, MockServerStatus
+
+
+URL = "http://testserver.local/balancer-manager"
+
+
+@pytest.fixture
+def mock() -> MockBalancerManager:
+    mock = MockBalancerManager.generate(
+        clusters=2, routes_per_cluster=6, lbsets=2, seed=1
+    )
+    route = mock.cluster("cluster1").route("route1-2")
+    route.disabled = True
+    route.to_ = 512
+    mock.cluster("cluster1").route("route1-3").hot_standby = True
+    mock.cluster("cluster1").route("route1-4").error = True
+    return mock
+
+
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_fast_models(mock: MockBalancerManager, engine: ParserEngine):
+    model = BalancerManager.parse_payload(mock.to_html(), url=URL, engine=engine)
+    fast_model = BalancerManager.parse_payload(
+        mock.to_html(), url=URL, engine=engine, fast_models=True
+    )
+    assert fast_model._fast_models is True
+
+    for name, cluster in model.clusters.items():
+        fast_cluster = fast_model.cluster(name)
+        assert isinstance(fast_cluster, FastCluster)
+        assert fast_cluster.to_pydantic() == cluster
+        assert fast_cluster.number_of_electable_routes == (
+            cluster.number_of_electable_routes
+        )
+        assert list(fast_cluster.lbsets()) == list(cluster.lbsets())
+
+        for route_name, route in cluster.routes.items():
+            fast_route = fast_cluster.route(route_name)
+            assert isinstance(fast_route, FastRoute)
+            assert fast_route.to_pydantic() == route
+            assert fast_route.electable == route.electable
+            assert fast_route.status.get_mutable_values() == (
+                route.status.get_mutable_values()
+            )
+            for status_name, status in route.status.mutable().items():
+                fast_status = fast_route.status.mutable()[status_name]
+                assert fast_status.value == status.value
+                assert fast_status.http_form_code == status.http_form_code
+
+    disabled_route = fast_model.cluster("cluster1").route("route1-2")
+    assert disabled_route.status.disabled.value is True
+    assert disabled_route.status.flags == RouteStatusFlag.DISABLED
+    assert fast_model.cluster("cluster1").number_of_electable_routes == 4
+
+
+def test_fast_models_incremental_update(mock: MockBalancerManager):
+    model = BalancerManager.parse_payload(mock.to_html(), url=URL, fast_models=True)
+    parsed_model = model._parsed
+    assert parsed_model is not None
+
+    mock.cluster("cluster0").route("route0-1").draining_mode = True
+    mock.cluster("cluster0").route("route0-2").factor = 3.0
+    changes = model._update_from_parsed_model(
+        type(parsed_model).parse_payload(mock.to_html())
+    )
+
+    assert list(changes.modified_routes) == [
+        ("cluster0", "route0-1"),
+        ("cluster0", "route0-2"),
+    ]
+    assert changes.modified_clusters["cluster0"]["number_of_electable_routes"] == (
+        6,
+        5,
+    )
+    route = model.cluster("cluster0").route("route0-1")
+    assert isinstance(route, FastRoute)
+    assert route.status.draining_mode.value is True
+    assert model.cluster("cluster0").route("route0-2").factor == 3.0
+
+
+def test_fast_models_serialization(mock: MockBalancerManager):
+    model = BalancerManager.parse_payload(mock.to_html(), url=URL)
+    fast_model = BalancerManager.parse_payload(
+        mock.to_html(), url=URL, fast_models=True
+    )
+    assert fast_model.dict(exclude={"date"}) == model.dict(exclude={"date"})
+    assert fast_model.json(exclude={"date"}) == model.json(exclude={"date"})
+
+    # fast objects are kept by copy()
+    assert isinstance(fast_model.copy().cluster("cluster0"), FastCluster)
+
+    mock_server_status = MockServerStatus.generate(slots=20, seed=1)
+    url = "http://testserver.local/server-status"
+    server_status = ServerStatus.parse_payload(mock_server_status.to_html(), url=url)
+    fast_server_status = ServerStatus.parse_payload(
+        mock_server_status.to_html(), url=url, fast_models=True
+    )
+    assert fast_server_status.json(exclude={"date"}) == server_status.json(
+        exclude={"date"}
+    )
+
+
+def test_fast_workers():
+    mock = MockServerStatus.generate(slots=100, seed=1)
+    server_status = ServerStatus.parse_payload(
+        mock.to_html(), url="http://testserver.local/server-status"
+    )
+    fast_server_status = ServerStatus.parse_payload(
+        mock.to_html(), url="http://testserver.local/server-status", fast_models=True
+    )
+    assert server_status.workers is not None
+    assert fast_server_status.workers is not None
+    assert len(fast_server_status.workers) == len(server_status.workers)
+    for worker, fast_worker in zip(server_status.workers, fast_server_status.workers):
+        assert isinstance(fast_worker, FastWorker)
+        assert fast_worker.to_pydantic() == worker
+
+
+@pytest.mark.parametrize(
+    "value,unit", [("0", "K"), ("512", ""), ("512", None), ("1.5", "K"), ("2.1", "G")]
+)
+def test_bytes_to_int(value: str, unit: str | None):
+    assert bytes_to_int(value, unit) == int(Bytes(value=value, unit=unit))
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from httpd_manager.httpx import (
+    FleetPoller,
+    HttpxBalancerManager,
+    HttpxServerStatus,
+    NodeType,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def add_mocked_response(
+    httpx_mock: HTTPXMock, test_files_dir: Path, url: str, filename: str
+):
+    with test_files_dir.joinpath(filename).open("r") as fh:
+        httpx_mock.add_response(url=url, text=fh.read())
+
+
+async def test_fleet_poll(httpx_mock: HTTPXMock, test_files_dir: Path):
+    balancer_manager_urls = [
+        f"http://node{x}.testserver.local/balancer-manager" for x in range(5)
+    ]
+    server_status_urls = [
+        f"http://node{x}.testserver.local/server-status" for x in range(5)
+    ]
+    for url in balancer_manager_urls:
+        add_mocked_response(
+            httpx_mock, test_files_dir, url, "balancer-manager-mock-1.html"
+        )
+    for url in server_status_urls:
+        add_mocked_response(
+            httpx_mock, test_files_dir, url, "server-status-mock-1.html"
+        )
+
+    async with FleetPoller(
+        balancer_manager_urls=balancer_manager_urls,
+        server_status_urls=server_status_urls,
+        concurrency=3,
+    ) as fleet:
+        await fleet.poll()
+        snapshot = fleet.snapshot()
+        assert len(snapshot) == 10
+
+        for url in balancer_manager_urls:
+            assert fleet.nodes[url].type is NodeType.BALANCER_MANAGER
+            assert isinstance(snapshot[url], HttpxBalancerManager)
+        for url in server_status_urls:
+            assert fleet.nodes[url].type is NodeType.SERVER_STATUS
+            assert isinstance(snapshot[url], HttpxServerStatus)
+
+        # the second poll updates the existing models in place
+        await fleet.poll()
+        assert fleet.snapshot() == snapshot
+        for url, model in fleet.snapshot().items():
+            assert model is snapshot[url]
+            assert fleet.nodes[url].failures == 0
+
+
+async def test_fleet_circuit_breaker(httpx_mock: HTTPXMock):
+    url = "http://testserver.local/balancer-manager"
+    httpx_mock.add_exception(httpx.ConnectError("connection refused"), url=url)
+
+    fleet = FleetPoller(balancer_manager_urls=[url], failure_threshold=2)
+    try:
+        await fleet.poll()
+        assert fleet.nodes[url].failures == 1
+        assert fleet.nodes[url].circuit_open is False
+        assert "connection refused" in str(fleet.nodes[url].error)
+
+        await fleet.poll()
+        assert fleet.nodes[url].failures == 2
+        assert fleet.nodes[url].circuit_open is True
+
+        # the node is skipped while the circuit is open
+        await fleet.poll()
+        assert fleet.nodes[url].failures == 2
+        assert len(httpx_mock.get_requests()) == 2
+        assert fleet.snapshot() == {}
+    finally:
+        await fleet.stop()
@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+import pytest
+
+from httpd_manager import BalancerManager, HistoryStore, RingBuffer, ServerStatus
+from httpd_manager.base.history import ROUTE_HISTORY_FIELDS
+from httpd_manager.httpx import FleetPoller
+from httpd_manager.testing import (
+    MockBalancerManager,
+    MockHttpdFleet,
+    MockHttpdServer,
+    MockServerStatus,
+)
+
+
+def test_ring_buffer():
+    buffer = RingBuffer(("a", "b"), capacity=5)
+    assert buffer.latest is None
+    assert buffer.nbytes == 8 * 5 * 3
+
+    for i in range(8):
+        buffer.append(float(i), (i, i * 10))
+    assert len(buffer) == 5
+    assert buffer.latest == 7.0
+
+    # the three oldest samples were overwritten
+    timestamps, columns = buffer.window()
+    assert list(timestamps) == [3.0, 4.0, 5.0, 6.0, 7.0]
+    assert list(columns["b"]) == [30.0, 40.0, 50.0, 60.0, 70.0]
+
+    timestamps, columns = buffer.window(start=4.5, end=7.0)
+    assert list(timestamps) == [5.0, 6.0]
+    assert list(columns["a"]) == [5.0, 6.0]
+    assert list(buffer.window(start=8.0)[0]) == []
+
+    with pytest.raises(ValueError, match="time order"):
+        buffer.append(1.0, (0, 0))
+    with pytest.raises(ValueError, match="2 values are expected"):
+        buffer.append(9.0, (0,))
+
+
+def test_downsample():
+    buffer = RingBuffer(("value",), capacity=100)
+    for i in range(10):
+        buffer.append(100.0 + i, (i,))
+
+    buckets = buffer.downsample(4.0)
+    assert [x.start for x in buckets] == [100.0, 104.0, 108.0]
+    assert [x.samples for x in buckets] == [4, 4, 2]
+    assert buckets[1].minimum == {"value": 4.0}
+    assert buckets[1].maximum == {"value": 7.0}
+    assert buckets[1].average == {"value": 5.5}
+
+    buckets = buffer.downsample(4.0, start=102.0, end=105.0)
+    assert [(x.start, x.samples) for x in buckets] == [(100.0, 2), (104.0, 1)]
+
+    with pytest.raises(ValueError):
+        buffer.downsample(0)
+
+
+def test_history_store():
+    mock = MockBalancerManager.generate(clusters=2, routes_per_cluster=3, seed=1)
+    model = BalancerManager.parse_payload(
+        mock.to_html(), url="http://testserver.local/balancer-manager"
+    )
+    history = HistoryStore(capacity=10)
+    date = model.date
+    for i in range(15):
+        mock.cluster("cluster0").route("route0-1").elected = i
+        model = BalancerManager.parse_payload(mock.to_html(), url=model.url)
+        model.date = date + timedelta(seconds=i)
+        history.record_balancer_manager(model)
+        # a model which was not refreshed is only recorded once
+        history.record_balancer_manager(model)
+
+    assert len(history) == 6
+    buffer = history.get(model.url, "cluster0", "route0-1")
+    assert buffer is not None
+    assert buffer.fields == ROUTE_HISTORY_FIELDS
+    assert list(buffer.window()[1]["elected"]) == [float(x) for x in range(5, 15)]
+    # the memory of the store does not grow with the number of polls
+    assert history.nbytes == 6 * 8 * 10 * (len(ROUTE_HISTORY_FIELDS) + 1)
+
+    mock_status = MockServerStatus.generate(seed=1)
+    server_status = ServerStatus.parse_payload(
+        mock_status.to_html(), url="http://testserver.local/server-status"
+    )
+    history.record_server_status(server_status)
+    buffer = history.get(server_status.url)
+    assert buffer is not None
+    assert buffer.window()[1]["waiting_for_connection"][0] == (
+        server_status.worker_states.waiting_for_connection
+    )
+
+    # the history of a route which was removed is dropped
+    mock.cluster("cluster1").routes.pop()
+    model = BalancerManager.parse_payload(mock.to_html(), url=model.url)
+    history.record_balancer_manager(model)
+    assert len(history) == 6
+    assert history.get(model.url, "cluster1", "route1-2") is None
+    assert history.get(model.url, "cluster1", "route1-1") is not None
+    assert history.get(server_status.url) is not None
+
+    history.forget(model.url)
+    assert list(history) == [(server_status.url,)]
+    assert not history._route_keys
+
+
+@pytest.mark.asyncio
+async def test_fleet_history():
+    servers = {f"node{i}.testserver.local": MockHttpdServer(seed=i) for i in range(2)}
+    async with MockHttpdFleet(servers).client() as client:
+        fleet = FleetPoller(
+            balancer_manager_urls=[f"http://{x}/balancer-manager" for x in servers],
+            server_status_urls=[f"http://{x}/server-status" for x in servers],
+            history_capacity=3,
+            client=client,
+        )
+        for _ in range(4):
+            await fleet.poll()
+
+    assert fleet.history is not None
+    buffer = fleet.history.get("http://node0.testserver.local/server-status")
+    assert buffer is not None
+    assert len(buffer) == 3
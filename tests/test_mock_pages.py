@@ -0,0 +1,97 @@
+import pytest
+
+from httpd_manager import BalancerManager, ParserEngine, ServerStatus, WorkerState
+from httpd_manager.testing import MockBalancerManager, MockServerStatus
+from httpd_manager.testing.pages import _format_size
+
+
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_balancer_manager_page(engine: ParserEngine):
+    mock = MockBalancerManager.generate(
+        clusters=3, routes_per_cluster=6, lbsets=2, seed=1
+    )
+    mock.cluster("cluster1").route("route1-2").disabled = True
+    mock.cluster("cluster1").route("route1-3").hot_standby = True
+    mock.cluster("cluster2").sticky_session = "JSESSIONID|jsessionid"
+
+    balancer_manager = BalancerManager.parse_payload(
+        mock.to_html(), url="http://testserver.local/balancer-manager", engine=engine
+    )
+    assert balancer_manager.httpd_version == mock.httpd_version
+    assert balancer_manager.openssl_version == mock.openssl_version
+    assert list(balancer_manager.clusters) == ["cluster0", "cluster1", "cluster2"]
+    assert balancer_manager.cluster("cluster2").sticky_session == (
+        "JSESSIONID|jsessionid"
+    )
+
+    cluster = balancer_manager.cluster("cluster1")
+    assert cluster.max_members == 6
+    assert [x.lbset for x in cluster.routes.values()] == [0, 0, 0, 1, 1, 1]
+    for mock_route in mock.cluster("cluster1").routes:
+        route = cluster.route(mock_route.name)
+        assert route.worker == mock_route.worker
+        assert route.elected == mock_route.elected
+        assert route.session_nonce_uuid == mock.cluster("cluster1").nonce
+    assert cluster.route("route1-2").status.disabled.value is True
+    assert cluster.route("route1-2").status.ok.value is False
+    assert cluster.route("route1-3").status.hot_standby.value is True
+    assert cluster.route("route1-3").status.ok.value is True
+
+
+def test_balancer_manager_version_layout():
+    mock = MockBalancerManager.generate(
+        clusters=1, routes_per_cluster=1, seed=1, httpd_version="2.4.20"
+    )
+    assert "<td>1</td>" in mock.to_html()
+    mock.httpd_version = "2.4.41"
+    assert "<td>1.00</td>" in mock.to_html()
+
+
+def test_generate_is_reproducible():
+    assert (
+        MockBalancerManager.generate(seed=5).to_html()
+        == MockBalancerManager.generate(seed=5).to_html()
+    )
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        (0, "  0 "),
+        (972, "972 "),
+        (1536, "1.5K"),
+        (10 * 1024, " 10K"),
+        (2**30, "1.0G"),
+    ],
+)
+def test_format_size(value: int, expected: str):
+    assert _format_size(value) == expected
+
+
+def test_server_status_page():
+    mock = MockServerStatus.generate(
+        slots=1000, threads_per_child=25, open_processes=0.25, seed=1
+    )
+    assert len(mock.scoreboard) == 1000
+    assert mock.scoreboard.count(WorkerState.OPEN.value) == 250
+
+    server_status = ServerStatus.parse_payload(
+        mock.to_html(),
+        url="http://testserver.local/server-status",
+        include_workers=True,
+    )
+    assert server_status.scoreboard == mock.scoreboard
+    assert server_status.worker_states.busy_workers == mock.busy_workers
+    assert server_status.worker_states.idle_workers == mock.idle_workers
+    assert server_status.requests_per_sec == mock.requests_per_sec
+    assert server_status.ms_per_request == mock.ms_per_request
+    assert server_status.restart_time == mock.restart_time
+    assert server_status.workers is not None
+    assert len(server_status.workers) == 750
+
+    auto_server_status = ServerStatus.parse_auto_payload(
+        mock.to_auto(), url="http://testserver.local/server-status"
+    )
+    assert auto_server_status.worker_states == server_status.worker_states
+    assert auto_server_status.bytes_per_second == mock.bytes_per_second
+    assert auto_server_status.restart_time == mock.restart_time
@@ -0,0 +1,229 @@
+import asyncio
+from typing import Generator
+
+import httpx
+import pytest
+
+from httpd_manager import FastCluster, FastRoute
+from httpd_manager.httpx import (
+    FleetPoller,
+    HttpxBalancerManager,
+    HttpxServerStatus,
+    RollingOperation,
+)
+from httpd_manager.httpx.client import http_client
+from httpd_manager.testing import (
+    MockBalancerManager,
+    MockHttpdFleet,
+    MockHttpdServer,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+BALANCER_MANAGER_URL = "http://testserver.local/balancer-manager"
+SERVER_STATUS_URL = "http://testserver.local/server-status"
+
+
+@pytest.fixture
+def server() -> MockHttpdServer:
+    return MockHttpdServer(
+        balancer_manager=MockBalancerManager.generate(
+            clusters=2, routes_per_cluster=4, lbsets=2, seed=1
+        ),
+        seed=1,
+    )
+
+
+@pytest.fixture
+def mock_client(server: MockHttpdServer) -> Generator[httpx.AsyncClient, None, None]:
+    # context variables set by an async fixture are not visible to the test
+    client = server.client()
+    token = http_client.set(client)
+    yield client
+    http_client.reset(token)
+
+
+async def test_edit_route(server: MockHttpdServer, mock_client: httpx.AsyncClient):
+    balancer_manager = await HttpxBalancerManager.parse_from_url(BALANCER_MANAGER_URL)
+    assert list(balancer_manager.clusters) == ["cluster0", "cluster1"]
+    assert len(balancer_manager.cluster("cluster1").routes) == 4
+
+    await balancer_manager.edit_route(
+        "cluster1",
+        "route1-1",
+        factor=2.5,
+        lbset=3,
+        status_changes={"disabled": True, "hot_standby": True},
+    )
+    mock_route = server.balancer_manager.cluster("cluster1").route("route1-1")
+    assert mock_route.disabled is True
+    assert mock_route.hot_standby is True
+    assert mock_route.factor == 2.5
+    assert mock_route.lbset == 3
+    assert server.edits == 1
+
+    route = balancer_manager.cluster("cluster1").route("route1-1")
+    assert route.status.disabled.value is True
+    assert route.status.hot_standby.value is True
+    assert route.status.ok.value is False
+    assert route.factor == 2.5
+    assert route.lbset == 3
+
+
+@pytest.mark.parametrize(
+    "changes,message",
+    [
+        ({"nonce": "00000000-0000-0000-0000-000000000000"}, "nonce"),
+        ({"b": "cluster9"}, "unknown balancer"),
+        ({"w": "http://unknown/"}, "unknown worker"),
+        ({"w_status_D": "2"}, "w_status_D"),
+        ({"w_status_X": "1"}, "unknown status field"),
+        ({"w_lf": "0"}, "w_lf"),
+        ({"w_lf": "abc"}, "w_lf"),
+        ({"w_ls": "100"}, "w_ls"),
+    ],
+)
+async def test_edit_route_validation(
+    server: MockHttpdServer,
+    mock_client: httpx.AsyncClient,
+    changes: dict[str, str],
+    message: str,
+):
+    cluster = server.balancer_manager.cluster("cluster0")
+    form = {
+        "b": cluster.name,
+        "w": cluster.routes[0].worker,
+        "nonce": str(cluster.nonce),
+        "w_status_D": "1",
+        "w_lf": "1",
+        "w_ls": "0",
+    }
+    form.update(changes)
+
+    response = await mock_client.post(
+        BALANCER_MANAGER_URL, headers={"Referer": BALANCER_MANAGER_URL}, data=form
+    )
+    assert response.status_code == 400
+    assert message in response.text
+    # the route was not modified
+    assert cluster.routes[0].disabled is False
+    assert server.edits == 0
+
+
+async def test_referer_is_required(mock_client: httpx.AsyncClient):
+    response = await mock_client.post(BALANCER_MANAGER_URL, data={})
+    assert response.status_code == 400
+
+
+async def test_server_status(server: MockHttpdServer, mock_client: httpx.AsyncClient):
+    server_status = await HttpxServerStatus.parse_from_url(
+        SERVER_STATUS_URL, include_workers=False, auto=True
+    )
+    assert server_status._auto is True
+    assert server_status.scoreboard == server.server_status.scoreboard
+
+    server_status = await HttpxServerStatus.parse_from_url(
+        SERVER_STATUS_URL, include_workers=True
+    )
+    assert server_status.workers is not None
+    assert len(server_status.workers) == server.server_status.busy_workers + (
+        server.server_status.idle_workers
+    )
+
+    response = await mock_client.get("http://testserver.local/unknown")
+    assert response.status_code == 404
+
+
+async def test_latency_and_failures(mock_client: httpx.AsyncClient):
+    server = MockHttpdServer(latency=0.05, failure_rate=1.0, failure_status=503)
+    async with server.client() as client:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await client.get(BALANCER_MANAGER_URL)
+        assert loop.time() - started >= 0.05
+        assert response.status_code == 503
+        assert server.requests == 1
+        assert server.failures == 1
+
+
+async def test_rolling_drain(server: MockHttpdServer, mock_client: httpx.AsyncClient):
+    for route in server.balancer_manager.cluster("cluster0").routes:
+        route.busy = 3
+
+    balancer_manager = await HttpxBalancerManager.parse_from_url(BALANCER_MANAGER_URL)
+    operation = RollingOperation(
+        [balancer_manager],
+        "cluster0",
+        ["route0-0", "route0-1"],
+        min_interval=0,
+    )
+    await operation.run()
+
+    for route in server.balancer_manager.cluster("cluster0").routes[:2]:
+        assert route.busy == 0
+        assert route.draining_mode is False
+
+
+async def test_fleet():
+    servers = {
+        f"node{i}.testserver.local": MockHttpdServer(failure_rate=0.0 if i else 1.0)
+        for i in range(10)
+    }
+    fleet_app = MockHttpdFleet(servers)
+
+    async with fleet_app.client() as client:
+        fleet = FleetPoller(
+            balancer_manager_urls=[f"http://{x}/balancer-manager" for x in servers],
+            server_status_urls=[f"http://{x}/server-status" for x in servers],
+            client=client,
+        )
+        await fleet.poll()
+
+    # node0 fails every request
+    assert len(fleet.snapshot()) == 18
+    assert fleet.nodes["http://node0.testserver.local/balancer-manager"].failures == 1
+    assert all(x.requests == 2 for x in servers.values())
+
+    route_statuses = fleet.count_route_statuses()
+    assert route_statuses["ok"] == 9 * 4 * 10
+    assert route_statuses["draining_mode"] == 0
+    assert fleet.count_route_statuses("cluster0")["ok"] == 9 * 10
+
+
+async def test_edit_route_fast_models(
+    server: MockHttpdServer, mock_client: httpx.AsyncClient
+):
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        BALANCER_MANAGER_URL, fast_models=True
+    )
+    await balancer_manager.edit_route(
+        "cluster0", "route0-1", status_changes={"draining_mode": True}
+    )
+    assert server.balancer_manager.cluster("cluster0").route("route0-1").draining_mode
+
+    route = balancer_manager.cluster("cluster0").route("route0-1")
+    assert isinstance(route, FastRoute)
+    assert route.status.draining_mode.value is True
+
+    await balancer_manager.update()
+    assert isinstance(balancer_manager.cluster("cluster0"), FastCluster)
+
+
+async def test_clusters_filter(server: MockHttpdServer, mock_client: httpx.AsyncClient):
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        BALANCER_MANAGER_URL, clusters=["cluster1"]
+    )
+    assert list(balancer_manager.clusters) == ["cluster1"]
+
+    await balancer_manager.update(incremental=True)
+    assert list(balancer_manager.clusters) == ["cluster1"]
+
+    changes = await balancer_manager.update(
+        incremental=True, clusters=["cluster0", "cluster1"]
+    )
+    assert changes is not None
+    assert changes.added_clusters == ["cluster0"]
+
+    await balancer_manager.update(clusters=["cluster0"])
+    assert list(balancer_manager.clusters) == ["cluster0"]
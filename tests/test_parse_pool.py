@@ -0,0 +1,170 @@
+from typing import Generator
+
+import httpx
+import pytest
+
+from httpd_manager import (
+    BalancerManager,
+    ParsedBalancerManager,
+    ParsedServerStatus,
+    ParsePool,
+    ServerStatus,
+    executor,
+)
+from httpd_manager.httpx import HttpxBalancerManager, HttpxServerStatus
+from httpd_manager.httpx.client import http_client
+from httpd_manager.testing import MockBalancerManager, MockServerStatus
+
+
+pytestmark = pytest.mark.asyncio
+
+SERVER_STATUS_URL = "http://testserver.local/server-status"
+BALANCER_MANAGER_URL = "http://testserver.local/balancer-manager"
+
+server_status_page = MockServerStatus.generate(slots=400, seed=1).to_html()
+balancer_manager_page = MockBalancerManager.generate(seed=1).to_html()
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/server-status":
+        return httpx.Response(200, text=server_status_page)
+    return httpx.Response(200, text=balancer_manager_page)
+
+
+@pytest.fixture(scope="module")
+def parse_pool() -> Generator[ParsePool, None, None]:
+    with ParsePool(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.fixture
+def pool(parse_pool: ParsePool) -> Generator[ParsePool, None, None]:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client_token = http_client.set(client)
+    executor_token = executor.set(parse_pool)
+    yield parse_pool
+    executor.reset(executor_token)
+    http_client.reset(client_token)
+
+
+@pytest.mark.parametrize("include_workers", [True, False])
+async def test_server_status(pool: ParsePool, include_workers: bool):
+    server_status = await HttpxServerStatus.parse_from_url(
+        SERVER_STATUS_URL, include_workers=include_workers
+    )
+    expected = ServerStatus.parse_payload(
+        server_status_page, url=SERVER_STATUS_URL, include_workers=include_workers
+    )
+    assert server_status.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+    assert server_status._include_workers is include_workers
+
+
+async def test_balancer_manager(pool: ParsePool):
+    balancer_manager = await HttpxBalancerManager.parse_from_url(
+        BALANCER_MANAGER_URL, clusters=["cluster1", "cluster3"]
+    )
+    expected = BalancerManager.parse_payload(
+        balancer_manager_page,
+        url=BALANCER_MANAGER_URL,
+        clusters=["cluster1", "cluster3"],
+    )
+    assert balancer_manager.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+    assert balancer_manager._clusters_filter == ("cluster1", "cluster3")
+
+    # incremental updates use the raw parsed model
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None and not changes
+
+
+async def test_mixed_parse_paths(pool: ParsePool):
+    # a model parsed in-process and updated from the pool (or the other way)
+    # reports no changes for the same page
+    token = executor.set(None)
+    try:
+        balancer_manager = await HttpxBalancerManager.parse_from_url(
+            BALANCER_MANAGER_URL
+        )
+    finally:
+        executor.reset(token)
+
+    previous = balancer_manager._parsed
+    assert previous is not None
+
+    balancer_manager.payload_cache.clear()
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None and not changes
+    # the raw rows match, so no route had to be rebuilt
+    parsed_model = balancer_manager._parsed
+    assert parsed_model is not None and parsed_model is not previous
+    assert parsed_model.routes == previous.routes
+    assert balancer_manager.payload_cache.parses == 2
+
+
+async def test_parsed_models(pool: ParsePool):
+    parsed_server_status = await pool.parse_server_status(server_status_page)
+    expected_server_status = ParsedServerStatus.parse_payload(server_status_page)
+    assert parsed_server_status.dict(exclude={"date"}) == (
+        expected_server_status.dict(exclude={"date"})
+    )
+
+    parsed_balancer_manager = await pool.parse_balancer_manager(balancer_manager_page)
+    expected_balancer_manager = ParsedBalancerManager.parse_payload(
+        balancer_manager_page
+    )
+    # the values are not validated, so they must already have the field types
+    assert parsed_balancer_manager.routes[0]["priority"] == "1"
+    assert parsed_balancer_manager.dict(exclude={"date"}) == (
+        expected_balancer_manager.dict(exclude={"date"})
+    )
+
+
+async def test_stats(pool: ParsePool):
+    submitted = pool.stats.submitted
+    await pool.parse_server_status(server_status_page)
+    assert pool.stats.submitted == submitted + 1
+    assert pool.stats.pending == 0
+    assert pool.stats.max_pending >= 1
+    assert pool.stats.failed == 0
+    assert pool.stats.completed == pool.stats.submitted
+    assert pool.stats.total_parse_time > 0
+    assert 0 < pool.stats.average_latency <= pool.stats.max_latency
+    assert len(pool.latencies) == pool.stats.completed
+
+    with pytest.raises(ValueError):
+        await pool.parse_server_status("<html></html>")
+    assert pool.stats.failed == 1
+    assert pool.stats.pending == 0
+
+
+async def test_shared_memory(pool: ParsePool):
+    with ParsePool(max_workers=1, shared_memory=True) as shared_pool:
+        token = executor.set(shared_pool)
+        try:
+            server_status = await HttpxServerStatus.parse_from_url(SERVER_STATUS_URL)
+        finally:
+            executor.reset(token)
+
+        expected = ServerStatus.parse_payload(server_status_page, url=SERVER_STATUS_URL)
+        assert server_status.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+        assert shared_pool.stats.shared_payloads == 1
+
+        # pages are decoded with the encoding of the response
+        parsed_model = await shared_pool.parse_balancer_manager(
+            balancer_manager_page.encode("latin-1"), encoding="latin-1"
+        )
+        assert len(parsed_model.clusters) == 4
+        assert shared_pool.stats.shared_payloads == 2
+
+        # str payloads are still pickled
+        await shared_pool.parse_server_status(server_status_page)
+        assert shared_pool.stats.shared_payloads == 2
+        assert shared_pool.stats.completed == 3
+
+
+async def test_bytes_payload(pool: ParsePool):
+    server_status = await HttpxServerStatus.async_parse_payload(
+        SERVER_STATUS_URL, server_status_page.encode(), encoding="utf-8"
+    )
+    expected = ServerStatus.parse_payload(server_status_page, url=SERVER_STATUS_URL)
+    assert server_status.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+    assert pool.stats.shared_payloads == 0
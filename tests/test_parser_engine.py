@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from httpd_manager import ParsedBalancerManager, ParserEngine, parser_engine
+from .test_balancer_manager import HttpxBalancerManager, validate_properties
+from .test_balancer_manager_mocked import add_mocked_response
+
+
+dir_ = Path(__file__).parent
+
+
+def parse_with_engines(payload: str) -> tuple[dict, dict]:
+    results = list()
+    for engine in ParserEngine:
+        parsed = ParsedBalancerManager.parse_payload(payload, engine=engine)
+        results.append(parsed.dict(exclude={"date"}))
+    return results[0], results[1]
+
+
+@pytest.mark.parametrize(
+    "filename",
+    sorted(dir_.joinpath("data").glob("balancer-manager-*.html")),
+    ids=lambda f: f.stem,
+)
+def test_parser_engine_conformance(filename: Path):
+    bs4_data, lxml_data = parse_with_engines(filename.read_text())
+    assert len(lxml_data["routes"]) > 0
+    assert bs4_data == lxml_data
+
+
+def test_parser_engine_sticky_session_bug(test_files_dir: Path):
+    # httpd 2.4.20 closes the StickySession cell after DisableFailover
+    payload = test_files_dir.joinpath("balancer-manager-2.4.20.html").read_text()
+    payload = payload.replace(
+        "<td> (None) </td><td>Off</td>", "<td>JSESSIONID<td>Off</td></td>", 1
+    )
+
+    bs4_data, lxml_data = parse_with_engines(payload)
+    assert bs4_data == lxml_data
+    assert lxml_data["clusters"][0]["sticky_session"] == "JSESSIONID"
+    assert lxml_data["clusters"][0]["disable_failover"] == "Off"
+
+
+def test_parser_engine_ignores_forms(test_files_dir: Path):
+    payload = test_files_dir.joinpath("balancer-manager-2.4.41.html").read_text()
+    payload = payload.replace(
+        "</body>",
+        "<h3>Edit worker settings for http://route00/</h3>"
+        '<form method="POST" action="/balancer-manager">'
+        "<table><tr><td>Load factor:</td><td>1</td></tr></table>"
+        "<table><tr><td>LB Set:</td><td>0</td></tr></table>"
+        "</form></body>",
+    )
+
+    bs4_data, lxml_data = parse_with_engines(payload)
+    assert bs4_data == lxml_data
+
+
+@pytest.mark.asyncio
+async def test_parser_engine_context(httpx_mock: HTTPXMock):
+    add_mocked_response(httpx_mock, "balancer-manager-mock-1.html")
+
+    token = parser_engine.set(ParserEngine.LXML)
+    try:
+        balancer_manager = await HttpxBalancerManager.parse_from_url(
+            "http://testserver.local/balancer-manager"
+        )
+    finally:
+        parser_engine.reset(token)
+
+    validate_properties(balancer_manager)
+    assert len(balancer_manager.cluster("cluster3").routes) == 10
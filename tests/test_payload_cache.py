@@ -0,0 +1,173 @@
+from typing import Generator
+
+import httpx
+import pytest
+
+from httpd_manager.httpx import HttpxBalancerManager, HttpxServerStatus
+from httpd_manager.httpx import server_status as httpx_server_status
+from httpd_manager.httpx.client import http_client
+from httpd_manager.testing import MockBalancerManager, MockServerStatus
+
+
+pytestmark = pytest.mark.asyncio
+
+BALANCER_MANAGER_URL = "http://testserver.local/balancer-manager"
+SERVER_STATUS_URL = "http://testserver.local/server-status"
+
+
+class Pages:
+    def __init__(self):
+        self.balancer_manager = MockBalancerManager.generate(
+            clusters=1, routes_per_cluster=4, seed=1
+        )
+        self.server_status = MockServerStatus.generate(slots=100, seed=1)
+        self.etag: str | None = None
+        self.extended_status = True
+        self.requests: list[httpx.Request] = list()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.etag is not None and request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304)
+
+        headers = {"etag": self.etag} if self.etag else {}
+        if request.url.path == "/server-status":
+            if "auto" in request.url.params:
+                return httpx.Response(200, text=self.to_auto(), headers=headers)
+            return httpx.Response(200, text=self.server_status.to_html())
+        return httpx.Response(
+            200, text=self.balancer_manager.to_html(), headers=headers
+        )
+
+    def to_auto(self) -> str:
+        payload = self.server_status.to_auto()
+        if self.extended_status:
+            return payload
+        return "\n".join(
+            line
+            for line in payload.splitlines()
+            if not line.startswith(("ReqPerSec", "BytesPerSec", "BytesPerReq"))
+        )
+
+
+@pytest.fixture
+def pages() -> Generator[Pages, None, None]:
+    pages = Pages()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(pages.handler))
+    token = http_client.set(client)
+    yield pages
+    http_client.reset(token)
+
+
+async def test_unchanged_balancer_manager(pages: Pages):
+    balancer_manager = await HttpxBalancerManager.parse_from_url(BALANCER_MANAGER_URL)
+    parsed_model = balancer_manager._parsed
+    date = balancer_manager.date
+
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None
+    assert not changes
+    assert await balancer_manager.update() is None
+    assert balancer_manager._parsed is parsed_model
+    assert balancer_manager.date > date
+    assert balancer_manager.payload_cache.unchanged == 2
+    assert balancer_manager.payload_cache.saved_parses == 2
+
+    pages.balancer_manager.cluster("cluster0").route("route0-1").disabled = True
+    changes = await balancer_manager.update(incremental=True)
+    assert changes is not None
+    assert list(changes.modified_routes) == [("cluster0", "route0-1")]
+    assert balancer_manager.payload_cache.parses == 2
+
+
+async def test_changed_route_counters(pages: Pages):
+    balancer_manager = await HttpxBalancerManager.parse_from_url(BALANCER_MANAGER_URL)
+
+    # any request handled by a route changes its counters, so the page is
+    # parsed again
+    for i in range(3):
+        route = pages.balancer_manager.cluster("cluster0").route("route0-1")
+        route.elected += 1
+        route.to_ += 100
+        changes = await balancer_manager.update(incremental=True)
+        assert changes is not None
+        assert list(changes.modified_routes) == [("cluster0", "route0-1")]
+    assert balancer_manager.payload_cache.unchanged == 0
+    assert balancer_manager.payload_cache.parses == 4
+    route_model = balancer_manager.clusters["cluster0"].routes["route0-1"]
+    assert route_model.elected == route.elected
+
+
+async def test_etag(pages: Pages):
+    pages.etag = '"v1"'
+    balancer_manager = await HttpxBalancerManager.parse_from_url(BALANCER_MANAGER_URL)
+    assert balancer_manager.payload_cache.etag == '"v1"'
+
+    await balancer_manager.update()
+    assert pages.requests[-1].headers["if-none-match"] == '"v1"'
+    assert balancer_manager.payload_cache.not_modified == 1
+
+    # a route edit invalidates the cached page
+    await balancer_manager.edit_route(
+        "cluster0", "route0-1", status_changes={"hot_standby": True}
+    )
+    await balancer_manager.update()
+    assert "if-none-match" not in pages.requests[-1].headers
+    assert balancer_manager.payload_cache.not_modified == 1
+
+
+async def test_unchanged_server_status(pages: Pages):
+    server_status = await HttpxServerStatus.parse_from_url(
+        SERVER_STATUS_URL, include_workers=False, auto=True
+    )
+    await server_status.update()
+    assert server_status.payload_cache.unchanged == 1
+
+    pages.server_status.total_accesses += 100
+    await server_status.update()
+    assert server_status.payload_cache.unchanged == 1
+    assert server_status.payload_cache.parses == 2
+
+
+async def test_server_status_without_extended_status(
+    pages: Pages, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(httpx_server_status, "AUTO_RETRY_INTERVAL", 4)
+    pages.extended_status = False
+    server_status = await HttpxServerStatus.parse_from_url(
+        SERVER_STATUS_URL, include_workers=False, auto=True
+    )
+    assert len(pages.requests) == 2
+
+    # the html page is polled without trying ?auto each time
+    for _ in range(4):
+        await server_status.update()
+    assert len(pages.requests) == 6
+    assert all("auto" not in x.url.params for x in pages.requests[2:])
+    assert server_status._payload_cache.parses == 1
+    assert server_status._payload_cache.unchanged == 4
+    # the next update tries ?auto again
+    assert server_status.payload_cache is server_status._auto_payload_cache
+
+    # the html page is still cached after ?auto fails again
+    await server_status.update()
+    assert len(pages.requests) == 8
+    assert "auto" in pages.requests[6].url.params
+    assert server_status._payload_cache.unchanged == 5
+    assert server_status._auto_payload_cache.parses == 0
+
+    pages.extended_status = True
+    for _ in range(6):
+        await server_status.update()
+    assert len(pages.requests) == 14
+    assert ["auto" in x.url.params for x in pages.requests[8:]] == [
+        False,
+        False,
+        False,
+        False,
+        True,
+        True,
+    ]
+    assert server_status.payload_cache is server_status._auto_payload_cache
+    assert server_status.payload_cache.parses == 1
+    assert server_status.payload_cache.unchanged == 1
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+import pytest
+
+from httpd_manager import BalancerManager, RateTracker, ServerStatus
+from httpd_manager.httpx import FleetPoller
+from httpd_manager.testing import (
+    MockBalancerManager,
+    MockHttpdFleet,
+    MockHttpdServer,
+    MockServerStatus,
+)
+
+
+URL = "http://testserver.local/server-status"
+BALANCER_MANAGER_URL = "http://testserver.local/balancer-manager"
+
+
+def parse_server_status(mock: MockServerStatus) -> ServerStatus:
+    model = ServerStatus.parse_auto_payload(mock.to_auto(), url=URL)
+    model.date = mock.current_time
+    return model
+
+
+def test_server_status_rates():
+    mock = MockServerStatus.generate(seed=1)
+    mock.total_accesses = 1000
+    mock.total_kbytes = 100
+    tracker = RateTracker()
+    assert tracker.update_server_status(parse_server_status(mock)) is None
+
+    mock.current_time += timedelta(seconds=10)
+    mock.total_accesses += 500
+    mock.total_kbytes += 10
+    rates = tracker.update_server_status(parse_server_status(mock))
+    assert rates is not None
+    assert rates.interval == 10.0
+    assert rates.requests_per_sec == 50.0
+    assert rates.bytes_per_sec == 1024.0
+    assert rates.restarted is False
+
+    # a model which was not refreshed keeps the previous rates
+    assert tracker.update_server_status(parse_server_status(mock)) == rates
+
+    # the counters restart from zero at restart_time
+    previous_time = mock.current_time
+    mock.restart_time = previous_time + timedelta(seconds=5)
+    mock.current_time = previous_time + timedelta(seconds=20)
+    mock.total_accesses = 300
+    rates = tracker.update_server_status(parse_server_status(mock))
+    assert rates is not None
+    assert rates.restarted is True
+    assert rates.interval == 15.0
+    assert rates.requests_per_sec == 20.0
+
+    tracker.forget(URL)
+    assert tracker.server_rates == {}
+    assert tracker.update_server_status(parse_server_status(mock)) is None
+
+
+def test_route_rates():
+    mock = MockBalancerManager.generate(clusters=1, routes_per_cluster=3, seed=1)
+    for route in mock.cluster("cluster0").routes:
+        route.elected, route.to_, route.from_ = 100, 1000, 2000
+
+    tracker = RateTracker()
+    model = BalancerManager.parse_payload(mock.to_html(), url=BALANCER_MANAGER_URL)
+    assert tracker.update_balancer_manager(model) == {}
+    date = model.date
+
+    mock.cluster("cluster0").route("route0-0").elected = 120
+    mock.cluster("cluster0").route("route0-1").elected = 10
+    mock.cluster("cluster0").routes.pop()
+    model = BalancerManager.parse_payload(mock.to_html(), url=BALANCER_MANAGER_URL)
+    model.date = date + timedelta(seconds=4)
+    rates = tracker.update_balancer_manager(model)
+
+    assert list(rates) == [("cluster0", "route0-0"), ("cluster0", "route0-1")]
+    route_rates = rates[("cluster0", "route0-0")]
+    assert route_rates.interval == 4.0
+    assert route_rates.elected_per_sec == 5.0
+    assert route_rates.to_per_sec == 0.0
+    assert route_rates.restarted is False
+
+    # a counter which went backwards is counted from zero
+    route_rates = rates[("cluster0", "route0-1")]
+    assert route_rates.restarted is True
+    assert route_rates.elected_per_sec == 2.5
+
+    # samples of removed routes are not kept
+    assert len(tracker._routes[BALANCER_MANAGER_URL]) == 2
+
+
+@pytest.mark.asyncio
+async def test_fleet_rates():
+    servers = {f"node{i}.testserver.local": MockHttpdServer(seed=i) for i in range(3)}
+    async with MockHttpdFleet(servers).client() as client:
+        fleet = FleetPoller(
+            balancer_manager_urls=[f"http://{x}/balancer-manager" for x in servers],
+            server_status_urls=[f"http://{x}/server-status" for x in servers],
+            client=client,
+        )
+        await fleet.poll()
+        assert fleet.rates.server_rates == {}
+        for server in servers.values():
+            server.server_status.total_accesses += 100
+        await fleet.poll()
+
+    assert len(fleet.rates.server_rates) == 3
+    assert all(x.requests_per_sec > 0 for x in fleet.rates.server_rates.values())
+    assert len(fleet.rates.route_rates) == 3
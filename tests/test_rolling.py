@@ -0,0 +1,150 @@
+import asyncio
+import re
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from httpd_manager.httpx import (
+    HttpxBalancerManager,
+    RollingOperation,
+    RollingOperationAborted,
+)
+
+
+pytestmark = pytest.mark.asyncio
+
+
+class MockedNode:
+    """
+    serve balancer-manager-mock-1.html with mutable route state for cluster0
+    """
+
+    def __init__(self, payload: str, busy: int):
+        self.payload = payload
+        self.routes = {
+            "route00": {"draining": False, "busy": busy},
+            "route01": {"draining": False, "busy": busy},
+        }
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            form = parse_qs(request.read().decode())
+            self.routes[form["w_wr"][0]]["draining"] = form["w_status_N"][0] == "1"
+
+        payload = self.payload
+        for name, route in self.routes.items():
+            if route["draining"] and route["busy"] > 0:
+                route["busy"] -= 1
+            payload = re.sub(
+                rf"(<td>{name}</td><td></td><td>[\d\.]+</td><td>\d+</td>)"
+                r"<td>Init Ok </td><td>(\d+)</td><td>\d+</td>",
+                rf"\1<td>Init {'Drn ' if route['draining'] else ''}Ok </td>"
+                rf"<td>\2</td><td>{route['busy']}</td>",
+                payload,
+            )
+        return httpx.Response(status_code=200, text=payload)
+
+
+@pytest.fixture
+def nodes(httpx_mock: HTTPXMock, test_files_dir: Path) -> dict[str, MockedNode]:
+    payload = test_files_dir.joinpath("balancer-manager-mock-1.html").read_text()
+    _nodes = dict()
+    for i in range(3):
+        url = f"http://node{i}.testserver.local/balancer-manager"
+        _nodes[url] = MockedNode(payload, busy=i + 1)
+        httpx_mock.add_callback(_nodes[url], url=url)
+    return _nodes
+
+
+async def test_rolling_drain(nodes: dict[str, MockedNode]):
+    balancer_managers = [await HttpxBalancerManager.parse_from_url(x) for x in nodes]
+
+    drained: list[list[str]] = list()
+
+    async def _action(wave: list[str]):
+        # every route of the wave is drained on every node
+        for node in nodes.values():
+            for route in wave:
+                assert node.routes[route] == {"draining": True, "busy": 0}
+        drained.append(wave)
+
+    operation = RollingOperation(
+        balancer_managers, "cluster0", ["route00", "route01"], min_interval=0
+    )
+    await operation.run(_action)
+
+    assert drained == [["route00"], ["route01"]]
+    for node in nodes.values():
+        assert all(route["draining"] is False for route in node.routes.values())
+
+
+async def test_rolling_safety_check(nodes: dict[str, MockedNode]):
+    balancer_managers = [await HttpxBalancerManager.parse_from_url(x) for x in nodes]
+
+    operation = RollingOperation(
+        balancer_managers, "cluster0", ["route00", "route01"], wave_size=2
+    )
+    with pytest.raises(ValueError, match=r".*cannot disable final active route.*"):
+        await operation.run()
+
+    for node in nodes.values():
+        assert all(route["draining"] is False for route in node.routes.values())
+
+
+async def test_rolling_abort(nodes: dict[str, MockedNode]):
+    balancer_managers = [await HttpxBalancerManager.parse_from_url(x) for x in nodes]
+
+    operation = RollingOperation(
+        balancer_managers, "cluster0", ["route00", "route01"], min_interval=0
+    )
+
+    async def _action(wave: list[str]):
+        operation.abort()
+
+    with pytest.raises(RollingOperationAborted):
+        await operation.run(_action)
+
+    # the first wave was rolled back and the second never started
+    for node in nodes.values():
+        assert all(route["draining"] is False for route in node.routes.values())
+        assert node.routes["route01"]["busy"] > 0
+
+
+async def test_rolling_cancels_edits_before_rollback(
+    nodes: dict[str, MockedNode], monkeypatch: pytest.MonkeyPatch
+):
+    balancer_managers = [await HttpxBalancerManager.parse_from_url(x) for x in nodes]
+    events: list[tuple[str, int]] = list()
+
+    async def _edit_routes(self, edits, *args, **kwargs):
+        index = balancer_managers.index(self)
+        if edits[0].force:
+            events.append(("restore", index))
+            return None
+        if index == 2:
+            await asyncio.sleep(0)
+            events.append(("failed", index))
+            raise httpx.ConnectError("connection refused")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append(("cancelled", index))
+            raise
+
+    monkeypatch.setattr(HttpxBalancerManager, "edit_routes", _edit_routes)
+    operation = RollingOperation(balancer_managers, "cluster0", ["route00"])
+    with pytest.raises(httpx.ConnectError):
+        await operation.run()
+
+    # the rollback only starts once no edit is in flight
+    assert events == [
+        ("failed", 2),
+        ("cancelled", 0),
+        ("cancelled", 1),
+        ("restore", 0),
+        ("restore", 1),
+        ("restore", 2),
+    ]
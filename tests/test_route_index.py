@@ -0,0 +1,86 @@
+import pytest
+
+from httpd_manager import BalancerManager, RouteStatusFlag
+from httpd_manager.testing import MockBalancerManager
+
+
+URL = "http://testserver.local/balancer-manager"
+
+
+@pytest.fixture
+def mock() -> MockBalancerManager:
+    mock = MockBalancerManager.generate(
+        clusters=3, routes_per_cluster=4, lbsets=2, seed=1
+    )
+    # the same backend in two clusters
+    mock.cluster("cluster2").route("route2-0").worker = "http://route0-0/"
+    mock.cluster("cluster2").route("route2-0").name = "route0-0"
+    mock.cluster("cluster1").route("route1-1").draining_mode = True
+    return mock
+
+
+@pytest.mark.parametrize("fast_models", [False, True])
+def test_find_routes(mock: MockBalancerManager, fast_models: bool):
+    model = BalancerManager.parse_payload(
+        mock.to_html(), url=URL, fast_models=fast_models
+    )
+
+    def _keys(routes) -> list[tuple[str, str]]:
+        return [(x.cluster, x.name) for x in routes]
+
+    assert len(model.find_routes()) == 12
+    assert _keys(model.find_routes(worker="http://route0-0/")) == [
+        ("cluster0", "route0-0"),
+        ("cluster2", "route0-0"),
+    ]
+    assert _keys(model.find_routes(name="route0-0", cluster="cluster2")) == [
+        ("cluster2", "route0-0"),
+    ]
+    assert _keys(model.find_routes(status=RouteStatusFlag.DRAINING_MODE)) == [
+        ("cluster1", "route1-1"),
+    ]
+    assert _keys(
+        model.find_routes(
+            cluster="cluster1",
+            status=RouteStatusFlag.OK | RouteStatusFlag.DRAINING_MODE,
+        )
+    ) == [("cluster1", "route1-1")]
+    assert _keys(model.find_routes(cluster="cluster1", lbset=1)) == [
+        ("cluster1", "route1-2"),
+        ("cluster1", "route1-3"),
+    ]
+    assert model.find_routes(cluster="cluster9") == []
+    assert model.find_routes(worker="http://unknown/") == []
+
+
+@pytest.mark.parametrize("fast_models", [False, True])
+def test_find_routes_incremental_update(mock: MockBalancerManager, fast_models: bool):
+    model = BalancerManager.parse_payload(
+        mock.to_html(), url=URL, fast_models=fast_models
+    )
+    parsed_model = model._parsed
+    assert parsed_model is not None
+    index = model._get_index()
+    cluster = model.cluster("cluster0")
+    assert [x.name for x in cluster.lbset(0)] == ["route0-0", "route0-1"]
+
+    mock.cluster("cluster0").route("route0-1").lbset = 1
+    mock.cluster("cluster0").route("route0-1").disabled = True
+    mock.cluster("cluster1").routes.pop()
+    mock.cluster("cluster1").route("route1-1").draining_mode = False
+    model._update_from_parsed_model(type(parsed_model).parse_payload(mock.to_html()))
+
+    # the tables are updated in place
+    assert model._get_index() is index
+    assert [x.name for x in model.find_routes(lbset=1, cluster="cluster0")] == [
+        "route0-1",
+        "route0-2",
+        "route0-3",
+    ]
+    assert [x.name for x in model.find_routes(status=RouteStatusFlag.DISABLED)] == [
+        "route0-1"
+    ]
+    assert model.find_routes(status=RouteStatusFlag.DRAINING_MODE) == []
+    assert model.find_routes(name="route1-3") == []
+    assert len(model.find_routes()) == 11
+    assert [x.name for x in cluster.lbset(0)] == ["route0-0"]
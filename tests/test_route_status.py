@@ -0,0 +1,131 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from httpd_manager import (
+    BalancerManagerChanges,
+    ImmutableStatus,
+    RouteStatus,
+    RouteStatusFlag,
+    Status,
+)
+from httpd_manager.base import count_route_statuses, get_balancer_manager_events
+from httpd_manager.base.balancer_manager.route import get_route_status_flags
+
+
+def test_route_status_flags():
+    flags = get_route_status_flags("Init Drn Dis Stby Ok ")
+    assert flags == (
+        RouteStatusFlag.OK
+        | RouteStatusFlag.DRAINING_MODE
+        | RouteStatusFlag.DISABLED
+        | RouteStatusFlag.HOT_STANDBY
+    )
+
+    status = RouteStatus(flags=flags)
+    assert status.ok == ImmutableStatus(value=True)
+    assert status.error == ImmutableStatus(value=False)
+    assert status.disabled == Status(value=True, http_form_code="D")
+    assert status.hot_spare == Status(value=False, http_form_code="R")
+    assert [name for name, x in status if x.value] == [
+        "ok",
+        "draining_mode",
+        "disabled",
+        "hot_standby",
+    ]
+    assert {name: x.http_form_code for name, x in status.mutable().items()} == {
+        "ignore_errors": "I",
+        "draining_mode": "N",
+        "disabled": "D",
+        "hot_standby": "H",
+        "hot_spare": "R",
+        "stopped": "S",
+    }
+    assert status.get_mutable_values().draining_mode is True
+    assert status.copy(deep=True) == status
+
+
+def test_route_status_keywords():
+    # the keywords of the former model are still accepted
+    status = RouteStatus(
+        ok=ImmutableStatus(value=True),
+        error={"value": False},
+        disabled=Status(value=True, http_form_code="D"),
+        stopped=True,
+    )
+    assert status.flags == (
+        RouteStatusFlag.OK | RouteStatusFlag.DISABLED | RouteStatusFlag.STOPPED
+    )
+
+
+def test_route_status_serialization():
+    status = RouteStatus(flags=RouteStatusFlag.OK | RouteStatusFlag.DISABLED)
+    # same output as the former model
+    assert status.dict() == {
+        "ok": {"value": True},
+        "error": {"value": False},
+        "ignore_errors": {"value": False, "http_form_code": "I"},
+        "draining_mode": {"value": False, "http_form_code": "N"},
+        "disabled": {"value": True, "http_form_code": "D"},
+        "hot_standby": {"value": False, "http_form_code": "H"},
+        "hot_spare": {"value": False, "http_form_code": "R"},
+        "stopped": {"value": False, "http_form_code": "S"},
+    }
+    assert json.loads(status.json(include={"ok", "disabled"})) == {
+        "ok": {"value": True},
+        "disabled": {"value": True, "http_form_code": "D"},
+    }
+    assert RouteStatus.parse_obj(status.dict()) == status
+    assert RouteStatus.parse_raw(status.json()).flags == status.flags
+    assert status.copy().flags == status.flags
+
+
+def test_status_is_read_only():
+    # breaking change: the status objects are shared between routes and
+    # cannot be changed; flags can
+    status = RouteStatus(flags=RouteStatusFlag.OK)
+    assert status.ok is RouteStatus(flags=RouteStatusFlag.OK).ok
+    with pytest.raises(TypeError, match="edit_route\\(status_changes="):
+        status.ok.value = False  # type: ignore[misc]
+    with pytest.raises(TypeError, match="read-only"):
+        status.disabled.value = True  # type: ignore[misc]
+
+    status.flags |= RouteStatusFlag.DISABLED
+    assert status.disabled.value is True
+    assert status.ok.value is True
+
+
+class _Route:
+    def __init__(self, flags: int):
+        self.status = RouteStatus(flags=flags)
+
+
+def test_count_route_statuses():
+    routes = [
+        _Route(RouteStatusFlag.OK),
+        _Route(RouteStatusFlag.OK | RouteStatusFlag.DRAINING_MODE),
+        _Route(RouteStatusFlag.OK | RouteStatusFlag.DRAINING_MODE),
+        _Route(RouteStatusFlag.ERROR | RouteStatusFlag.DISABLED),
+    ]
+    counts = count_route_statuses(routes)
+    assert counts["ok"] == 3
+    assert counts["draining_mode"] == 2
+    assert counts["disabled"] == 1
+    assert counts["error"] == 1
+    assert counts["stopped"] == 0
+
+
+def test_route_status_events():
+    changes = BalancerManagerChanges()
+    changes.modified_routes[("cluster0", "route0")] = {
+        "status": (
+            RouteStatus(flags=RouteStatusFlag.OK),
+            RouteStatus(flags=RouteStatusFlag.DISABLED),
+        )
+    }
+    events = get_balancer_manager_events(datetime.now(), changes)
+    assert [(x.status, x.previous, x.value) for x in events] == [  # type: ignore
+        ("ok", True, False),
+        ("disabled", False, True),
+    ]
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from httpd_manager import WorkerState, WorkerStateCount
+from httpd_manager.base import (
+    count_worker_states,
+    count_worker_states_by_process,
+    get_active_processes,
+)
+
+
+def test_count_worker_states():
+    scoreboard = "".join(x.value for x in WorkerState) + "__KW...."
+    worker_states = count_worker_states(scoreboard)
+    assert isinstance(worker_states, WorkerStateCount)
+    assert worker_states.waiting_for_connection == 3
+    assert worker_states.keepalive == 2
+    assert worker_states.sending_reply == 2
+    assert worker_states.open == 5
+    assert worker_states.idle == 1
+    assert worker_states.total_slots == len(scoreboard)
+    # everything except "_", "S", "I" and "."
+    assert worker_states.busy_workers == 9
+    assert worker_states.idle_workers == 3
+    assert worker_states.busy_ratio == pytest.approx(9 / 12)
+    assert worker_states.utilization == pytest.approx(9 / 19 * 100)
+
+
+def test_busy_workers_of_mod_status(test_files_dir: Path):
+    with open(test_files_dir.joinpath("server-status-mock-1-auto.txt"), "r") as fh:
+        lines = dict(x.split(": ", 1) for x in fh.read().splitlines() if ": " in x)
+    scoreboard = lines["Scoreboard"]
+    busy_workers = int(lines["BusyWorkers"])
+    assert count_worker_states(scoreboard).busy_workers == busy_workers
+
+    # mod_status does not count slots which are starting up as busy
+    scoreboard = scoreboard.replace(".", "S", 10)
+    assert count_worker_states(scoreboard).busy_workers == busy_workers
+
+
+def test_empty_scoreboard():
+    worker_states = count_worker_states("")
+    assert worker_states.total_slots == 0
+    assert worker_states.busy_ratio == 0.0
+    assert worker_states.utilization == 0.0
+
+
+def test_count_worker_states_by_process():
+    scoreboard = "_KW_" + "...." + "__R."
+    processes = count_worker_states_by_process(scoreboard, threads_per_child=4)
+    assert len(processes) == 3
+    assert [x.busy_workers for x in processes] == [2, 0, 1]
+    assert [x.idle_workers for x in processes] == [2, 0, 2]
+    assert processes[1].open == 4
+    assert get_active_processes(scoreboard, threads_per_child=4) == 2
+
+    with pytest.raises(ValueError, match="threads_per_child"):
+        count_worker_states_by_process(scoreboard, threads_per_child=0)
@@ -5,7 +5,7 @@ from pathlib import Path
 import pytest
 from pytest_httpx import HTTPXMock
 
-from httpd_manager import ServerStatus, Worker, WorkerStateCount, executor
+from httpd_manager import ServerStatus, Worker, WorkerStateCount, WorkerTable, executor
 from httpd_manager.httpx import HttpxServerStatus
 
 
@@ -23,7 +23,9 @@ def validate_properties(server_status):
     assert isinstance(server_status.bytes_per_request, int)
     assert isinstance(server_status.ms_per_request, float)
     assert isinstance(server_status.worker_states, WorkerStateCount)
-    assert server_status.workers is None or isinstance(server_status.workers, list)
+    assert server_status.workers is None or isinstance(
+        server_status.workers, (list, WorkerTable)
+    )
 
 
 @pytest.fixture
@@ -105,6 +107,9 @@ async def test_mocked_server_status(httpx_mock: HTTPXMock, test_files_dir: Path)
     assert server_status.worker_states.sending_reply == 5
     assert server_status.worker_states.starting_up == 0
     assert server_status.worker_states.waiting_for_connection == 535
+    assert server_status.worker_states.busy_workers == 165
+    assert server_status.scoreboard is not None
+    assert len(server_status.scoreboard) == 2500
 
     assert isinstance(server_status.workers, list)
     for w in server_status.workers:
@@ -122,3 +127,152 @@ async def test_bad_payload(httpx_mock: HTTPXMock, test_files_dir: Path):
         match=r"initial html validation failed; is this really an Httpd Server Status page?",
     ):
         await HttpxServerStatus.parse_from_url("http://testserver.local/server-status")
+
+
+async def test_mocked_server_status_auto(httpx_mock: HTTPXMock, test_files_dir: Path):
+    with open(test_files_dir.joinpath("server-status-mock-1-auto.txt"), "r") as fh:
+        auto_payload = fh.read()
+
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status?auto=", text=auto_payload
+    )
+
+    server_status = await HttpxServerStatus.parse_from_url(
+        "http://testserver.local/server-status", include_workers=False, auto=True
+    )
+    validate_properties(server_status)
+    assert server_status.url == "http://testserver.local/server-status"
+    assert server_status.httpd_version == "2.4.39"
+    assert server_status.openssl_version == "1.1.1c"
+    assert server_status.requests_per_sec == 76.9
+    assert server_status.bytes_per_second == 700000
+    assert server_status.bytes_per_request == 9700
+    assert server_status.ms_per_request == 56.4499
+    assert server_status.worker_states.closing_connection == 37
+    assert server_status.worker_states.keepalive == 123
+    assert server_status.worker_states.open == 1800
+    assert server_status.worker_states.sending_reply == 5
+    assert server_status.worker_states.waiting_for_connection == 535
+    assert server_status.workers is None
+
+    # compare with the html payload
+    with open(test_files_dir.joinpath("server-status-mock-1.html"), "r") as fh:
+        html_status = ServerStatus.parse_payload(
+            fh.read(), url=server_status.url, include_workers=False
+        )
+    assert html_status.dict(exclude={"date", "total_traffic"}) == server_status.dict(
+        exclude={"date", "total_traffic"}
+    )
+    # the html page rounds the traffic to a tenth of its unit
+    assert html_status.total_traffic == pytest.approx(
+        server_status.total_traffic, rel=1e-4
+    )
+    assert server_status.total_accesses == 559914719
+
+    # update continues to use ?auto
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status?auto=", text=auto_payload
+    )
+    await server_status.update()
+    assert server_status._auto is True
+
+
+async def test_mocked_server_status_auto_fallback(
+    httpx_mock: HTTPXMock, test_files_dir: Path
+):
+    # ExtendedStatus Off does not report ReqPerSec, BytesPerSec, or BytesPerReq
+    with open(test_files_dir.joinpath("server-status-mock-1-auto.txt"), "r") as fh:
+        auto_payload = "\n".join(
+            line
+            for line in fh.read().splitlines()
+            if not line.startswith(("ReqPerSec", "BytesPerSec", "BytesPerReq"))
+        )
+    with open(test_files_dir.joinpath("server-status-mock-1.html"), "r") as fh:
+        html_payload = fh.read()
+
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status?auto=", text=auto_payload
+    )
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status", text=html_payload
+    )
+
+    server_status = await HttpxServerStatus.parse_from_url(
+        "http://testserver.local/server-status", include_workers=False, auto=True
+    )
+    validate_properties(server_status)
+    assert server_status.requests_per_sec == 76.9
+    # the auto setting is kept, but the next updates use the html page
+    assert server_status._auto is True
+    assert server_status.payload_cache is server_status._payload_cache
+
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status", text=html_payload
+    )
+    await server_status.update()
+    assert server_status._auto is True
+    assert server_status.total_accesses == 559914719
+    assert len(httpx_mock.get_requests()) == 3
+
+
+async def test_mocked_server_status_watch(httpx_mock: HTTPXMock, test_files_dir: Path):
+    with open(test_files_dir.joinpath("server-status-mock-1.html"), "r") as fh:
+        html_payload = fh.read()
+
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status", text=html_payload
+    )
+    server_status = await HttpxServerStatus.parse_from_url(
+        "http://testserver.local/server-status", include_workers=False
+    )
+
+    # one keepalive worker is now sending a reply
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status",
+        text=html_payload.replace("<pre>KK", "<pre>KW", 1),
+    )
+
+    events = list()
+    async for event in server_status.watch(interval=0):
+        events.append(event)
+        if len(events) == 2:
+            break
+
+    assert {x.state: x.delta for x in events} == {"keepalive": -1, "sending_reply": 1}
+
+
+async def test_mocked_server_status_columnar_workers(
+    httpx_mock: HTTPXMock, test_files_dir: Path
+):
+    with open(test_files_dir.joinpath("server-status-mock-1.html"), "r") as fh:
+        html_payload = fh.read()
+
+    httpx_mock.add_response(
+        url="http://testserver.local/server-status", text=html_payload
+    )
+
+    server_status = await HttpxServerStatus.parse_from_url(
+        "http://testserver.local/server-status",
+        include_workers=True,
+        columnar_workers=True,
+    )
+    validate_properties(server_status)
+    assert isinstance(server_status.workers, WorkerTable)
+
+    expected = ServerStatus.parse_payload(
+        html_payload, url=server_status.url, include_workers=True
+    )
+    assert isinstance(expected.workers, list)
+    assert len(server_status.workers) == len(expected.workers) > 0
+    assert list(server_status.workers) == expected.workers
+    assert server_status.workers[-2:] == expected.workers[-2:]
+    assert server_status.workers[-1].pid is None
+    assert server_status.workers.column("pid")[-1] == -1
+
+    # the table is serialized as its rows
+    assert server_status.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+    assert server_status.json(exclude={"date"}) == expected.json(exclude={"date"})
+
+    # the option is kept for updates
+    await server_status.update()
+    assert isinstance(server_status.workers, WorkerTable)
@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Generator
+
+import httpx
+import pytest
+
+from httpd_manager import ServerStatus, executor
+from httpd_manager.base import LxmlServerStatusParser
+from httpd_manager.httpx import HttpxServerStatus
+from httpd_manager.httpx.client import http_client
+from httpd_manager.testing import MockServerStatus
+
+
+pytestmark = pytest.mark.asyncio
+
+URL = "http://testserver.local/server-status"
+
+
+class Page:
+    def __init__(self, chunk_size: int = 1024):
+        self.server_status = MockServerStatus.generate(slots=400, seed=1)
+        self.chunk_size = chunk_size
+        self.chunks = 0
+
+    async def _iter_chunks(self, content: bytes) -> AsyncIterator[bytes]:
+        for i in range(0, len(content), self.chunk_size):
+            self.chunks += 1
+            yield content[i : i + self.chunk_size]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        content = self.server_status.to_html().encode()
+        return httpx.Response(
+            200,
+            content=self._iter_chunks(content),
+            headers={"content-type": "text/html; charset=utf-8"},
+        )
+
+
+@pytest.fixture
+def page() -> Generator[Page, None, None]:
+    page = Page()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(page.handler))
+    token = http_client.set(client)
+    yield page
+    http_client.reset(token)
+
+
+@pytest.mark.parametrize("include_workers", [True, False])
+async def test_stream_server_status(page: Page, include_workers: bool):
+    server_status = await HttpxServerStatus.parse_from_url(
+        URL, include_workers=include_workers, stream=True
+    )
+    assert server_status._stream is True
+    assert page.chunks > 1
+
+    expected = ServerStatus.parse_payload(
+        page.server_status.to_html(), url=URL, include_workers=include_workers
+    )
+    assert server_status.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+    if include_workers:
+        assert server_status.workers is not None
+        assert len(server_status.workers) == 200
+
+    # the digest of the streamed body is compared to the previous one
+    await server_status.update()
+    assert server_status.payload_cache.unchanged == 1
+    page.server_status.total_accesses += 100
+    await server_status.update()
+    assert server_status.payload_cache.parses == 2
+    assert server_status.scoreboard == page.server_status.scoreboard
+
+
+@pytest.mark.parametrize("thread_pool", [True, False])
+async def test_stream_off_the_loop(
+    page: Page, monkeypatch: pytest.MonkeyPatch, thread_pool: bool
+):
+    threads = set()
+    feed = LxmlServerStatusParser.feed
+
+    def _feed(self, data):
+        threads.add(threading.current_thread())
+        feed(self, data)
+
+    monkeypatch.setattr(LxmlServerStatusParser, "feed", _feed)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        token = executor.set(pool if thread_pool else None)
+        try:
+            await HttpxServerStatus.parse_from_url(URL, stream=True)
+        finally:
+            executor.reset(token)
+
+    assert page.chunks > 1
+    assert threading.current_thread() not in threads
+
+
+async def test_stream_error_status():
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(500))
+    )
+    token = http_client.set(client)
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await HttpxServerStatus.parse_from_url(URL, stream=True)
+    finally:
+        http_client.reset(token)
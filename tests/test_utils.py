@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import dateparser
+import pytest
+
+from httpd_manager.utils import parse_date
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Feb 26 2020 06:37:17",
+        "Jun  7 2016 17:55:26",
+        "Wednesday, 07-Apr-2021 02:23:53 EDT",
+        "Monday, 01-Feb-2021 02:23:53 UTC",
+        "Monday, 01-Feb-2021 02:23:53 GMT",
+        "Monday, 01-Feb-2021 02:23:53 CET",
+        "Sunday, 01-Aug-2021 14:00:00 PDT",
+        "Sunday, 01-Aug-2021 14:00:00 AEST",
+        "2021-04-07 02:23:53 +0200",
+    ],
+)
+def test_parse_date(value: str):
+    expected = dateparser.parse(value, settings={"RETURN_AS_TIMEZONE_AWARE": True})
+    date = parse_date(value)
+    assert date == expected
+    assert date.utcoffset() == expected.utcoffset()
+
+
+def test_parse_date_is_cached():
+    assert parse_date("Feb 26 2020 06:37:17") is parse_date("Feb 26 2020 06:37:17")
+
+
+def test_parse_date_unknown_format():
+    with pytest.raises(ValueError, match=r'unable to parse date "not a date"'):
+        parse_date("not a date")
+
+
+def test_dateparser_not_imported(test_files_dir: Path):
+    code = (
+        "import sys\n"
+        "from httpd_manager import BalancerManager, ServerStatus\n"
+        f"BalancerManager.parse_payload(open({str(test_files_dir / 'balancer-manager-2.4.41.html')!r}).read(), url='http://testserver.local')\n"
+        f"ServerStatus.parse_payload(open({str(test_files_dir / 'server-status-mock-1.html')!r}).read(), url='http://testserver.local')\n"
+        "assert 'dateparser' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from httpd_manager import ParsedServerStatus
+from httpd_manager.base import LxmlServerStatusParser, iter_worker_rows
+from httpd_manager.base.server_status import find_worker_table
+from httpd_manager.testing import MockServerStatus
+
+
+@pytest.fixture(params=["server-status-mock-1.html", "mock"])
+def payload(request, test_files_dir: Path) -> str:
+    if request.param == "mock":
+        return MockServerStatus.generate(slots=200, seed=1).to_html()
+    with open(test_files_dir.joinpath(request.param), "r") as fh:
+        return fh.read()
+
+
+def _get_summary(payload: str) -> str:
+    worker_table = find_worker_table(payload)
+    assert worker_table is not None
+    return payload[:worker_table]
+
+
+@pytest.mark.parametrize("chunk_size", [64, 65536])
+def test_iter_worker_rows(payload: str, chunk_size: int):
+    worker_table = find_worker_table(payload)
+    assert worker_table is not None
+    assert payload[:worker_table].endswith("</pre>")
+    assert "<table" not in payload[:worker_table]
+
+    # rows match those of the full BeautifulSoup tree
+    expected = dict(
+        ParsedServerStatus._get_parsed_pairs(BeautifulSoup(payload, features="lxml"))
+    )
+    rows = list(iter_worker_rows(payload, chunk_size=chunk_size, start=worker_table))
+    assert len(rows) > 0
+    assert rows == expected["workers"]
+
+    parsed_model = ParsedServerStatus.parse_payload(payload)
+    assert parsed_model.workers == expected["workers"]
+    assert parsed_model.worker_states == expected["worker_states"]
+    assert parsed_model.restart_time == expected["restart_time"]
+
+
+def test_skip_worker_table():
+    summary = _get_summary(MockServerStatus.generate(seed=1).to_html())
+
+    # the worker table is not parsed without workers
+    parsed_model = ParsedServerStatus.parse_payload(
+        summary + "<table><tr><td>invalid", include_workers=False
+    )
+    assert parsed_model.workers is None
+
+    with pytest.raises(ValueError, match="<table>"):
+        ParsedServerStatus.parse_payload(summary + "</body></html>")
+    with pytest.raises(ValueError, match="<table>"):
+        ParsedServerStatus.parse_payload(summary)
+
+    assert find_worker_table("<html></html>") is None
+
+
+@pytest.mark.parametrize("include_workers", [True, False])
+def test_lxml_server_status_parser(payload: str, include_workers: bool):
+    expected = ParsedServerStatus.parse_payload(
+        payload, include_workers=include_workers
+    )
+
+    parser = LxmlServerStatusParser(include_workers=include_workers, encoding="utf-8")
+    data = payload.encode()
+    for i in range(0, len(data), 100):
+        parser.feed(data[i : i + 100])
+    # the end of the page is not needed
+    assert parser.done is True
+    parsed_model = ParsedServerStatus.parse_obj(dict(parser.close()))
+
+    assert parsed_model.dict(exclude={"date"}) == expected.dict(exclude={"date"})
+
+
+def test_lxml_server_status_parser_validation():
+    summary = _get_summary(MockServerStatus.generate(seed=1).to_html())
+
+    parser = LxmlServerStatusParser()
+    parser.feed(summary)
+    with pytest.raises(ValueError, match="<table>"):
+        dict(parser.close())
+
+    parser = LxmlServerStatusParser()
+    with pytest.raises(ValueError, match="initial html validation failed"):
+        dict(parser.close())